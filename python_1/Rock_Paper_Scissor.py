@@ -5,34 +5,39 @@ Features:
 - Adaptive bot (learns your moves)
 - Boss Battle mode
 - Pumpkin Power cheat (+1, one-time)
-- Always-visible cheat console (commands: pumpkinpower, reset, help, trickortreat)
-- Voice Mode (optional; uses SpeechRecognition + pyaudio)
+- Always-visible cheat console (type help; several commands with ";", Tab completes)
+- Voice Mode (optional; SpeechRecognition + pyaudio, offline vosk/pocketsphinx keywords)
 - Sound effects if pygame is installed
 - Halloween UI with Tkinter
 """
 
-import random
-import threading
+import rps_startup   # first: starts the startup clock
 import tkinter as tk
 from tkinter import messagebox, simpledialog
-import os
-
-# Optional: sound support via pygame
-SOUND_AVAILABLE = False
-try:
-    import pygame
-    pygame.mixer.init()
-    SOUND_AVAILABLE = True
-except Exception:
-    SOUND_AVAILABLE = False
-
-# Optional: voice support via SpeechRecognition (requires pyaudio)
-VOICE_AVAILABLE = False
-try:
-    import speech_recognition as sr
-    VOICE_AVAILABLE = True
-except Exception:
-    VOICE_AVAILABLE = False
+from collections import deque
+
+from rps_engine import (QuickGame, options, MOVE_INDEX, EV_TIE, EV_WIN, EV_BOSS_APPEARS,
+                        EV_BOSS_WEAKENED, EV_BOSS_DEFEATED, EV_VICTORY, EV_DEFEAT)
+from rps_predict import NGramPredictor
+from rps_render import Renderer
+from rps_events import EventBus
+from rps_toast import Toaster
+from rps_cheats import CheatMatcher
+from rps_console import CommandConsole, ConsoleError
+from rps_autoplay import Autoplay, make_player
+from rps_matchlog import MatchLog, scan, summary_text
+from rps_replay import ReplayError, replay, replay_text
+from rps_charts import ChartPanel, RoundStats
+from rps_save import DEFAULT_PATH as SAVE_PATH, UNDO_DEPTH, SaveError, describe, resume, save_game
+from rps_profiles import ProfileStore
+import rps_profiler
+from rps_profiler import profiled
+
+# Optional: sound (pygame) and voice (SpeechRecognition + pyaudio) load on first use
+from rps_sound import SoundBank
+from rps_voice import VoiceWorker, load_speech
+
+rps_startup.mark("imports")
 
 # Sound filenames (put WAV files next to this script or leave them missing)
 S_WIN = "win.wav"
@@ -42,36 +47,35 @@ S_BOSS = "boss.wav"
 S_CHEAT = "cheat.wav"
 S_VOICE = "voice_beep.wav"
 
+# decoded once in the background; play_sound never loads from disk
+sound_bank = SoundBank([S_WIN, S_LOSE, S_TIE, S_BOSS, S_CHEAT, S_VOICE])
+
+@profiled("play_sound")
 def play_sound(fname):
-    if not SOUND_AVAILABLE:
-        return
-    try:
-        if os.path.isfile(fname):
-            pygame.mixer.Sound(fname).play()
-    except Exception:
-        pass
+    sound_bank.play(fname)
 
 # ---------------- Game state ----------------
-user_score = 0
-computer_score = 0
-score_goal = 4                # default; can change via menu
-difficulty = "Easy"           # Easy / Medium / Hard
+# Rules and scores live in the headless engine (rps_engine.QuickGame).
+game = QuickGame(score_goal=4, difficulty="Easy", predictor=NGramPredictor())   # goal can change via menu
+# every round is appended to a binary log (RPS_MATCH_LOG, default matches.rpslog)
+match_log = MatchLog()
+match_log.attach(game)    # seed and every game change too, so "replay" can rebuild any match
+comment_rng = game.stream("comments")
+undo_stack = deque(maxlen=UNDO_DEPTH)   # game.snapshot() before each round (console: undo)
+round_stats = RoundStats()              # session totals behind the analytics charts
+
+def play_logged(g, move):
+    # every round, by hand or by autoplay: logged, then counted for the charts
+    bot, ev = match_log.play(g, move)
+    round_stats.add(move, bot, g.branch)
+    return bot, ev
+rps_profiler.profile_method(QuickGame, "bot_choice")   # timed while profiling is on
+# lifetime move counts per character (RPS_PROFILE_DB, default profiles.sqlite3); opened after the first frame
+profiles = ProfileStore()
 user_character = "🎃"
-pumpkin_power_used = False
-boss_mode_active = False
-boss_defeated = False
-boss_threshold = 3            # when user's score reaches this, boss may appear
 
-options = ["rock", "paper", "scissor"]
 hand_emojis = {"rock":"✊", "paper":"✋", "scissor":"✌️"}
 
-# adaptive tracking
-user_move_counts = {"rock":0, "paper":0, "scissor":0}
-
-# secret Easter egg typing buffer
-secret_buffer = ""
-SECRET_CODE = "trickortreat"
-
 # funny bot comments
 funny_bot_comments = [
     "😏 I’m just warming up...",
@@ -85,196 +89,276 @@ funny_bot_comments = [
 
 # ---------------- Utilities & Game Logic ----------------
 def update_score_label():
-    score_text.set(f"📊 Score: You {user_score} - Bot {computer_score}")
+    ui.set(score_text, f"📊 Score: You {game.user_score} - Bot {game.computer_score}")
 
 def update_hands(user_hand="", bot_hand=""):
-    user_hand_label.config(text=f"{user_character} You: {hand_emojis.get(user_hand,'')}")
-    computer_hand_label.config(text=f"🤖 Bot: {hand_emojis.get(bot_hand,'')}")
+    ui.config(user_hand_label, text=f"{user_character} You: {hand_emojis.get(user_hand,'')}")
+    ui.config(computer_hand_label, text=f"🤖 Bot: {hand_emojis.get(bot_hand,'')}")
+
+def warm_start():
+    # a new match starts from what this character usually plays
+    game.warm_start(profiles.prior(user_character))
 
 def reset_stats():
-    global user_score, computer_score, pumpkin_power_used, boss_mode_active, boss_defeated, user_move_counts
-    user_score = 0
-    computer_score = 0
-    pumpkin_power_used = False
-    boss_mode_active = False
-    boss_defeated = False
-    user_move_counts = {"rock":0, "paper":0, "scissor":0}
+    game.reset_stats()
+    warm_start()
     update_score_label()
     update_hands("","")
-    comment_label.config(text="👻 New game! Choose your move...")
-    root.config(bg=MAIN_BG)
-
-def get_adaptive_choice():
-    total = sum(user_move_counts.values())
-    if total == 0:
-        return random.choice(options)
-    most = max(user_move_counts, key=lambda k: user_move_counts[k])
-    counter = {"rock":"paper","paper":"scissor","scissor":"rock"}
-    # bias depends on difficulty
-    if difficulty == "Easy":
-        bias = 0.25
-    elif difficulty == "Medium":
-        bias = 0.5
-    else:
-        bias = 0.85
-    # boss mode makes AI stronger
-    if boss_mode_active:
-        bias = min(1.0, bias + 0.15)
-    if random.random() < bias:
-        return counter[most]
-    return random.choice(options)
-
-def check_for_boss():
-    global boss_mode_active
-    if not boss_mode_active and user_score >= boss_threshold and not boss_defeated:
-        boss_mode_active = True
-        comment_label.config(text="👹 Boss Battle! The Boss Bot appears...")
-        play_sound(S_BOSS)
-        root.config(bg="#2b0712")
-        root.after(1200, lambda: comment_label.config(text="💀 Boss is ready!"))
+    ui.config(comment_label, text="👻 New game! Choose your move...")
+    ui.config(root, bg=MAIN_BG)
+
+def announce_boss():
+    ui.config(comment_label, text="👹 Boss Battle! The Boss Bot appears...")
+    play_sound(S_BOSS)
+    ui.config(root, bg="#2b0712")
+    root.after(1200, lambda: ui.config(comment_label, text="💀 Boss is ready!"))
 
 def normal_victory():
-    messagebox.showinfo("You Win!", f"🎉 You reached {score_goal} wins and beat the bot!", parent=root)
+    toaster.show("You Win!", f"🎉 You reached {game.score_goal} wins and beat the bot!")
     reset_stats()
 
 def normal_loss():
-    messagebox.showinfo("You Lose", f"🤖 Bot reached {score_goal} wins. Try again!", parent=root)
+    toaster.show("You Lose", f"🤖 Bot reached {game.score_goal} wins. Try again!")
     reset_stats()
 
 def boss_victory():
-    global boss_defeated, boss_mode_active
-    boss_defeated = True
-    boss_mode_active = False
     update_score_label()
-    messagebox.showinfo("Boss Defeated!", "🏆 You defeated the Boss Bot!", parent=root)
-    root.config(bg=MAIN_BG)
+    toaster.show("Boss Defeated!", "🏆 You defeated the Boss Bot!")
+    ui.config(root, bg=MAIN_BG)
     reset_stats()
 
-def apply_round_result(user_choice, bot_choice):
-    global user_score, computer_score
+def apply_round_result(user_choice, bot_choice, ev):
     update_hands(user_choice, bot_choice)
-    if user_choice == bot_choice:
-        comment_label.config(text="😐 It's a tie — no points.")
+    if ev & EV_TIE:
+        ui.config(comment_label, text="😐 It's a tie — no points.")
         play_sound(S_TIE)
         return
-    # determine winner
-    if (user_choice=="rock" and bot_choice=="scissor") or \
-       (user_choice=="paper" and bot_choice=="rock") or \
-       (user_choice=="scissor" and bot_choice=="paper"):
-        user_score += 1
-        comment_label.config(text=random.choice(["✅ You win this round!", "🎃 You smashed the bot!", "🔥 Nice move!"]))
+    if ev & EV_WIN:
+        ui.config(comment_label, text=comment_rng.choice(["✅ You win this round!", "🎃 You smashed the bot!", "🔥 Nice move!"]))
         play_sound(S_WIN)
     else:
-        computer_score += 1
-        comment_label.config(text=random.choice(funny_bot_comments))
+        ui.config(comment_label, text=comment_rng.choice(funny_bot_comments))
         play_sound(S_LOSE)
     update_score_label()
-    check_for_boss()
-    # check victory conditions
-    if user_score >= score_goal:
-        if boss_mode_active and not boss_defeated:
-            # require extra wins to beat boss (example: +2)
-            if user_score >= score_goal + 2:
-                boss_victory()
-            else:
-                comment_label.config(text="🏁 You weakened the Boss — keep fighting!")
-        else:
-            normal_victory()
-    elif computer_score >= score_goal:
+    if ev & EV_BOSS_APPEARS:
+        announce_boss()
+    # victory conditions (the engine requires extra wins to beat the boss)
+    if ev & EV_BOSS_DEFEATED:
+        boss_victory()
+    elif ev & EV_BOSS_WEAKENED:
+        ui.config(comment_label, text="🏁 You weakened the Boss — keep fighting!")
+    elif ev & EV_VICTORY:
+        normal_victory()
+    elif ev & EV_DEFEAT:
         normal_loss()
 
+@profiled("play_round")
 def play_round(user_choice):
     # called when user selects a move
-    global user_move_counts
-    user_move_counts[user_choice] += 1
-    bot_choice = get_adaptive_choice()
-    apply_round_result(user_choice, bot_choice)
+    ui.begin_round()
+    move = MOVE_INDEX[user_choice]
+    undo_stack.append(game.snapshot())
+    bot, ev = play_logged(game, move)
+    profiles.record(user_character, move)
+    if not game.total_moves:
+        warm_start()    # the engine just finished a match and reset
+    apply_round_result(user_choice, options[bot], ev)
 
 # ---------------- Cheats ----------------
 def activate_pumpkin_power(event=None):
-    global pumpkin_power_used, user_score
-    if pumpkin_power_used:
+    ev = game.pumpkin_power()
+    if ev is None:
         messagebox.showwarning("No Cheating Twice!", "You already used Pumpkin Power!", parent=root)
         return
-    pumpkin_power_used = True
-    user_score += 1
     update_score_label()
-    comment_label.config(text="🎃 Pumpkin Power activated! +1 point")
+    ui.config(comment_label, text="🎃 Pumpkin Power activated! +1 point")
     play_sound(S_CHEAT)
-    check_for_boss()
+    if ev & EV_BOSS_APPEARS:
+        announce_boss()
 
 def do_easter_egg():
-    global user_score
-    user_score += 1
+    game.easter_egg()
     update_score_label()
-    root.config(bg="#2b001a")
-    comment_label.config(text="🎃 Trick or Treat! Bonus point awarded!")
-
-# ---------------- Voice (threaded) ----------------
-voice_listening = False
-def listen_once():
-    global voice_listening
-    if not VOICE_AVAILABLE:
-        root.after(50, lambda: messagebox.showinfo("Voice", "Voice support not installed (SpeechRecognition)."))
-        return
-    try:
-        play_sound(S_VOICE)
-        r = sr.Recognizer()
-        with sr.Microphone() as mic:
-            r.adjust_for_ambient_noise(mic, duration=0.4)
-            audio = r.listen(mic, timeout=5, phrase_time_limit=3)
-        text = r.recognize_google(audio).lower()
-        # map recognized text to moves
-        if "rock" in text:
-            root.after(50, lambda: play_round("rock"))
-        elif "paper" in text:
-            root.after(50, lambda: play_round("paper"))
-        elif "scissor" in text or "scissors" in text:
-            root.after(50, lambda: play_round("scissor"))
-        else:
-            root.after(50, lambda: comment_label.config(text="❓ Couldn't understand. Say rock/paper/scissor."))
-    except Exception as e:
-        root.after(50, lambda: messagebox.showwarning("Voice Error", f"Voice input failed: {e}"))
-    finally:
-        voice_listening = False
-        voice_button.config(text="🎤 Voice: OFF", bg="#444")
+    ui.config(root, bg="#2b001a")
+    ui.config(comment_label, text="🎃 Trick or Treat! Bonus point awarded!")
+
+# ---------------- Voice (one long-lived worker) ----------------
+def voice_move(move):
+    bus.post(play_round, move)
+
+def voice_unknown():
+    bus.post(lambda: ui.config(comment_label, text="❓ Couldn't understand. Say rock/paper/scissor."))
+
+def voice_failed(e):
+    def show():
+        ui.config(voice_button, text="🎤 Voice: OFF", bg="#444")
+        messagebox.showwarning("Voice Error", f"Voice input failed: {e}")
+    bus.post(show)
+
+voice_worker = VoiceWorker(voice_move, voice_unknown, voice_failed)
 
 def toggle_voice_mode():
-    global voice_listening
-    if not VOICE_AVAILABLE:
+    if load_speech() is None:
         messagebox.showinfo("Voice", "Voice support not installed (SpeechRecognition).")
         return
-    if voice_listening:
-        voice_listening = False
-        voice_button.config(text="🎤 Voice: OFF", bg="#444")
+    if voice_worker.listening:
+        voice_worker.pause()
+        ui.config(voice_button, text="🎤 Voice: OFF", bg="#444")
     else:
-        voice_listening = True
-        voice_button.config(text="🎤 Voice: LISTENING...", bg="#2aa")
-        t = threading.Thread(target=listen_once, daemon=True)
-        t.start()
+        play_sound(S_VOICE)
+        voice_worker.start()
+        ui.config(voice_button, text="🎤 Voice: LISTENING...", bg="#2aa")
 
 # ---------------- Cheat console processing ----------------
+def log_stats():
+    match_log.flush()
+    return summary_text(scan(match_log.path))
+
+def replay_command(match=None):
+    match_log.flush()
+    try:
+        return replay_text(replay(match_log.path, None if match is None else int(match)))
+    except (ReplayError, ValueError) as e:
+        raise ConsoleError(f"replay: {e}")
+
+def show_restored():
+    # redraw what a restore (undo, resume) may have changed
+    update_score_label()
+    update_hands("", "")
+    ui.config(root, bg="#2b0712" if game.boss_mode_active else MAIN_BG)
+
+def undo_command(rounds="1"):
+    try:
+        n = int(rounds)
+    except ValueError:
+        n = 0
+    if n < 1:
+        raise ConsoleError("usage: undo [rounds]")
+    if not undo_stack:
+        return "Nothing to undo."
+    n = min(n, len(undo_stack))
+    for _ in range(n - 1):
+        undo_stack.pop()
+    try:
+        game.restore(undo_stack.pop())
+    except ValueError as e:
+        raise ConsoleError(f"undo: {e}")
+    show_restored()
+    ui.config(comment_label, text=f"↩️ Took back {n} round{'s' if n > 1 else ''}.")
+
+def save_command(path=SAVE_PATH):
+    try:
+        size = save_game(game, path)
+    except SaveError as e:
+        raise ConsoleError(f"save: {e}")
+    return f"Saved to {path} ({size} bytes): {describe(game)}"
+
+def resume_command(path=SAVE_PATH):
+    try:
+        resume(game, path)
+    except (SaveError, ValueError) as e:
+        raise ConsoleError(f"resume: {e}")
+    undo_stack.clear()
+    show_restored()
+    return f"Resumed {path}: {describe(game)}"
+
+def set_profiling(on):
+    rps_profiler.set_enabled(on)
+    ui.config(comment_label, text="⏱️ Profiling on — type 'stats' to see timings." if on else "⏱️ Profiling off.")
+
+def profile_command(action):
+    if action in ("on", "off"):
+        set_profiling(action == "on")
+        return None
+    if action == "dump":
+        return f"Profile written to {rps_profiler.dump()}"
+    raise ConsoleError("usage: profile on | off | dump")
+
+# --- autoplay: a scripted or bot player, drawn once per frame, no sounds or dialogs ---
+autoplay = None
+
+def render_autoplay(ap):
+    if ap.last is not None:
+        user, bot, _ = ap.last
+        update_hands(options[user], options[bot])
+    update_score_label()
+    ui.config(comment_label, text=f"🤖 Autoplay {ap.played}/{ap.rounds} — {ap.rate():,.0f} rounds/s")
+
+def autoplay_done(ap):
+    global autoplay
+    autoplay = None
+    toaster.show("Autoplay", ap.summary())
+    ui.config(comment_label, text="🤖 Autoplay finished.")
+
+def autoplay_command(rounds, every="0", player="random"):
+    global autoplay
+    if rounds == "stop":
+        if autoplay is None:
+            return "Autoplay is not running."
+        autoplay.stop()
+        return None
+    if autoplay is not None:
+        raise ConsoleError("autoplay is already running (autoplay stop)")
+    try:
+        n, k = int(rounds), int(every)
+        bot_player = make_player(player, game.stream("autoplay"))
+    except ValueError as e:
+        raise ConsoleError(f"usage: autoplay N [every] [player] | autoplay stop ({e})")
+    if n <= 0 or k < 0:
+        raise ConsoleError("usage: autoplay N [every] [player]; N > 0, every >= 0")
+    autoplay = Autoplay(root, game, n, render_autoplay, autoplay_done, bot_player, every=k,
+                        play=play_logged).start()
+    return None
+
+# the UI is built below, so show/hold look it up when a command runs
+console = CommandConsole(show=lambda title, text: messagebox.showinfo(title, text), hold=lambda: ui.hold())
+console.add("pumpkinpower", lambda: activate_pumpkin_power(), "+1 point, once per match")
+console.add("trickortreat", do_easter_egg, "bonus point")
+console.add("reset", reset_stats, "start a new match")
+console.add("undo", undo_command, f"take back the last round(s), up to {UNDO_DEPTH}")
+console.add("save", save_command, "save scores to a file")
+console.add("resume", resume_command, "continue from a saved file")
+console.add("redraws", lambda: ui.stats(), "widget update counts")
+console.add("charts", lambda: chart_panel.toggle(), "show / hide the live analytics charts")
+console.add("events", lambda: bus.stats(), "worker-thread event bus counts and latency")
+console.add("startup", rps_startup.report, "startup timing")
+console.add("logstats", log_stats, "match log summary")
+console.add("replay", replay_command, "rebuild a logged match from its seed and check it (default: the last)")
+console.add("stats", rps_profiler.stats_text, "profiler latency percentiles")
+console.add("profile", profile_command, "profile on | off | dump")
+console.add("autoplay", autoplay_command, "play N rounds for you (draw every k-th; player random|cycle|rock|ensemble|r,p,s) or stop")
+
 def process_console_command(cmd):
-    c = cmd.strip().lower()
-    if not c:
-        return
-    if c == "pumpkinpower":
-        activate_pumpkin_power()
-    elif c == "reset":
-        reset_stats()
-    elif c == "help":
-        messagebox.showinfo("Commands", "pumpkinpower, reset, help, trickortreat")
-    elif c == "trickortreat":
-        do_easter_egg()
-    else:
-        messagebox.showinfo("Unknown", f"Unknown command: {c}")
+    console.execute(cmd)
+
+def complete_console_command(event=None):
+    # Tab: complete the command word being typed (after the last ';')
+    text = console_entry.get()
+    head, sep, word = text.rpartition(";")
+    word = word.lstrip()
+    if not word or " " in word:
+        return "break"
+    names = console.complete(word)
+    if len(names) == 1:
+        console_entry.delete(0, tk.END)
+        console_entry.insert(0, f"{head}{sep}{' ' if sep else ''}{names[0]} ")
+    elif names:
+        ui.config(comment_label, text="⌨️ " + "  ".join(names))
+    return "break"
 
 # ---------------- UI building ----------------
 MAIN_BG = "#1e0f1a"
-root = tk.Tk()
+try:
+    root = tk.Tk()
+except tk.TclError as e:
+    raise SystemExit(f"No display ({e}). In a terminal or over SSH run: python rps_tui.py")
 root.title("🎃 RPS Bot Quick — Halloween Edition")
 root.geometry("560x680")
 root.config(bg=MAIN_BG)
+ui = Renderer(root)   # every widget change below goes through one after_idle flush
+bus = EventBus().attach(root)   # worker threads post here instead of touching Tk
+chart_panel = ChartPanel(root, round_stats)   # its window is built the first time it opens
+toaster = Toaster(root)   # match transitions are in-window toasts, never modal dialogs
 
 tk.Label(root, text="🎃 Halloween RPS — Bot Quick", font=("Arial", 16, "bold"), fg="orange", bg=MAIN_BG).pack(pady=8)
 tk.Label(root, text="Choose a move, use cheat console, or enable voice.", bg=MAIN_BG, fg="white").pack()
@@ -290,23 +374,22 @@ def set_character():
         update_hands("","")
 tk.Button(menu_frame, text="🎭 Character", command=set_character, bg="orange").grid(row=0, column=0, padx=6)
 def set_goal():
-    global score_goal
     g = simpledialog.askinteger("Score Goal", "Enter wins needed (e.g. 3,4,5)", parent=root, minvalue=1, maxvalue=50)
     if g:
-        score_goal = int(g)
+        game.set_goal(int(g))
         update_score_label()
 tk.Button(menu_frame, text="🏆 Goal", command=set_goal, bg="orange").grid(row=0, column=1, padx=6)
 def set_difficulty():
-    global difficulty, boss_threshold
-    d = simpledialog.askstring("Difficulty", "Enter difficulty: Easy, Medium, or Hard", parent=root)
-    if d and d.strip().lower() in ("easy","medium","hard"):
-        difficulty = d.strip().capitalize()
-        # adjust boss threshold and optionally other params
-        boss_threshold = 3 if difficulty=="Easy" else (3 if difficulty=="Medium" else 2)
-        messagebox.showinfo("Difficulty Set", f"Difficulty set to {difficulty}")
+    d = simpledialog.askstring("Difficulty", "Enter difficulty: Easy, Medium, Hard, or Ensemble", parent=root)
+    if d and d.strip().lower() in ("easy","medium","hard","ensemble"):
+        # the engine also moves the boss threshold (Hard brings the boss in at 2);
+        # Ensemble is the meta-strategy bot from rps_strategies
+        game.set_difficulty(d.strip().capitalize())
+        messagebox.showinfo("Difficulty Set", f"Difficulty set to {game.difficulty}")
     else:
-        messagebox.showwarning("Invalid", "Please choose Easy, Medium or Hard.")
+        messagebox.showwarning("Invalid", "Please choose Easy, Medium, Hard or Ensemble.")
 tk.Button(menu_frame, text="💀 Difficulty", command=set_difficulty, bg="orange").grid(row=0, column=2, padx=6)
+tk.Button(menu_frame, text="📈 Charts", command=lambda: chart_panel.toggle(), bg="orange").grid(row=0, column=3, padx=6)
 
 # Play buttons
 btn_frame = tk.Frame(root, bg=MAIN_BG)
@@ -348,25 +431,26 @@ def on_console_enter(event=None):
     process_console_command(cmd)
 
 console_entry.bind("<Return>", on_console_enter)
+console_entry.bind("<Tab>", complete_console_command)
 tk.Button(console_frame, text="Run", command=lambda: on_console_enter(), bg="#ff7518").pack(side="right", padx=6)
 
-# Bind secret typing for Easter egg
-def secret_keypress(event):
-    global secret_buffer
-    ch = event.char.lower() if hasattr(event, "char") else ""
-    if ch and ch.isprintable():
-        secret_buffer += ch
-        if len(secret_buffer) > len(SECRET_CODE):
-            secret_buffer = secret_buffer[-len(SECRET_CODE):]
-        if secret_buffer == SECRET_CODE:
-            secret_buffer = ""
-            do_easter_egg()
-
-root.bind_all("<Key>", secret_keypress)
+# Typed cheat codes (one table lookup per keystroke)
+SECRET_CODE = "trickortreat"
+cheats = CheatMatcher()
+cheats.add(SECRET_CODE, do_easter_egg)
+root.bind_all("<Key>", cheats.key_event)
 # Bind Ctrl+Shift+P for pumpkin power
 root.bind_all("<Control-Shift-P>", lambda e: activate_pumpkin_power())
 root.bind_all("<Control-Shift-p>", lambda e: activate_pumpkin_power())
 
 # Ready
-play_sound(S_VOICE)
+rps_startup.mark("window built")
+
+def on_first_frame():
+    # ready sound (brings the mixer up in the background), then warm up voice
+    play_sound(S_VOICE)
+    rps_startup.warm_up(load_speech, voice_worker.prepare)
+    profiles.start(lambda: bus.post(warm_start))
+
+rps_startup.after_first_frame(root, on_first_frame)
 root.mainloop()
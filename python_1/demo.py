@@ -1,26 +1,35 @@
 # rps_halloween_cheat_console.py
-import random
-import threading
+import rps_startup   # first: starts the startup clock
 import tkinter as tk
 from tkinter import messagebox, simpledialog
 import time
-import os
-
-# --- Optional packages (sound + voice) ---
-try:
-    import pygame
-    pygame.mixer.init()
-    SOUND_AVAILABLE = True
-except Exception as e:
-    SOUND_AVAILABLE = False
-    print("pygame not available. Sound disabled.", e)
-
-try:
-    import speech_recognition as sr
-    VOICE_AVAILABLE = True
-except Exception as e:
-    VOICE_AVAILABLE = False
-    print("SpeechRecognition not available. Voice disabled.", e)
+from collections import deque
+
+from rps_engine import (Game, options, MOVE_INDEX, EV_TIE, EV_WIN, EV_BOSS_APPEARS,
+                        EV_BOSS_WEAKENED, EV_BOSS_DEFEATED, EV_VICTORY, EV_DEFEAT,
+                        EV_ENEMY_DEFEATED, EV_NEXT_ENEMY, EV_STORY_LOST)
+from rps_predict import NGramPredictor
+from rps_render import Renderer
+from rps_events import EventBus
+from rps_toast import Toaster
+from rps_cheats import CheatMatcher
+from rps_console import CommandConsole, ConsoleError
+from rps_autoplay import Autoplay, make_player
+from rps_matchlog import MatchLog, scan, summary_text
+from rps_replay import ReplayError, replay, replay_text
+from rps_charts import ChartPanel, RoundStats
+from rps_save import DEFAULT_PATH as SAVE_PATH, UNDO_DEPTH, SaveError, describe, resume, save_game
+from rps_profiles import ProfileStore
+import rps_profiler
+from rps_profiler import profiled
+from rps_cutscene import play_cutscene
+from rps_campaign import CampaignError, Prefetcher, builtin_campaign, load_campaign
+
+# --- Optional packages (sound + voice), loaded on first use ---
+from rps_sound import SoundBank
+from rps_voice import VoiceWorker, load_speech
+
+rps_startup.mark("imports")
 
 # --- Sound filenames (put files in same folder or change paths) ---
 S_WIN = "win.wav"
@@ -30,39 +39,46 @@ S_BOSS = "boss.wav"
 S_CHEAT = "cheat.wav"
 S_VOICE = "voice_beep.wav"
 
+# decoded once in the background; play_sound never loads from disk
+sound_bank = SoundBank([S_WIN, S_LOSE, S_TIE, S_BOSS, S_CHEAT, S_VOICE])
+
+@profiled("play_sound")
 def play_sound(fname):
-    if not SOUND_AVAILABLE:
-        return
-    try:
-        if not os.path.isfile(fname):
-            return
-        s = pygame.mixer.Sound(fname)
-        s.play()
-    except Exception as e:
-        print("Sound play error:", e)
+    sound_bank.play(fname)
 
 # -----------------------------
 # Game globals
 # -----------------------------
-user_score = 0
-computer_score = 0
-pumpkin_power_used = False
-score_goal = 3
-difficulty = "Easy"   # Easy/Medium/Hard
+# All rules and scores live in the headless engine; this file is only the view.
+# story campaign from RPS_CAMPAIGN (default campaign.json), else the built-in three enemies
+try:
+    campaign = load_campaign()
+except CampaignError as e:
+    print("Campaign error:", e)
+    campaign = builtin_campaign()
+game = Game(score_goal=3, difficulty="Easy", boss_threshold=3, predictor=NGramPredictor(),
+            enemies=campaign.enemies)
+# readies the next story enemy (sounds, strategy) off the Tk thread while the current one is fought
+prefetcher = Prefetcher(game, sound_bank)
+# every round is appended to a binary log (RPS_MATCH_LOG, default matches.rpslog)
+match_log = MatchLog()
+match_log.attach(game)    # seed and every game change too, so "replay" can rebuild any match
+comment_rng = game.stream("comments")
+undo_stack = deque(maxlen=UNDO_DEPTH)   # game.snapshot() before each round (console: undo)
+round_stats = RoundStats()              # session totals behind the analytics charts
+
+def play_logged(g, move):
+    # every round, by hand or by autoplay: logged, then counted for the charts
+    bot, ev = match_log.play(g, move)
+    round_stats.add(move, bot, g.branch)
+    return bot, ev
+rps_profiler.profile_method(Game, "bot_choice")   # timed while profiling is on
+# lifetime move counts per character (RPS_PROFILE_DB, default profiles.sqlite3); opened after the first frame
+profiles = ProfileStore()
 user_character = "🎃"
-boss_mode_active = False
-boss_threshold = 3    # user score that triggers boss
-boss_defeated = False
 
-options = ['rock', 'paper', 'scissor']
 hand_emojis = {"rock": "✊", "paper": "✋", "scissor": "✌️"}
 
-# adaptive tracking
-user_move_counts = {"rock": 0, "paper": 0, "scissor": 0}
-
-# secret buffer for typed Easter egg (keeps track of last letters typed)
-secret_buffer = ""
-SECRET_CODE = "trickortreat"
 
 funny_bot_comments = [
     "😏 I’m just warming up...",
@@ -75,71 +91,57 @@ funny_bot_comments = [
 ]
 
 # ===== STORY MODE SECTION =====
-# Story mode variables
-story_mode = False
-current_enemy_index = 0
-enemy_score = 0
-story_enemies = [
-    {"name": "👻 Ghost Bot", "difficulty": "Easy", "rounds": 2, "bg": "#2f2f36"},
-    {"name": "🧙 Witch Bot", "difficulty": "Medium", "rounds": 3, "bg": "#3a1a4a"},
-    {"name": "💀 Boss Bot", "difficulty": "Hard", "rounds": 4, "bg": "#2b0712"}
-]
-enemy_target = story_enemies[0]["rounds"]
-
 def start_story_mode_actual():
     """
     This begins story mode proper (called after the cutscene finishes).
     """
-    global story_mode, current_enemy_index, enemy_score, user_score, computer_score, enemy_target
-    story_mode = True
-    current_enemy_index = 0
-    enemy_score = 0
-    user_score = 0
-    computer_score = 0
-    enemy_target = story_enemies[current_enemy_index]["rounds"]
+    game.start_story()
+    enemy_intro(game.current_enemy)
     # change background for cinematic effect of first enemy
     try:
-        root.config(bg=story_enemies[current_enemy_index].get("bg", MAIN_BG))
+        ui.config(root, bg=game.current_enemy.get("bg", MAIN_BG))
     except Exception:
-        root.config(bg=MAIN_BG)
-    messagebox.showinfo("Story Mode", f"🎮 STORY MODE ACTIVATED!\nFirst opponent: {story_enemies[current_enemy_index]['name']}")
+        ui.config(root, bg=MAIN_BG)
+    toaster.show("Story Mode", f"🎮 STORY MODE ACTIVATED!\nFirst opponent: {game.current_enemy['name']}")
     update_enemy_banner()
 
-def next_enemy():
+def next_enemy(ev):
     """
-    Move to the next enemy or finish story mode.
+    Show the switch to the next enemy (the engine already moved on) or the story ending.
     """
-    global current_enemy_index, enemy_score, story_mode, user_score, computer_score, enemy_target
-    current_enemy_index += 1
-    if current_enemy_index < len(story_enemies):
-        enemy_score = 0
-        user_score = 0
-        computer_score = 0
-        enemy_target = story_enemies[current_enemy_index]["rounds"]
+    if ev & EV_NEXT_ENEMY:
+        enemy = game.current_enemy
+        enemy_intro(enemy)
+        if enemy["cutscene"]:
+            play_cutscene(root, lambda: None, **enemy["cutscene"])
         # change background color for flavor
         try:
-            root.config(bg=story_enemies[current_enemy_index].get("bg", MAIN_BG))
+            ui.config(root, bg=enemy.get("bg", MAIN_BG))
         except Exception:
-            root.config(bg=MAIN_BG)
-        messagebox.showinfo("Next Battle!", f"Now facing {story_enemies[current_enemy_index]['name']} ({story_enemies[current_enemy_index]['difficulty']})")
-        update_enemy_banner()
+            ui.config(root, bg=MAIN_BG)
+        toaster.show("Next Battle!", f"Now facing {enemy['name']} ({enemy['difficulty']})")
     else:
-        story_mode = False
         # restore main bg
-        root.config(bg=MAIN_BG)
-        messagebox.showinfo("Victory!", "🎉 You defeated all haunted bots! You unlocked the Secret Ending!")
-        update_enemy_banner()
+        ui.config(root, bg=MAIN_BG)
+        toaster.show("Victory!", "🎉 You defeated all haunted bots! You unlocked the Secret Ending!")
+    update_enemy_banner()
+
+def enemy_intro(enemy):
+    if "intro" in enemy["sounds"]:
+        play_sound(enemy["sounds"]["intro"])
+    # the fight after this one is prepared while this one runs
+    prefetcher.prefetch(game.current_enemy_index + 1)
 
 def update_enemy_banner():
     """
     Update the comment_label depending on story mode or normal mode.
     """
     if 'comment_label' in globals():
-        if story_mode:
-            enemy = story_enemies[current_enemy_index]
-            comment_label.config(text=f"⚔️ {enemy['name']} — {enemy['difficulty']} Mode")
+        if game.story_mode:
+            enemy = game.current_enemy
+            ui.config(comment_label, text=f"⚔️ {enemy['name']} — {enemy['difficulty']} Mode")
         else:
-            comment_label.config(text="👻 Welcome! Use the cheat console below (type help).")
+            ui.config(comment_label, text="👻 Welcome! Use the cheat console below (type help).")
 # ===== END STORY MODE SECTION =====
 
 
@@ -147,352 +149,192 @@ def update_enemy_banner():
 # Utility & Game functions
 # -----------------------------
 def update_score_label():
-    score_text.set(f"📊 Score: You {user_score} - Bot {computer_score}")
+    ui.set(score_text, f"📊 Score: You {game.user_score} - Bot {game.computer_score}")
 
 def update_hands(user_hand, bot_hand):
-    user_hand_label.config(text=f"{user_character} You: {hand_emojis.get(user_hand, '')}" if user_hand else f"{user_character} You: ")
-    computer_hand_label.config(text=f"🤖 Bot: {hand_emojis.get(bot_hand, '')}" if bot_hand else "🤖 Bot: ")
+    ui.config(user_hand_label, text=f"{user_character} You: {hand_emojis.get(user_hand, '')}" if user_hand else f"{user_character} You: ")
+    ui.config(computer_hand_label, text=f"🤖 Bot: {hand_emojis.get(bot_hand, '')}" if bot_hand else "🤖 Bot: ")
+
+def warm_start():
+    # a new match starts from what this character usually plays
+    game.warm_start(profiles.prior(user_character))
 
 def reset_stats():
-    global user_score, computer_score, pumpkin_power_used, boss_mode_active, boss_defeated, user_move_counts, story_mode
-    user_score = 0
-    computer_score = 0
-    pumpkin_power_used = False
-    boss_mode_active = False
-    boss_defeated = False
-    user_move_counts = {"rock": 0, "paper": 0, "scissor": 0}
     # If inside story mode, don't fully exit it; just reset scores.
+    game.reset_stats()
+    warm_start()
     update_score_label()
     update_hands("", "")
     # restore main bg if not in story mode; if in story mode, keep that enemy bg
-    if not story_mode:
-        root.config(bg=MAIN_BG)
-    comment_label.config(text="👻 New game! Choose your move...")
+    if not game.story_mode:
+        ui.config(root, bg=MAIN_BG)
+    ui.config(comment_label, text="👻 New game! Choose your move...")
     root.focus_force()
 
-# --- Adaptive bot ---
-def get_adaptive_choice():
-    total = sum(user_move_counts.values())
-    if total == 0:
-        return random.choice(options)
-    most = max(user_move_counts, key=lambda k: user_move_counts[k])
-    counter = {"rock": "paper", "paper": "scissor", "scissor": "rock"}
-    if difficulty == "Easy":
-        if random.random() < 0.25:
-            return counter[most]
-        return random.choice(options)
-    elif difficulty == "Medium":
-        if random.random() < 0.5:
-            return counter[most]
-        return random.choice(options)
-    else:  # Hard
-        bias = 0.8 if not boss_mode_active else 0.95
-        if random.random() < bias:
-            return counter[most]
-        return random.choice(options)
-
-def get_bot_choice():
-    # When in story mode, we can bias selection by that enemy's difficulty if desired.
-    if boss_mode_active:
-        return get_adaptive_choice()
-    else:
-        if story_mode:
-            # Slightly bias by current enemy difficulty
-            enemy = story_enemies[current_enemy_index]
-            ed = enemy.get("difficulty", "Easy").lower()
-            if ed == "easy":
-                if random.random() < 0.25:
-                    return get_adaptive_choice()
-                return random.choice(options)
-            elif ed == "medium":
-                if random.random() < 0.5:
-                    return get_adaptive_choice()
-                return random.choice(options)
-            else:  # hard
-                if random.random() < 0.75:
-                    return get_adaptive_choice()
-                return random.choice(options)
-        else:
-            if difficulty == "Easy":
-                return random.choice(options)
-            elif difficulty == "Medium":
-                if random.random() < 0.35:
-                    return get_adaptive_choice()
-                return random.choice(options)
-            else:  # Hard
-                if random.random() < 0.7:
-                    return get_adaptive_choice()
-                return random.choice(options)
-
 # --- Boss handling ---
-def check_for_boss():
-    global boss_mode_active
-    if not boss_mode_active and user_score >= boss_threshold and not boss_defeated:
-        boss_mode_active = True
-        comment_label.config(text="👹 Boss Battle! The Boss Bot appears...")
-        play_sound(S_BOSS)
-        root.config(bg="#2b0712")
-        root.after(1200, lambda: comment_label.config(text="💀 Boss is ready! Choose carefully..."))
+def announce_boss():
+    ui.config(comment_label, text="👹 Boss Battle! The Boss Bot appears...")
+    play_sound(S_BOSS)
+    ui.config(root, bg="#2b0712")
+    root.after(1200, lambda: ui.config(comment_label, text="💀 Boss is ready! Choose carefully..."))
 
 def normal_victory():
-    messagebox.showinfo("You Win!", f"🎉 You reached {score_goal} wins! You defeated the bot.", parent=root)
+    toaster.show("You Win!", f"🎉 You reached {game.score_goal} wins! You defeated the bot.")
     reset_stats()
 
 def normal_loss():
-    messagebox.showinfo("You Lose", f"🤖 The bot reached {score_goal} wins. Better luck next time.", parent=root)
+    toaster.show("You Lose", f"🤖 The bot reached {game.score_goal} wins. Better luck next time.")
     reset_stats()
 
 def boss_victory():
-    global boss_defeated, boss_mode_active
-    boss_defeated = True
-    boss_mode_active = False
     update_score_label()
-    messagebox.showinfo("Boss Defeated!", "🏆 You defeated the Boss Bot! Congratulations!", parent=root)
-    root.config(bg=MAIN_BG)
+    toaster.show("Boss Defeated!", "🏆 You defeated the Boss Bot! Congratulations!")
+    ui.config(root, bg=MAIN_BG)
     play_sound(S_BOSS)
     reset_stats()
 
 # --- main play round ---
+@profiled("play_round")
 def play_round(user_choice):
-    global user_score, computer_score
-    # record user move
-    user_move_counts[user_choice] += 1
-
-    bot_choice = get_bot_choice()
+    ui.begin_round()
+    enemy = game.current_enemy
+    sounds = enemy["sounds"] if game.story_mode else {}
+    move = MOVE_INDEX[user_choice]
+    undo_stack.append(game.snapshot())
+    bot, ev = play_logged(game, move)
+    profiles.record(user_character, move)
+    if not game.total_moves:
+        warm_start()    # the engine just finished a match and reset
+    bot_choice = options[bot]
 
     update_hands(user_choice, bot_choice)
 
-    if user_choice == bot_choice:
-        comment_label.config(text="😐 It's a tie — no points.")
-        play_sound(S_TIE)
+    if ev & EV_TIE:
+        ui.config(comment_label, text="😐 It's a tie — no points.")
+        play_sound(sounds.get("tie", S_TIE))
         return
 
-    # user win conditions
-    if (user_choice == "rock" and bot_choice == "scissor") or \
-       (user_choice == "paper" and bot_choice == "rock") or \
-       (user_choice == "scissor" and bot_choice == "paper"):
-        user_score += 1
-        comment_label.config(text=random.choice([
+    if ev & EV_WIN:
+        ui.config(comment_label, text=comment_rng.choice([
             "✅ You win this round!",
             "🎃 You smashed the bot!",
             "🔥 Nice move!"
         ]))
-        play_sound(S_WIN)
+        play_sound(sounds.get("win", S_WIN))
     else:
-        computer_score += 1
-        comment_label.config(text=random.choice(funny_bot_comments))
-        play_sound(S_LOSE)
+        ui.config(comment_label, text=comment_rng.choice(funny_bot_comments))
+        play_sound(sounds.get("lose", S_LOSE))
 
     update_score_label()
-    check_for_boss()
+    if ev & EV_BOSS_APPEARS:
+        announce_boss()
 
     # ===== STORY MODE ROUND CHECK =====
-    if story_mode:
-        # in story mode, threshold is enemy_target rounds
-        if user_score >= enemy_target:
-            messagebox.showinfo("Victory!", f"You defeated {story_enemies[current_enemy_index]['name']}!")
-            next_enemy()
-        elif computer_score >= enemy_target:
-            messagebox.showinfo("Defeat!", "💀 You were defeated! Restarting story mode...")
-            # play cutscene again then restart story
-            play_test_cutscene_then_start_story()
+    if ev & EV_ENEMY_DEFEATED:
+        toaster.show("Victory!", f"You defeated {enemy['name']}!")
+        next_enemy(ev)
+        return
+    if ev & EV_STORY_LOST:
+        toaster.show("Defeat!", "💀 You were defeated! Restarting story mode...")
+        # play cutscene again then restart story
+        play_test_cutscene_then_start_story()
         return
     # ===== END STORY MODE ROUND CHECK =====
 
     # victory conditions (normal mode)
-    if user_score >= score_goal:
-        if boss_mode_active and not boss_defeated:
-            boss_extra = 2
-            if user_score >= score_goal + boss_extra:
-                boss_victory()
-            else:
-                comment_label.config(text="🏁 You weakened the Boss — keep fighting!")
-        else:
-            normal_victory()
-    elif computer_score >= score_goal:
+    if ev & EV_BOSS_DEFEATED:
+        boss_victory()
+    elif ev & EV_BOSS_WEAKENED:
+        ui.config(comment_label, text="🏁 You weakened the Boss — keep fighting!")
+    elif ev & EV_VICTORY:
+        normal_victory()
+    elif ev & EV_DEFEAT:
         normal_loss()
 
 # --- Cheat functions & Easter egg ---
 def activate_pumpkin_power(event=None):
-    global pumpkin_power_used, user_score
-    if pumpkin_power_used:
+    ev = game.pumpkin_power()
+    if ev is None:
         messagebox.showwarning("No Cheating Twice!", "You already used Pumpkin Power!", parent=root)
         return
-    pumpkin_power_used = True
-    user_score += 1
     update_score_label()
-    comment_label.config(text="🎃 Pumpkin Power activated! +1 point")
+    ui.config(comment_label, text="🎃 Pumpkin Power activated! +1 point")
     play_sound(S_CHEAT)
-    check_for_boss()
+    if ev & EV_BOSS_APPEARS:
+        announce_boss()
 
 def force_boss_battle():
-    global boss_mode_active
-    if boss_mode_active:
-        comment_label.config(text="👾 Boss already active!")
+    if not game.force_boss():
+        ui.config(comment_label, text="👾 Boss already active!")
         return
-    boss_mode_active = True
-    comment_label.config(text="👹 Boss forced! Prepare...")
+    ui.config(comment_label, text="👹 Boss forced! Prepare...")
     play_sound(S_BOSS)
-    root.config(bg="#2b0712")
-    root.after(1000, lambda: comment_label.config(text="💀 Boss is ready!"))
+    ui.config(root, bg="#2b0712")
+    root.after(1000, lambda: ui.config(comment_label, text="💀 Boss is ready!"))
 
 def do_easter_egg():
-    global user_score
-    comment_label.config(text="🎃 Trick or Treat! Pumpkin theme unlocked +1 bonus point!")
+    ui.config(comment_label, text="🎃 Trick or Treat! Pumpkin theme unlocked +1 bonus point!")
     play_sound(S_BOSS)
-    root.config(bg="#2b001a")
-    user_score += 1
+    ui.config(root, bg="#2b001a")
+    game.easter_egg()
     update_score_label()
 
-# --- Secret buffer handler for typed Easter code via general keypresses ---
-def secret_key_pressed(event):
-    global secret_buffer
-    try:
-        c = event.char.lower()
-    except Exception:
-        return
-    if not c:
-        return
-    if c.isprintable():
-        secret_buffer += c
-        if len(secret_buffer) > len(SECRET_CODE):
-            secret_buffer = secret_buffer[-len(SECRET_CODE):]
-        if secret_buffer == SECRET_CODE:
-            secret_buffer = ""
-            do_easter_egg()
-
-# --- Voice mode (threaded listen) ---
-voice_mode_on = False
-voice_thread = None
+# --- Typed cheat codes (checked on every keystroke, one table lookup each) ---
+SECRET_CODE = "trickortreat"
+cheats = CheatMatcher()
+cheats.add(SECRET_CODE, do_easter_egg)
+
+# --- Voice mode (one long-lived worker, offline keywords) ---
+def voice_move(move):
+    bus.post(play_round, move)
+
+def voice_unknown():
+    bus.post(lambda: ui.config(comment_label, text="❓Couldn't understand. Say rock / paper / scissor."))
+
+def voice_failed(e):
+    def show():
+        ui.config(voice_button, text="🎤 Voice: OFF", bg="#444")
+        messagebox.showwarning("Voice Error", "Voice input failed. Check mic, pyaudio and the offline voice model.", parent=root)
+    bus.post(show)
+
+voice_worker = VoiceWorker(voice_move, voice_unknown, voice_failed)
 
 def toggle_voice_mode():
-    global voice_mode_on, voice_thread
-    if not VOICE_AVAILABLE:
+    if load_speech() is None:
         messagebox.showwarning("Voice Not Available", "SpeechRecognition not installed or microphone not accessible.", parent=root)
         return
-    if voice_mode_on:
-        voice_mode_on = False
-        voice_button.config(text="🎤 Voice: OFF", bg="#444")
+    if voice_worker.listening:
+        voice_worker.pause()
+        ui.config(voice_button, text="🎤 Voice: OFF", bg="#444")
     else:
-        voice_mode_on = True
-        voice_button.config(text="🎤 Voice: LISTENING...", bg="#2aa")
-        voice_thread = threading.Thread(target=listen_once, daemon=True)
-        voice_thread.start()
-
-def listen_once():
-    global voice_mode_on
-    try:
         play_sound(S_VOICE)
-        r = sr.Recognizer()
-        with sr.Microphone() as mic:
-            r.adjust_for_ambient_noise(mic, duration=0.5)
-            audio = r.listen(mic, timeout=5, phrase_time_limit=3)
-        text = r.recognize_google(audio).lower()
-        print("Recognized:", text)
-        if "rock" in text:
-            root.after(50, lambda: play_round("rock"))
-        elif "paper" in text:
-            root.after(50, lambda: play_round("paper"))
-        elif "scissor" in text or "scissors" in text:
-            root.after(50, lambda: play_round("scissor"))
-        else:
-            root.after(50, lambda: comment_label.config(text="❓Couldn't understand. Say rock / paper / scissor."))
-    except Exception as e:
-        print("Voice error:", e)
-        root.after(50, lambda: messagebox.showwarning("Voice Error", "Voice input failed. Check mic and pyaudio.", parent=root))
-    finally:
-        voice_mode_on = False
-        root.after(50, lambda: voice_button.config(text="🎤 Voice: OFF", bg="#444"))
+        voice_worker.start()
+        ui.config(voice_button, text="🎤 Voice: LISTENING...", bg="#2aa")
 
 # ===== CUTSCENE / "TEST VIDEO" IMPLEMENTATION =====
 def play_test_cutscene_then_start_story():
     """
-    Plays a small animated cutscene (self-contained).
-    After it finishes, it calls start_story_mode_actual().
+    Plays a small animated cutscene (rps_cutscene, tagged sprites moved by elapsed time).
+    After it finishes, it calls start_story_mode_actual(); the first enemy is prepared meanwhile.
     """
-    # Create modal top-level window
-    cut = tk.Toplevel(root)
-    cut.transient(root)
-    cut.grab_set()
-    cut.title("🎬 Story Intro")
-    # We'll center it and make it slightly larger than the main canvas area
-    w, h = 700, 380
-    x = root.winfo_x() + max((root.winfo_width() - w)//2, 0)
-    y = root.winfo_y() + max((root.winfo_height() - h)//2, 0)
-    cut.geometry(f"{w}x{h}+{x}+{y}")
-    cut.config(bg="black")
-
-    # Canvas for simple animation
-    canvas = tk.Canvas(cut, width=w, height=h, bg="black", highlightthickness=0)
-    canvas.pack(fill="both", expand=True)
-
-    # Title text
-    title = canvas.create_text(w//2, 60, text="🎃 Haunted Tournament — Story Intro", font=("Arial", 22, "bold"), fill="orange")
-
-    # Animated pumpkins (as circles with faces) moving across
-    pumpkins = []
-    for i in range(6):
-        px = -100 - i*110
-        py = h//2 + (i%2)*30 - 20
-        oval = canvas.create_oval(px, py, px+80, py+80, fill="#ff8c42", outline="")
-        eyes = canvas.create_oval(px+20, py+20, px+30, py+30, fill="black")
-        eye2 = canvas.create_oval(px+50, py+20, px+60, py+30, fill="black")
-        mouth = canvas.create_line(px+20, py+55, px+60, py+55, fill="black", width=3)
-        pumpkins.append((oval, eyes, eye2, mouth))
-
-    start_time = time.time()
-    duration = 5.0  # seconds
-
-    def animate():
-        t = time.time() - start_time
-        progress = t / duration
-        for idx, parts in enumerate(pumpkins):
-            oval, eyes, eye2, mouth = parts
-            # Move each pumpkin to right based on time (wrap)
-            curr = canvas.coords(oval)
-            if not curr:
-                continue
-            # shift to right
-            canvas.move(oval, 6, 0)
-            canvas.move(eyes, 6, 0)
-            canvas.move(eye2, 6, 0)
-            canvas.move(mouth, 6, 0)
-            # if off screen, wrap to left
-            coords = canvas.coords(oval)
-            if coords and coords[0] > w + 50:
-                dx = - (w + 200)
-                canvas.move(oval, dx, 0)
-                canvas.move(eyes, dx, 0)
-                canvas.move(eye2, dx, 0)
-                canvas.move(mouth, dx, 0)
-        # Flicker text for spooky feel
-        if int(t*4) % 2 == 0:
-            canvas.itemconfig(title, fill="orange")
-        else:
-            canvas.itemconfig(title, fill="#ffd27f")
-        if t < duration:
-            cut.after(40, animate)
-        else:
-            # clean up and start story
-            try:
-                cut.grab_release()
-                cut.destroy()
-            except Exception:
-                pass
-            # call the actual start of story mode
-            start_story_mode_actual()
-
-    # Start animation after short delay
-    cut.after(80, animate)
+    prefetcher.prefetch(0)
+    play_cutscene(root, start_story_mode_actual, **campaign.intro)
 # ===== END CUTSCENE SECTION =====
 
 
 # --- UI: build window with always-visible cheat console ---
 MAIN_BG = "#1e0f1a"
-root = tk.Tk()
+try:
+    root = tk.Tk()
+except tk.TclError as e:
+    raise SystemExit(f"No display ({e}). In a terminal or over SSH run: python rps_tui.py")
 root.title("🎃 RPS: Halloween Ultimate (Cheat Console Visible)")
 root.geometry("580x700")
 root.config(bg=MAIN_BG)
+ui = Renderer(root)   # every widget change below goes through one after_idle flush
+bus = EventBus().attach(root)   # worker threads post here instead of touching Tk
+chart_panel = ChartPanel(root, round_stats)   # its window is built the first time it opens
+toaster = Toaster(root)   # match transitions are in-window toasts, never modal dialogs
 
 # Title
 tk.Label(root, text="🎃 Halloween Rock, Paper, Scissors — Ultimate", font=("Arial", 16, "bold"), fg="orange", bg=MAIN_BG).pack(pady=8)
@@ -509,34 +351,34 @@ def choose_character_dialog():
         user_character = choice.strip()
     else:
         user_character = "🎃"
-    user_hand_label.config(text=f"{user_character} You: ")
+    ui.config(user_hand_label, text=f"{user_character} You: ")
 
 def choose_goal_dialog():
-    global score_goal
     try:
         g = simpledialog.askinteger("Score Goal", "How many wins needed to win (e.g. 3, 5, 7)?", parent=root, minvalue=1, maxvalue=50)
         if g is not None:
-            score_goal = int(g)
+            game.set_goal(int(g))
             update_score_label()
-            messagebox.showinfo("Goal Set", f"First to {score_goal} wins!", parent=root)
+            messagebox.showinfo("Goal Set", f"First to {game.score_goal} wins!", parent=root)
     except Exception as e:
         messagebox.showwarning("Invalid", "Please enter a valid number.", parent=root)
 
 def choose_difficulty_dialog():
-    global difficulty
-    d = simpledialog.askstring("Difficulty", "Choose difficulty: Easy, Medium, Hard", parent=root)
+    d = simpledialog.askstring("Difficulty", "Choose difficulty: Easy, Medium, Hard, Ensemble", parent=root)
     if d is None:
         return
     d = d.strip().lower()
-    if d in ("easy", "medium", "hard"):
-        difficulty = d.capitalize()
-        messagebox.showinfo("Difficulty", f"Difficulty set to {difficulty}", parent=root)
+    if d in ("easy", "medium", "hard", "ensemble"):
+        # Ensemble = meta-strategy bot that picks among many predictors (rps_strategies)
+        game.set_difficulty(d.capitalize())
+        messagebox.showinfo("Difficulty", f"Difficulty set to {game.difficulty}", parent=root)
     else:
-        messagebox.showwarning("Invalid", "Enter Easy, Medium or Hard.", parent=root)
+        messagebox.showwarning("Invalid", "Enter Easy, Medium, Hard or Ensemble.", parent=root)
 
 tk.Button(menu_frame, text="🎭 Character", command=choose_character_dialog, bg="orange", fg="black").grid(row=0, column=0, padx=6)
 tk.Button(menu_frame, text="🏆 Goal", command=choose_goal_dialog, bg="orange", fg="black").grid(row=0, column=1, padx=6)
 tk.Button(menu_frame, text="💀 Difficulty", command=choose_difficulty_dialog, bg="orange", fg="black").grid(row=0, column=2, padx=6)
+tk.Button(menu_frame, text="📈 Charts", command=chart_panel.toggle, bg="orange", fg="black").grid(row=0, column=3, padx=6)
 
 # Game buttons
 frame = tk.Frame(root, bg=MAIN_BG)
@@ -554,7 +396,7 @@ user_hand_label.pack(pady=6)
 computer_hand_label = tk.Label(root, text="🤖 Bot: ", font=("Arial", 26), bg=MAIN_BG, fg="white")
 computer_hand_label.pack(pady=6)
 
-score_text = tk.StringVar(value=f"📊 Score: You {user_score} - Bot {computer_score}")
+score_text = tk.StringVar(value=f"📊 Score: You {game.user_score} - Bot {game.computer_score}")
 tk.Label(root, textvariable=score_text, font=("Arial", 13, "bold"), bg=MAIN_BG, fg="orange").pack(pady=8)
 
 comment_label = tk.Label(root, text="👻 Welcome! Use the cheat console below (type help).", font=("Arial", 11), bg=MAIN_BG, fg="#bfffcf")
@@ -563,7 +405,7 @@ comment_label.pack(pady=6)
 # Bottom controls
 bottom_frame = tk.Frame(root, bg=MAIN_BG)
 bottom_frame.pack(pady=10)
-tk.Button(bottom_frame, text="🔁 Restart", command=lambda: (reset_stats(), root.config(bg=MAIN_BG)), bg="#ff7518").grid(row=0, column=0, padx=6)
+tk.Button(bottom_frame, text="🔁 Restart", command=lambda: (reset_stats(), ui.config(root, bg=MAIN_BG)), bg="#ff7518").grid(row=0, column=0, padx=6)
 tk.Button(bottom_frame, text="🔓 Pumpkin Power (TEST)", command=activate_pumpkin_power, bg="#ff7518").grid(row=0, column=1, padx=6)
 voice_button = tk.Button(bottom_frame, text="🎤 Voice: OFF", command=toggle_voice_mode, bg="#444", fg="white")
 voice_button.grid(row=0, column=2, padx=6)
@@ -580,35 +422,169 @@ console_entry = tk.Entry(entry_frame, font=("Arial", 12))
 console_entry.pack(side="left", fill="x", expand=True, padx=(0,8))
 console_entry.insert(0, "")  # empty by default
 
+def log_stats():
+    match_log.flush()
+    return summary_text(scan(match_log.path))
+
+def replay_command(match=None):
+    match_log.flush()
+    try:
+        return replay_text(replay(match_log.path, None if match is None else int(match), campaign.enemies))
+    except (ReplayError, ValueError) as e:
+        raise ConsoleError(f"replay: {e}")
+
+def show_restored():
+    """Redraw what a restore (undo, resume) may have changed."""
+    update_score_label()
+    update_hands("", "")
+    if game.story_mode:
+        ui.config(root, bg=game.current_enemy.get("bg", MAIN_BG))
+        prefetcher.prefetch(game.current_enemy_index + 1)
+    else:
+        ui.config(root, bg="#2b0712" if game.boss_mode_active else MAIN_BG)
+    update_enemy_banner()
+
+def undo_command(rounds="1"):
+    try:
+        n = int(rounds)
+    except ValueError:
+        n = 0
+    if n < 1:
+        raise ConsoleError("usage: undo [rounds]")
+    if not undo_stack:
+        return "Nothing to undo."
+    n = min(n, len(undo_stack))
+    for _ in range(n - 1):
+        undo_stack.pop()
+    try:
+        game.restore(undo_stack.pop())
+    except ValueError as e:
+        raise ConsoleError(f"undo: {e}")
+    show_restored()
+    ui.config(comment_label, text=f"↩️ Took back {n} round{'s' if n > 1 else ''}.")
+
+def save_command(path=SAVE_PATH):
+    try:
+        size = save_game(game, path)
+    except SaveError as e:
+        raise ConsoleError(f"save: {e}")
+    return f"Saved to {path} ({size} bytes): {describe(game)}"
+
+def resume_command(path=SAVE_PATH):
+    try:
+        resume(game, path)
+    except (SaveError, ValueError) as e:
+        raise ConsoleError(f"resume: {e}")
+    undo_stack.clear()
+    show_restored()
+    return f"Resumed {path}: {describe(game)}"
+
+def set_profiling(on):
+    rps_profiler.set_enabled(on)
+    ui.config(comment_label, text="⏱️ Profiling on — type 'stats' to see timings." if on else "⏱️ Profiling off.")
+
+def campaign_text():
+    ready = ", ".join(str(i + 1) for i in sorted(prefetcher.ready.copy())) or "none yet"
+    return f"{campaign.summary()}\nprefetched enemies: {ready} (last took {prefetcher.last_ms:.0f} ms)"
+
+def profile_command(action):
+    if action in ("on", "off"):
+        set_profiling(action == "on")
+        return None
+    if action == "dump":
+        return f"Profile written to {rps_profiler.dump()}"
+    raise ConsoleError("usage: profile on | off | dump")
+
+# --- autoplay: a scripted or bot player, drawn once per frame, no sounds or dialogs ---
+autoplay = None
+
+def render_autoplay(ap):
+    if ap.last is not None:
+        user, bot, _ = ap.last
+        update_hands(options[user], options[bot])
+    update_score_label()
+    ui.config(comment_label, text=f"🤖 Autoplay {ap.played}/{ap.rounds} — {ap.rate():,.0f} rounds/s")
+
+def autoplay_done(ap):
+    global autoplay
+    autoplay = None
+    toaster.show("Autoplay", ap.summary())
+    if game.story_mode:
+        ui.config(root, bg=game.current_enemy.get("bg", MAIN_BG))
+    update_enemy_banner()
+
+def autoplay_command(rounds, every="0", player="random"):
+    global autoplay
+    if rounds == "stop":
+        if autoplay is None:
+            return "Autoplay is not running."
+        autoplay.stop()
+        return None
+    if autoplay is not None:
+        raise ConsoleError("autoplay is already running (autoplay stop)")
+    try:
+        n, k = int(rounds), int(every)
+        bot_player = make_player(player, game.stream("autoplay"))
+    except ValueError as e:
+        raise ConsoleError(f"usage: autoplay N [every] [player] | autoplay stop ({e})")
+    if n <= 0 or k < 0:
+        raise ConsoleError("usage: autoplay N [every] [player]; N > 0, every >= 0")
+    autoplay = Autoplay(root, game, n, render_autoplay, autoplay_done, bot_player, every=k,
+                        play=play_logged).start()
+    return None
+
+# every console command, with its help line; arguments come from the function signature
+console = CommandConsole(show=lambda title, text: messagebox.showinfo(title, text, parent=root), hold=ui.hold)
+console.add("pumpkinpower", lambda: activate_pumpkin_power(), "+1 point, once per match")
+console.add("trickortreat", do_easter_egg, "bonus point and pumpkin theme")
+console.add("bossbattle", force_boss_battle, "summon the Boss Bot now")
+console.add("storymode", play_test_cutscene_then_start_story, "intro cutscene, then story mode")
+console.add("campaign", campaign_text, "story campaign enemies and prefetch status")
+console.add("reset", reset_stats, "start a new match")
+console.add("undo", undo_command, f"take back the last round(s), up to {UNDO_DEPTH}")
+console.add("save", save_command, "save scores and story progress to a file")
+console.add("resume", resume_command, "continue from a saved file")
+console.add("redraws", ui.stats, "widget update counts")
+console.add("charts", chart_panel.toggle, "show / hide the live analytics charts")
+console.add("events", bus.stats, "worker-thread event bus counts and latency")
+console.add("startup", rps_startup.report, "startup timing")
+console.add("logstats", log_stats, "match log summary")
+console.add("replay", replay_command, "rebuild a logged match from its seed and check it (default: the last)")
+console.add("stats", rps_profiler.stats_text, "profiler latency percentiles")
+console.add("profile", profile_command, "profile on | off | dump")
+console.add("autoplay", autoplay_command, "play N rounds for you (draw every k-th; player random|cycle|rock|ensemble|r,p,s) or stop")
+
 def process_console_command(event=None):
-    cmd = console_entry.get().strip().lower()
+    cmd = console_entry.get().strip()
     if not cmd:
         return
     console_entry.delete(0, tk.END)
-    if cmd == "pumpkinpower":
-        activate_pumpkin_power()
-    elif cmd == "trickortreat":
-        do_easter_egg()
-    elif cmd == "bossbattle":
-        force_boss_battle()
-    elif cmd == "reset":
-        reset_stats()
-    elif cmd == "storymode":
-        # Play the test cutscene (acts as the "video") then start story mode
-        play_test_cutscene_then_start_story()
-    elif cmd == "help":
-        messagebox.showinfo("Cheat Console Help", "Commands:\n- pumpkinpower\n- trickortreat\n- bossbattle\n- storymode\n- reset\n- help", parent=root)
-    else:
-        messagebox.showinfo("Unknown Command", f"'{cmd}' is not recognized. Type 'help' for commands.", parent=root)
+    console.execute(cmd)
+
+def complete_console_command(event=None):
+    # Tab: complete the command word being typed (after the last ';')
+    text = console_entry.get()
+    head, sep, word = text.rpartition(";")
+    word = word.lstrip()
+    if not word or " " in word:
+        return "break"
+    names = console.complete(word)
+    if len(names) == 1:
+        console_entry.delete(0, tk.END)
+        console_entry.insert(0, f"{head}{sep}{' ' if sep else ''}{names[0]} ")
+    elif names:
+        ui.config(comment_label, text="⌨️ " + "  ".join(names))
+    return "break"
 
 # bind Enter to process command
 console_entry.bind("<Return>", process_console_command)
+console_entry.bind("<Tab>", complete_console_command)
 
 # also allow clicking an execute button
 tk.Button(entry_frame, text="Run", command=process_console_command, bg="#ff7518").pack(side="right")
 
-# secret typed Easter egg via keyboard as well
-root.bind_all("<Key>", secret_key_pressed)
+# typed cheat codes via keyboard as well
+root.bind_all("<Key>", cheats.key_event)
 
 # cheat keybindings (robust)
 root.bind_all("<Control-Shift-P>", activate_pumpkin_power)
@@ -619,10 +595,15 @@ root.bind_all("<Command-Shift-p>", activate_pumpkin_power)
 # ensure focus
 root.focus_force()
 
-# initial ready sound
-play_sound(S_VOICE)
-
 update_score_label()
+rps_startup.mark("window built")
+
+def on_first_frame():
+    # initial ready sound (brings the mixer up in the background), then warm up voice
+    play_sound(S_VOICE)
+    rps_startup.warm_up(load_speech, voice_worker.prepare)
+    profiles.start(lambda: bus.post(warm_start))
 
+rps_startup.after_first_frame(root, on_first_frame)
 root.mainloop()
 
@@ -0,0 +1,207 @@
+# rps_autoplay.py
+"""
+Autoplay / spectator mode.
+A scripted or bot player plays N rounds against the game's own bot through
+the engine rules, in slices on the Tk event loop: each frame plays as many
+rounds as fit in part of the frame (or exactly `every` rounds), then the
+view is refreshed once. Every round is counted, but only one round per
+frame is drawn, and there are no sounds or dialogs, so tens of thousands of
+rounds a minute keep the window responsive.
+
+    autoplay 10000                 (console) random player, as fast as possible
+    autoplay 500 1 cycle           draw every round (capped at FPS)
+    autoplay 20000 0 ensemble      bot vs bot
+"""
+
+import random
+import time
+
+from rps_engine import (EV_TIE, EV_WIN, EV_VICTORY, EV_BOSS_DEFEATED, EV_STORY_COMPLETE,
+                        EV_DEFEAT, EV_STORY_LOST, MOVE_INDEX)
+
+FPS = 30                 # frames drawn per second at most
+BUSY_SHARE = 0.6         # part of each frame spent playing rounds; the rest is left to Tk
+CHECK_EVERY = 64         # rounds between clock checks in a slice
+
+
+# --- players: choose() -> move, update(bot_move) after every round ---
+class RandomPlayer:
+    def __init__(self, rng, weights=None):
+        self.rand = rng.random
+        self.c0, self.c1 = (1 / 3, 2 / 3) if weights is None else (weights[0], weights[0] + weights[1])
+
+    def choose(self):
+        r = self.rand()
+        return (r >= self.c0) + (r >= self.c1)
+
+    def update(self, bot_move):
+        pass
+
+
+class CyclePlayer:
+    """rock, paper, scissor, rock... (a pattern the predictors should learn)."""
+
+    def __init__(self, start=0):
+        self.next = start
+
+    def choose(self):
+        m = self.next
+        self.next = (m + 1) % 3
+        return m
+
+    def update(self, bot_move):
+        pass
+
+
+class FixedPlayer(CyclePlayer):
+    def choose(self):
+        return self.next
+
+
+class BotPlayer:
+    """An EnsembleBot on the player's side, learning the game bot's moves."""
+
+    def __init__(self, rng):
+        from rps_strategies import EnsembleBot
+        self.bot = EnsembleBot(rng=rng)
+
+    def choose(self):
+        return self.bot.choose()
+
+    def update(self, bot_move):
+        self.bot.update(bot_move)
+
+
+PLAYERS = ("random", "cycle", "rock", "paper", "scissor", "ensemble", "r,p,s weights")
+
+
+def make_player(spec="random", rng=None):
+    rng = rng if rng is not None else random.Random()
+    spec = spec.lower()
+    if spec == "random":
+        return RandomPlayer(rng)
+    if spec == "cycle":
+        return CyclePlayer()
+    if spec in MOVE_INDEX:
+        return FixedPlayer(MOVE_INDEX[spec])
+    if spec == "ensemble":
+        return BotPlayer(rng)
+    try:
+        w = [float(x) for x in spec.split(",")]
+    except ValueError:
+        w = []
+    if len(w) != 3 or min(w) < 0 or sum(w) <= 0:
+        raise ValueError(f"player must be one of: {', '.join(PLAYERS)}")
+    return RandomPlayer(rng, [x / sum(w) for x in w])
+
+
+class Autoplay:
+    """
+    play(game, user) -> (bot, events) resolves one round (default game.play_round);
+    render(autoplay) draws the current state once per frame; on_done(autoplay) at the end.
+    """
+
+    def __init__(self, root, game, rounds, render, on_done=None, player=None, every=0,
+                 fps=FPS, play=None):
+        self.root = root
+        self.game = game
+        self.rounds = rounds
+        self.render = render
+        self.on_done = on_done
+        self.player = player if player is not None else RandomPlayer(random.Random())
+        self.every = every
+        self.frame_s = 1.0 / fps
+        self.play = play if play is not None else (lambda g, user: g.play_round(user))
+        self.played = self.wins = self.losses = self.ties = 0
+        self.victories = self.defeats = 0
+        self.frames = 0
+        self.last = None              # (user, bot, events) of the last round played
+        self.started = None
+        self.elapsed = 0.0
+        self._job = None
+
+    @property
+    def running(self):
+        return self._job is not None
+
+    def start(self):
+        self.started = time.perf_counter()
+        self._job = self.root.after(0, self._tick)
+        return self
+
+    def stop(self):
+        if self._job is not None:
+            self.root.after_cancel(self._job)
+            self._job = None
+            self._finish()
+
+    def rate(self):
+        return self.played / self.elapsed if self.elapsed > 0 else 0.0
+
+    def _tick(self):
+        t0 = time.perf_counter()
+        left = self.rounds - self.played
+        if self.every:
+            self._play(min(self.every, left))
+        else:
+            deadline = t0 + self.frame_s * BUSY_SHARE
+            while left > 0 and time.perf_counter() < deadline:
+                n = min(CHECK_EVERY, left)
+                self._play(n)
+                left -= n
+        now = time.perf_counter()
+        self.elapsed = now - self.started
+        self.frames += 1
+        try:
+            self.render(self)
+        except Exception as e:
+            print("Autoplay render error:", e)
+        if self.played >= self.rounds:
+            self._job = None
+            self._finish()
+            return
+        wait = self.frame_s - (time.perf_counter() - t0)
+        self._job = self.root.after(max(1, int(wait * 1000)), self._tick)
+
+    def _play(self, n):
+        game = self.game
+        player = self.player
+        play = self.play
+        wins = losses = ties = victories = defeats = 0
+        user = bot = ev = 0
+        for _ in range(n):
+            user = player.choose()
+            bot, ev = play(game, user)
+            player.update(bot)
+            if ev & EV_TIE:
+                ties += 1
+                continue
+            if ev & EV_WIN:
+                wins += 1
+            else:
+                losses += 1
+            if ev & (EV_VICTORY | EV_BOSS_DEFEATED | EV_STORY_COMPLETE):
+                victories += 1
+            elif ev & (EV_DEFEAT | EV_STORY_LOST):
+                defeats += 1
+                if ev & EV_STORY_LOST:
+                    game.start_story()     # no cutscene in autoplay
+        self.played += n
+        self.wins += wins
+        self.losses += losses
+        self.ties += ties
+        self.victories += victories
+        self.defeats += defeats
+        if n:
+            self.last = (user, bot, ev)
+
+    def _finish(self):
+        self.elapsed = time.perf_counter() - self.started
+        if self.on_done is not None:
+            self.on_done(self)
+
+    def summary(self):
+        decided = self.wins + self.losses
+        share = self.wins / decided if decided else 0.0
+        return (f"{self.played} rounds in {self.elapsed:.1f}s ({self.rate():,.0f}/s, {self.frames} frames): "
+                f"player won {share:.0%} of decided rounds, matches {self.victories}-{self.defeats}")
@@ -0,0 +1,284 @@
+# rps_batch.py
+"""
+Batch simulator for bot difficulty calibration.
+Plays millions of independent matches at once as NumPy arrays, with the same
+odds as rps_engine (get_adaptive_choice / get_bot_choice): Easy/Medium/Hard
+bias, the boss bias and the story-enemy rates, against a configurable player.
+A story fight uses the enemy's adaptive rate with the bias of the difficulty
+picked in the menu, so every enemy is simulated at every difficulty.
+
+The arrays model the bias bot only. In the game the Hard and boss bot also
+counter the n-gram predictor (rps_predict), which learns for the whole
+session; the "+ n-gram" rows play the same configurations through the
+engine with that brain, match after match (fewer matches, at engine speed).
+
+    python rps_batch.py --matches 1000000 --player 0.5,0.3,0.2
+    python rps_batch.py --player dirichlet --rules quick --engine-matches 0
+"""
+
+import argparse
+import random
+import sys
+import time
+
+from rps_engine import (ADAPTIVE_BIAS, BOSS_BIAS, BOT_ADAPTIVE_RATE, STORY_ADAPTIVE_RATE,
+                        QUICK_ADAPTIVE_BIAS, QUICK_BOSS_BONUS, COUNTER, story_enemies,
+                        Game, QuickGame, EV_WIN, EV_LOSS, EV_BOSS_APPEARS, EV_VICTORY, EV_BOSS_DEFEATED,
+                        EV_DEFEAT, EV_ENEMY_DEFEATED, EV_STORY_LOST)
+from rps_predict import NGramPredictor
+
+# numpy is only needed here, the games themselves run without it
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+DIFFICULTIES = ("Easy", "Medium", "Hard")
+CHUNK = 1_000_000         # matches simulated together (bounds memory)
+ENGINE_MATCHES = 20_000   # matches per "+ n-gram" row (played one round at a time)
+
+
+def _require_numpy():
+    if np is None:
+        raise RuntimeError("the batch simulator needs numpy (pip install numpy)")
+
+
+def bot_tuning(rules="demo", difficulty="Hard", enemy=None):
+    """
+    Odds used by the bot for one configuration, read from rps_engine.
+    Returns dict(rate, bias, boss_bias, threshold, goal, target).
+    rate = chance the bot goes adaptive at all, bias = chance adaptive counters the most-used move.
+    """
+    if rules == "quick":
+        bias = QUICK_ADAPTIVE_BIAS.get(difficulty, QUICK_ADAPTIVE_BIAS["Hard"])
+        return {"rate": 1.0, "bias": bias, "boss_bias": min(1.0, bias + QUICK_BOSS_BONUS),
+                "threshold": 2 if difficulty == "Hard" else 3, "goal": 4, "target": None}
+    bias = ADAPTIVE_BIAS.get(difficulty, ADAPTIVE_BIAS["Hard"])
+    t = {"rate": BOT_ADAPTIVE_RATE.get(difficulty, BOT_ADAPTIVE_RATE["Hard"]), "bias": bias,
+         "boss_bias": bias if difficulty in ("Easy", "Medium") else BOSS_BIAS,
+         "threshold": 3, "goal": 3, "target": None}
+    if enemy is not None:
+        ed = enemy.get("difficulty", "Easy").lower()
+        t["rate"] = STORY_ADAPTIVE_RATE.get(ed, STORY_ADAPTIVE_RATE["hard"])
+        t["target"] = enemy["rounds"]
+    return t
+
+
+def parse_player(spec):
+    """'uniform', 'dirichlet' (every match gets its own random player) or 'r,p,s' weights."""
+    if spec in ("uniform", "dirichlet"):
+        return spec
+    w = [float(x) for x in spec.split(",")]
+    if len(w) != 3 or min(w) < 0 or sum(w) <= 0:
+        raise ValueError(f"player weights must be three non-negative numbers, got {spec!r}")
+    return [x / sum(w) for x in w]
+
+
+def _player_thresholds(rng, n, player):
+    # cumulative (rock, rock+paper) per match: move = (r >= c0) + (r >= c1)
+    if player == "uniform":
+        player = [1 / 3, 1 / 3, 1 / 3]
+    if player == "dirichlet":
+        p = rng.dirichlet((1.0, 1.0, 1.0), size=n)
+    else:
+        p = np.broadcast_to(np.asarray(player, dtype=np.float64), (n, 3))
+    c0 = p[:, 0].copy()
+    return c0, c0 + p[:, 1]
+
+
+def simulate_matches(n, rules="demo", difficulty="Hard", enemy=None, player="uniform",
+                     seed=None, max_rounds=1000, boss_extra=2):
+    """
+    Play `n` independent matches to the end, all at once.
+    Normal matches end on a win, a loss or a beaten boss; with `enemy` the
+    match is one story fight (first to enemy['rounds']).
+    Returns per-match arrays: won (bool), rounds, user_rounds, bot_rounds, boss (bool).
+    """
+    _require_numpy()
+    rng = np.random.default_rng(seed)
+    t = bot_tuning(rules, difficulty, enemy)
+    counter = np.asarray(COUNTER, dtype=np.int8)
+    c0, c1 = _player_thresholds(rng, n, player)
+
+    counts = np.zeros((n, 3), dtype=np.int32)
+    us = np.zeros(n, dtype=np.int32)
+    cs = np.zeros(n, dtype=np.int32)
+    rounds = np.zeros(n, dtype=np.int32)
+    boss = np.zeros(n, dtype=bool)
+    won = np.zeros(n, dtype=bool)
+    idx = np.arange(n)           # matches still running
+
+    for _ in range(max_rounds):
+        if not idx.size:
+            break
+        m = idx.size
+        r = rng.random((4, m))
+        user = (r[0] >= c0[idx]).astype(np.int8) + (r[0] >= c1[idx])
+        c = counts[idx]
+        c[np.arange(m), user] += 1
+        counts[idx] = c
+        most = c.argmax(axis=1)    # first max wins, like max() over the dict
+
+        b = boss[idx]
+        adaptive = b | (r[1] < t["rate"])
+        counter_most = adaptive & (r[2] < np.where(b, t["boss_bias"], t["bias"]))
+        bot = np.where(counter_most, counter[most], (r[3] * 3).astype(np.int8))
+
+        res = (user - bot) % 3
+        u = us[idx] + (res == 1)
+        k = cs[idx] + (res == 2)
+        us[idx] = u
+        cs[idx] = k
+        rounds[idx] += 1
+        b |= u >= t["threshold"]
+        boss[idx] = b
+
+        if t["target"] is not None:
+            win = u >= t["target"]
+            lose = ~win & (k >= t["target"])
+        else:
+            reached = u >= t["goal"]
+            # with the boss up the match needs boss_extra more wins
+            win = reached & (~b | (u >= t["goal"] + boss_extra))
+            lose = ~reached & (k >= t["goal"])
+        won[idx[win]] = True
+        idx = idx[~(win | lose)]
+
+    return {"won": won, "rounds": rounds, "user_rounds": us, "bot_rounds": cs,
+            "boss": boss, "unfinished": idx.size}
+
+
+def play_matches(n, rules="demo", difficulty="Hard", enemy=None, player="uniform", seed=None, max_rounds=1000):
+    """
+    Play `n` matches back to back through rps_engine with the n-gram brain
+    the front-ends use. Every match starts like one of simulate_matches():
+    scores and move counts at zero, no boss, a story fight against `enemy`
+    from its first round. Only the predictor carries over: it keeps learning
+    for the whole session, as it does in the game. Returns the same arrays
+    as simulate_matches(), for fewer matches (engine speed).
+    """
+    _require_numpy()
+    rng = np.random.default_rng(seed)
+    c0, c1 = _player_thresholds(rng, n, player)
+    game_seed, player_seed = (int(x) for x in rng.integers(1 << 63, size=2))
+    if rules == "quick":
+        game = QuickGame(difficulty=difficulty, predictor=NGramPredictor(), seed=game_seed)
+    else:
+        game = Game(difficulty=difficulty, predictor=NGramPredictor(), seed=game_seed,
+                    enemies=[enemy] if enemy is not None else None)
+    if enemy is not None:
+        win_ev, lose_ev = EV_ENEMY_DEFEATED, EV_STORY_LOST
+    else:
+        win_ev, lose_ev = EV_VICTORY | EV_BOSS_DEFEATED, EV_DEFEAT
+    rand = random.Random(player_seed).random
+    play = game.play_round
+    won = np.zeros(n, dtype=bool)
+    boss = np.zeros(n, dtype=bool)
+    rounds = np.zeros(n, dtype=np.int32)
+    us = np.zeros(n, dtype=np.int32)
+    cs = np.zeros(n, dtype=np.int32)
+    unfinished = 0
+    for i in range(n):
+        lo, hi = float(c0[i]), float(c1[i])
+        u = k = r = 0
+        if enemy is not None:
+            game.start_story()
+        game.reset_stats()      # story mode survives it; boss, move counts and scores do not
+        while True:
+            x = rand()
+            ev = play((x >= lo) + (x >= hi))[1]
+            r += 1
+            if ev & EV_WIN:
+                u += 1
+            elif ev & EV_LOSS:
+                k += 1
+            if ev & EV_BOSS_APPEARS:
+                boss[i] = True
+            if ev & win_ev:
+                won[i] = True
+                break
+            if ev & lose_ev:
+                break
+            if r == max_rounds:
+                unfinished += 1
+                break
+        rounds[i], us[i], cs[i] = r, u, k
+    return {"won": won, "rounds": rounds, "user_rounds": us, "bot_rounds": cs,
+            "boss": boss, "unfinished": unfinished}
+
+
+def summarize(res):
+    """Match win rate with a 95% interval, plus the spread of per-match round-win share."""
+    n = res["won"].size
+    p = float(res["won"].mean())
+    half = 1.96 * (p * (1 - p) / n) ** 0.5
+    share = res["user_rounds"] / np.maximum(res["rounds"], 1)
+    hist, _ = np.histogram(share, bins=10, range=(0.0, 1.0))
+    return {"matches": n, "win_rate": p, "ci95": (p - half, p + half),
+            "mean_rounds": float(res["rounds"].mean()), "boss_rate": float(res["boss"].mean()),
+            "round_share_p10_p50_p90": tuple(float(x) for x in np.percentile(share, (10, 50, 90))),
+            "round_share_hist": (hist / n).tolist(), "unfinished": res["unfinished"]}
+
+
+def calibrate(matches, rules="demo", player="uniform", seed=None, engine_matches=ENGINE_MATCHES):
+    """
+    Win-rate summary for every difficulty (and every story enemy at every
+    difficulty for the demo rules): the bias bot as arrays, then the same
+    configurations with the n-gram brain through the engine.
+    """
+    _require_numpy()
+    ss = np.random.SeedSequence(seed)
+    configs = [(d, None) for d in DIFFICULTIES]
+    if rules == "demo":
+        # enemies with their own strategy (e.g. the ensemble boss) can't be vectorized; see rps_engine.simulate
+        configs += [(d, e) for e in story_enemies if e.get("strategy") != "ensemble" for d in DIFFICULTIES]
+    runs = [(False, c) for c in configs]
+    if engine_matches:
+        runs += [(True, c) for c in configs]
+    out = []
+    for (engine, (difficulty, enemy)), child in zip(runs, ss.spawn(len(runs))):
+        if engine:
+            res = play_matches(engine_matches, rules, difficulty, enemy, player, seed=child)
+        else:
+            parts = []
+            left = matches
+            while left > 0:
+                k = min(left, CHUNK)
+                parts.append(simulate_matches(k, rules, difficulty, enemy, player, seed=child.spawn(1)[0]))
+                left -= k
+            res = {key: np.concatenate([p[key] for p in parts])
+                   for key in ("won", "rounds", "user_rounds", "bot_rounds", "boss")}
+            res["unfinished"] = sum(p["unfinished"] for p in parts)
+        label = f"story {enemy['name']} ({difficulty})" if enemy is not None else difficulty
+        out.append((label + (" + n-gram" if engine else ""), summarize(res)))
+    return out
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Simulate matches in bulk to see how hard each bot really is.")
+    ap.add_argument("--matches", type=int, default=1_000_000, help="matches per difficulty")
+    ap.add_argument("--engine-matches", type=int, default=ENGINE_MATCHES,
+                    help="matches per '+ n-gram' row played through the engine (0 to skip)")
+    ap.add_argument("--rules", choices=("demo", "quick"), default="demo", help="demo.py or Rock_Paper_Scissor.py bot")
+    ap.add_argument("--player", default="uniform", help="uniform, dirichlet or rock,paper,scissor weights")
+    ap.add_argument("--seed", type=int, default=None)
+    args = ap.parse_args(argv)
+    player = parse_player(args.player)
+    t0 = time.perf_counter()
+    try:
+        rows = calibrate(args.matches, args.rules, player, args.seed, args.engine_matches)
+    except RuntimeError as e:
+        print("Batch error:", e)
+        sys.exit(2)
+    print("plain rows: the bias bot only; '+ n-gram' rows: the game's bot, predictor included")
+    for label, s in rows:
+        lo, hi = s["ci95"]
+        p10, p50, p90 = s["round_share_p10_p50_p90"]
+        print(f"{label:<36} win {s['win_rate']:6.1%} [{lo:.1%}, {hi:.1%}]  rounds {s['mean_rounds']:5.2f}  "
+              f"boss {s['boss_rate']:5.1%}  round-win share p10/p50/p90 {p10:.2f}/{p50:.2f}/{p90:.2f}")
+        print("  " + " ".join(f"{x:5.1%}" for x in s["round_share_hist"]))
+    print(f"done in {time.perf_counter() - t0:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
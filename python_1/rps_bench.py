@@ -0,0 +1,432 @@
+# rps_bench.py
+"""
+Benchmark suite for the game.
+Measures bot decisions, round resolution, typed cheat codes (one code or a
+hundred registered), cold start to the first window (and to the first
+terminal screen of rps_tui.py), play_sound latency and a full Tk round
+(engine + widget refresh), then compares against the tracked
+results in bench_baseline.json. Everything is "lower is better"; a result
+more than THRESHOLD times its baseline counts as a regression and the exit
+status is 1. Each result is first divided by a reference workload timed
+right before it, which keeps the comparison meaningful across machines and
+on a busy one.
+
+    python rps_bench.py                 # run and compare
+    python rps_bench.py --save          # run and make this the new baseline
+    python rps_bench.py --only round    # benchmarks whose name contains "round"
+    python rps_bench.py --display xvfb --save   # record the display=xvfb baseline (CI image)
+
+The Tk benchmarks need a display. On Linux without $DISPLAY a private Xvfb
+is started if installed; otherwise those benchmarks are skipped.
+--display xvfb always starts one (even under a desktop session) and stops
+with an error when Xvfb is not installed, so a host meant to record the
+xvfb baseline never records display=none by mistake. Sound
+always goes through SDL's dummy audio driver, so play_sound is timed the
+same with or without a sound card.
+
+Baselines are kept per environment (display: xvfb, native or none; pygame
+or not), since those decide what can run. A run fails (exit status 1)
+when its environment has no baseline, when a benchmark has no baseline
+entry, or when a benchmark with a baseline entry is skipped; --save
+records the environment instead.
+"""
+
+import argparse
+import contextlib
+import importlib.util
+import json
+import os
+import platform
+import random
+import re
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import wave
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+BASELINE = os.path.join(HERE, "bench_baseline.json")
+THRESHOLD = 1.5       # slower than baseline by more than this factor = regression
+REPEATS = 7           # micro-benchmarks keep the best of this many runs
+PASSES = 3            # ... and the calmest of this many passes, each with its own reference run
+SEED = 1234
+
+FRONT_ENDS = ("demo", "Rock_Paper_Scissor")
+
+# the mixer comes up on any host, and a real sound card cannot make play_sound look faster or slower
+os.environ["SDL_AUDIODRIVER"] = "dummy"
+
+
+class Skip(Exception):
+    """Raised by a benchmark that cannot run here (no display, no pygame...)."""
+
+
+class BenchError(Exception):
+    """The run cannot give the environment that was asked for."""
+
+
+def per_call_us(fn, n, repeats=REPEATS):
+    """
+    Time per call of fn() in microseconds: the fastest of `repeats` runs, since
+    slower runs only add noise from the rest of the machine (as timeit advises).
+    """
+    runs = []
+    for _ in range(repeats):
+        t0 = time.perf_counter()
+        for _ in range(n):
+            fn()
+        runs.append((time.perf_counter() - t0) / n * 1e6)
+    return min(runs)
+
+
+def reference_us():
+    """
+    A fixed pure-Python workload timed next to every benchmark. Results are
+    compared relative to it, so a slower machine (or a busy one) does not
+    read as a regression.
+    """
+    rand = random.Random(SEED).random
+    counts = [0, 0, 0]
+
+    def work():
+        counts[int(rand() * 3)] += 1
+    return per_call_us(work, 200_000)
+
+
+# --- engine ---
+def _trained_game(difficulty, quick=False, ngram=False):
+    from rps_engine import Game, QuickGame, simulate
+    from rps_predict import NGramPredictor
+    predictor = NGramPredictor() if ngram else None
+    if quick:
+        g = QuickGame(difficulty=difficulty, predictor=predictor, seed=SEED)
+    else:
+        g = Game(difficulty=difficulty, predictor=predictor, seed=SEED)
+    simulate(g, 200)
+    return g
+
+
+def bench_adaptive_choice():
+    g = _trained_game("Hard")
+    return per_call_us(g.adaptive_choice, 200_000)
+
+
+def bench_bot_choice(difficulty, ngram=False):
+    def run():
+        g = _trained_game(difficulty, ngram=ngram)
+        return per_call_us(g.bot_choice, 2_000 if difficulty == "Ensemble" else 200_000)
+    return run
+
+
+def bench_play_round(difficulty, quick=False, ngram=False):
+    def run():
+        g = _trained_game(difficulty, quick, ngram)
+        rand = random.Random(SEED).random
+        play = g.play_round
+        n = 2_000 if difficulty == "Ensemble" else 100_000
+        return per_call_us(lambda: play(int(rand() * 3)), n)
+    return run
+
+
+# --- cheat codes ---
+def bench_cheat_key(codes):
+    # one keystroke of fast typing with `codes` codes registered: the cost should not depend on `codes`
+    def run():
+        from rps_cheats import CheatMatcher
+        rng = random.Random(SEED)
+        letters = "abcdefghijklmnopqrstuvwxyz"
+        cheats = CheatMatcher()
+        cheats.add("trickortreat", lambda: None)
+        while len(cheats.codes) < codes:
+            cheats.add("".join(rng.choice(letters) for _ in range(rng.randint(6, 16))), lambda: None)
+        text = [rng.choice(letters) for _ in range(4096)]
+        i = iter(range(10**9))
+        feed = cheats.feed
+        return per_call_us(lambda: feed(text[next(i) & 4095]), 200_000)
+    return run
+
+
+# --- sound ---
+def _write_wav(path, ms=120):
+    with wave.open(path, "wb") as w:
+        w.setnchannels(1)
+        w.setsampwidth(2)
+        w.setframerate(22050)
+        w.writeframes(b"\0\0" * (22050 * ms // 1000))
+
+
+def bench_play_sound(with_assets):
+    def run():
+        import rps_sound
+        with tempfile.TemporaryDirectory() as tmp:
+            names = [os.path.join(tmp, f"s{i}.wav") for i in range(6)]
+            if with_assets:
+                for n in names:
+                    _write_wav(n)
+            bank = rps_sound.SoundBank(names)
+            bank.preload()
+            bank.wait(10)
+            if with_assets and not rps_sound.SOUND_AVAILABLE:
+                raise Skip("no audio mixer (pygame missing or no audio device)")
+            i = iter(range(10**9))
+            return per_call_us(lambda: bank.play(names[next(i) % 6]), 2_000)
+    return run
+
+
+# --- Tk (child processes, so each run is a real cold start) ---
+def _child_env(tmp, display):
+    env = dict(os.environ)
+    env["RPS_MATCH_LOG"] = os.path.join(tmp, "bench.rpslog")
+    env["RPS_PROFILE_DB"] = os.path.join(tmp, "bench.sqlite3")
+    if display:
+        env["DISPLAY"] = display
+    return env
+
+
+def bench_cold_start(front, display):
+    def run():
+        if display is False:
+            raise Skip("no display")
+        ms = []
+        with tempfile.TemporaryDirectory() as tmp:
+            env = _child_env(tmp, display)
+            env["RPS_STARTUP_REPORT"] = "1"
+            env["RPS_EXIT_AFTER_FIRST_FRAME"] = "1"
+            for _ in range(3):
+                out = subprocess.run([sys.executable, os.path.join(HERE, front + ".py")], cwd=tmp, env=env,
+                                     capture_output=True, text=True, timeout=60).stdout
+                m = re.search(r"time-to-first-frame ([\d.]+) ms", out)
+                if not m:
+                    raise Skip(f"{front}.py did not report a first frame")
+                ms.append(float(m.group(1)))
+        return statistics.median(ms)
+    return run
+
+
+def bench_cold_start_tui():
+    # the terminal front-end needs a tty but no display: run it on a pseudo-terminal
+    def run():
+        try:
+            import pty
+        except ImportError:
+            raise Skip("no pty module")
+        ms = []
+        with tempfile.TemporaryDirectory() as tmp:
+            env = _child_env(tmp, None)
+            env.update(RPS_STARTUP_REPORT="1", RPS_EXIT_AFTER_FIRST_FRAME="1", TERM="xterm")
+            for _ in range(3):
+                master, slave = pty.openpty()
+                proc = subprocess.Popen([sys.executable, os.path.join(HERE, "rps_tui.py")], cwd=tmp, env=env,
+                                        stdin=slave, stdout=slave, stderr=slave)
+                os.close(slave)
+                out = b""
+                while True:
+                    try:
+                        chunk = os.read(master, 65536)
+                    except OSError:         # EIO: the child closed the terminal
+                        break
+                    if not chunk:
+                        break
+                    out += chunk
+                os.close(master)
+                proc.wait(timeout=60)
+                m = re.search(rb"time-to-first-frame ([\d.]+) ms", out)
+                if not m:
+                    raise Skip("rps_tui.py did not report a first frame")
+                ms.append(float(m.group(1)))
+        return statistics.median(ms)
+    return run
+
+
+def bench_tk_round(front, display):
+    def run():
+        if display is False:
+            raise Skip("no display")
+        with tempfile.TemporaryDirectory() as tmp:
+            out = subprocess.run([sys.executable, os.path.abspath(__file__), "--tk-round", front, "300"],
+                                 cwd=tmp, env=_child_env(tmp, display), capture_output=True, text=True, timeout=120)
+            m = re.search(r"^tk-round ([\d.]+)$", out.stdout, re.M)
+            if not m:
+                raise Skip(f"Tk round failed: {(out.stderr.strip().splitlines() or ['?'])[-1]}")
+            return float(m.group(1))
+    return run
+
+
+def _tk_round_child(front, rounds):
+    # runs in the child: build the real window, then drive rounds by hand
+    import tkinter
+    tkinter.Tk.mainloop = lambda self, n=0: None      # the benchmark pumps the loop itself
+    sys.path.insert(0, HERE)
+    mod = importlib.import_module(front)
+    root = mod.root
+    root.update()
+    rand = random.Random(SEED).random
+    moves = ("rock", "paper", "scissor")
+    times = []
+    for _ in range(rounds):
+        t0 = time.perf_counter()
+        mod.play_round(moves[int(rand() * 3)])
+        root.update()            # after_idle flush + redraw, as a real round would get
+        times.append(time.perf_counter() - t0)
+    root.destroy()
+    print(f"tk-round {statistics.median(times) * 1e6:.1f}")
+
+
+@contextlib.contextmanager
+def display_for_tk(mode="auto"):
+    """
+    Yields a DISPLAY value, None (no display needed) or False (none available).
+    mode "xvfb" always starts a private Xvfb and raises BenchError without one.
+    """
+    if mode != "xvfb" and (not sys.platform.startswith("linux") or os.environ.get("DISPLAY")):
+        yield os.environ.get("DISPLAY")
+        return
+    xvfb = shutil.which("Xvfb")
+    if xvfb is None:
+        if mode == "xvfb":
+            raise BenchError("--display xvfb: Xvfb is not installed")
+        yield False
+        return
+    n = 90 + os.getpid() % 100
+    proc = subprocess.Popen([xvfb, f":{n}", "-screen", "0", "1024x768x24", "-nolisten", "tcp"],
+                            stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    try:
+        deadline = time.time() + 5
+        while not os.path.exists(f"/tmp/.X11-unix/X{n}") and time.time() < deadline and proc.poll() is None:
+            time.sleep(0.05)
+        if proc.poll() is not None and mode == "xvfb":
+            raise BenchError(f"--display xvfb: Xvfb :{n} did not start")
+        yield f":{n}" if proc.poll() is None else False
+    finally:
+        proc.terminate()
+        proc.wait()
+
+
+def benchmarks(display):
+    """(name, unit, callable) for every benchmark."""
+    out = [("adaptive_choice Hard", "us", bench_adaptive_choice)]
+    for d in ("Easy", "Hard", "Ensemble"):
+        out.append((f"bot_choice {d}", "us", bench_bot_choice(d)))
+    out.append(("bot_choice Hard + n-gram", "us", bench_bot_choice("Hard", ngram=True)))
+    out += [("round demo Easy", "us", bench_play_round("Easy")),
+            ("round demo Hard", "us", bench_play_round("Hard")),
+            ("round demo Hard + n-gram", "us", bench_play_round("Hard", ngram=True)),
+            ("round demo Ensemble", "us", bench_play_round("Ensemble")),
+            ("round quick Hard", "us", bench_play_round("Hard", quick=True)),
+            ("cheat key, 1 code", "us", bench_cheat_key(1)),
+            ("cheat key, 100 codes", "us", bench_cheat_key(100)),
+            ("play_sound cached", "us", bench_play_sound(True)),
+            ("play_sound missing asset", "us", bench_play_sound(False))]
+    for front in FRONT_ENDS:
+        out.append((f"cold start {front}", "ms", bench_cold_start(front, display)))
+    out.append(("cold start rps_tui", "ms", bench_cold_start_tui()))
+    for front in FRONT_ENDS:
+        out.append((f"tk round {front}", "us", bench_tk_round(front, display)))
+    return out
+
+
+def environment(display):
+    """Key of the baseline this run compares against."""
+    if display is False:
+        screen = "none"
+    elif display is None or display == os.environ.get("DISPLAY"):
+        screen = "native"     # the desktop session (or no X needed)
+    else:
+        screen = "xvfb"         # started by display_for_tk()
+    sound = "sdl-dummy" if importlib.util.find_spec("pygame") else "no-pygame"
+    return f"display={screen} audio={sound}"
+
+
+def load_baseline(path=BASELINE):
+    try:
+        with open(path, encoding="utf-8") as f:
+            data = json.load(f)
+    except FileNotFoundError:
+        data = {}
+    data.setdefault("environments", {})
+    return data
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Run the benchmark suite and compare with the tracked baseline.")
+    ap.add_argument("--save", action="store_true", help="write the results as the baseline of this environment")
+    ap.add_argument("--only", default="", help="only benchmarks whose name contains this")
+    ap.add_argument("--threshold", type=float, default=THRESHOLD)
+    ap.add_argument("--baseline", default=BASELINE)
+    ap.add_argument("--display", choices=("auto", "xvfb"), default="auto",
+                    help="xvfb: always run the Tk benchmarks on a private Xvfb (fail without one)")
+    ap.add_argument("--tk-round", nargs=2, metavar=("FRONT", "ROUNDS"), help=argparse.SUPPRESS)
+    args = ap.parse_args(argv)
+    if args.tk_round:
+        _tk_round_child(args.tk_round[0], int(args.tk_round[1]))
+        return 0
+
+    base = load_baseline(args.baseline)
+    failures = regressions = 0
+    with display_for_tk(args.display) as display:
+        env = environment(display)
+        print("environment:", env)
+        tracked = base["environments"].get(env)
+        if tracked is None and not args.save:
+            known = ", ".join(base["environments"]) or "none"
+            print(f"NO BASELINE for this environment (recorded: {known}); run with --save on a reference host")
+        old = tracked["results"] if tracked is not None else {}
+        results = dict(old) if args.only else {}
+        for name, unit, fn in benchmarks(display):
+            if args.only not in name:
+                continue
+            try:
+                # a few passes, each next to its own reference run; keep the calmest pass
+                passes = []
+                for _ in range(PASSES if unit == "us" else 1):
+                    ref = reference_us()
+                    passes.append((fn() / ref, ref))
+                norm, ref_now = min(passes)
+                value = norm * ref_now
+            except Skip as e:
+                if name in old:
+                    # it ran when the baseline was recorded: something is missing now
+                    print(f"{name:<30} SKIPPED: {e} (the baseline has it)")
+                    failures += 1
+                else:
+                    print(f"{name:<30} skipped: {e} (not tracked in this environment)")
+                continue
+            results[name] = {"value": round(value, 3), "unit": unit, "reference_us": round(ref_now, 4)}
+            ref = old.get(name)
+            if ref is None:
+                verdict = "new" if args.save else "NO BASELINE"
+                failures += 1
+            else:
+                # compare in units of the reference workload
+                scale = ref_now / ref.get("reference_us", ref_now)
+                ratio = value / (ref["value"] * scale) if ref["value"] else 1.0
+                verdict = f"x{ratio:.2f}"
+                if ratio > args.threshold:
+                    verdict += "  REGRESSION"
+                    regressions += 1
+            print(f"{name:<30} {value:10.2f} {unit:<3} {verdict}")
+    if args.save:
+        base["threshold"] = args.threshold
+        base["environments"][env] = {"machine": f"{platform.machine()} {platform.system()} {platform.release()}",
+                                     "python": platform.python_version(), "results": results}
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump(base, f, indent=2, ensure_ascii=False)
+            f.write("\n")
+        print(f"baseline for {env} saved to", args.baseline)
+        return 0
+    if regressions:
+        print(f"{regressions} regression(s) over x{args.threshold}")
+    if failures:
+        print(f"{failures} benchmark(s) without a baseline to compare against, or skipped")
+    return 1 if regressions or failures else 0
+
+
+if __name__ == "__main__":
+    try:
+        sys.exit(main())
+    except BenchError as e:
+        print("Bench error:", e)
+        sys.exit(2)
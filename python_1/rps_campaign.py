@@ -0,0 +1,225 @@
+# rps_campaign.py
+"""
+Story campaigns loaded from JSON.
+A campaign is a list of enemies, each with its own difficulty, rounds to
+win, background, strategy, sounds and optional cutscene. The file is
+checked once when it loads (every problem is reported at once) and turned
+into plain dicts with every optional key filled in, so nothing is checked
+again during a fight. Without RPS_CAMPAIGN and without a campaign.json
+the built-in three-enemy story is used; a file RPS_CAMPAIGN names must
+exist.
+
+While one enemy is fought, a Prefetcher gets the next one ready on a
+background thread (decodes its sounds, builds its strategy), so switching
+enemies costs nothing visible.
+
+    RPS_CAMPAIGN=haunted_tower.json python demo.py
+"""
+
+import json
+import os
+import queue
+import re
+import threading
+import time
+
+from rps_engine import STORY_ADAPTIVE_RATE, story_enemies
+
+DEFAULT_PATH = os.environ.get("RPS_CAMPAIGN", "campaign.json")
+OPTIONAL = "RPS_CAMPAIGN" not in os.environ     # only the unconfigured default may be missing
+STRATEGIES = ("adaptive", "ensemble")
+SOUND_KEYS = ("intro", "win", "lose", "tie")
+CUTSCENE_KEYS = {"title": str, "duration": (int, float), "pumpkins": int}
+MAX_DURATION = 30.0       # seconds a cutscene may last
+MAX_PUMPKINS = 30
+DEFAULT_INTRO = {"title": "🎃 Haunted Tournament — Story Intro", "duration": 5.0, "pumpkins": 6}
+_COLOR = re.compile(r"#(?:[0-9a-fA-F]{3}|[0-9a-fA-F]{6})$")
+
+_STOP = object()
+
+
+class CampaignError(ValueError):
+    """The campaign file cannot be read, is missing required fields or has bad values."""
+
+
+class Campaign:
+    __slots__ = ("name", "enemies", "intro", "path")
+
+    def __init__(self, name, enemies, intro=None, path=None):
+        self.name = name
+        self.enemies = enemies        # validated dicts, ready for Game(enemies=...)
+        self.intro = intro if intro is not None else dict(DEFAULT_INTRO)
+        self.path = path
+
+    def summary(self):
+        rows = [f"{self.name}: {len(self.enemies)} enemies" + (f" ({self.path})" if self.path else " (built-in)")]
+        for i, e in enumerate(self.enemies):
+            rows.append(f"{i + 1}. {e['name']} — {e['difficulty']}, first to {e['rounds']}, {e['strategy']}")
+        return "\n".join(rows)
+
+
+# --- validation ---
+def _check_cutscene(spec, where, errors):
+    if not isinstance(spec, dict):
+        errors.append(f"{where}: must be an object")
+        return None
+    out = dict(DEFAULT_INTRO)
+    for key, value in spec.items():
+        kind = CUTSCENE_KEYS.get(key)
+        if kind is None:
+            errors.append(f"{where}.{key}: unknown key (known: {', '.join(CUTSCENE_KEYS)})")
+        elif not isinstance(value, kind) or isinstance(value, bool):
+            errors.append(f"{where}.{key}: wrong type")
+        else:
+            out[key] = value
+    if not 0 < out["duration"] <= MAX_DURATION:
+        errors.append(f"{where}.duration: must be in (0, {MAX_DURATION:g}] seconds")
+    if not 0 <= out["pumpkins"] <= MAX_PUMPKINS:
+        errors.append(f"{where}.pumpkins: must be 0-{MAX_PUMPKINS}")
+    return out
+
+
+def _check_enemy(spec, where, errors):
+    if not isinstance(spec, dict):
+        errors.append(f"{where}: must be an object")
+        return None
+    known = {"name", "difficulty", "rounds", "bg", "strategy", "sounds", "cutscene"}
+    for key in spec:
+        if key not in known:
+            errors.append(f"{where}.{key}: unknown key")
+    name = spec.get("name")
+    if not isinstance(name, str) or not name.strip():
+        errors.append(f"{where}.name: required text")
+        name = "?"
+    else:
+        where = f"{where} ({name})"
+    difficulty = spec.get("difficulty", "Easy")
+    if not isinstance(difficulty, str) or difficulty.lower() not in STORY_ADAPTIVE_RATE:
+        errors.append(f"{where}.difficulty: one of {', '.join(k.capitalize() for k in STORY_ADAPTIVE_RATE)}")
+        difficulty = "Easy"
+    rounds = spec.get("rounds")
+    if not isinstance(rounds, int) or isinstance(rounds, bool) or rounds < 1:
+        errors.append(f"{where}.rounds: required whole number >= 1")
+    bg = spec.get("bg", "#1e0f1a")
+    if not isinstance(bg, str) or not _COLOR.match(bg):
+        errors.append(f"{where}.bg: a colour like #2f2f36")
+    strategy = spec.get("strategy", "adaptive")
+    if strategy not in STRATEGIES:
+        errors.append(f"{where}.strategy: one of {', '.join(STRATEGIES)}")
+    sounds = spec.get("sounds", {})
+    if not isinstance(sounds, dict):
+        errors.append(f"{where}.sounds: must be an object")
+        sounds = {}
+    for key, fname in sounds.items():
+        if key not in SOUND_KEYS:
+            errors.append(f"{where}.sounds.{key}: unknown sound (known: {', '.join(SOUND_KEYS)})")
+        elif not isinstance(fname, str) or not fname:
+            errors.append(f"{where}.sounds.{key}: file name expected")
+    cutscene = spec.get("cutscene")
+    if cutscene is not None:
+        cutscene = _check_cutscene(cutscene, f"{where}.cutscene", errors)
+    return {"name": name, "difficulty": difficulty.capitalize() if isinstance(difficulty, str) else "Easy",
+            "rounds": rounds, "bg": bg, "strategy": strategy, "sounds": dict(sounds), "cutscene": cutscene}
+
+
+def parse_campaign(data, path=None):
+    """Validate a decoded campaign; raises CampaignError listing every problem."""
+    errors = []
+    if isinstance(data, list):
+        data = {"enemies": data}
+    if not isinstance(data, dict):
+        raise CampaignError(f"{path or 'campaign'}: must be an object with an 'enemies' list")
+    for key in data:
+        if key not in ("name", "intro", "enemies"):
+            errors.append(f"{key}: unknown key")
+    name = data.get("name") or (os.path.splitext(os.path.basename(path))[0] if path else "Campaign")
+    if not isinstance(name, str):
+        errors.append("name: must be text")
+    intro = data.get("intro")
+    if intro is not None:
+        intro = _check_cutscene(intro, "intro", errors)
+    raw = data.get("enemies")
+    enemies = []
+    if not isinstance(raw, list) or not raw:
+        errors.append("enemies: required non-empty list")
+    else:
+        for i, spec in enumerate(raw):
+            enemies.append(_check_enemy(spec, f"enemies[{i}]", errors))
+    if errors:
+        raise CampaignError(f"{path or 'campaign'}: {len(errors)} problem(s)\n- " + "\n- ".join(errors))
+    return Campaign(name, enemies, intro, path)
+
+
+def builtin_campaign():
+    return parse_campaign({"name": "Haunted Tournament", "enemies": story_enemies})
+
+
+def load_campaign(path=None):
+    """
+    The campaign in `path` (default: RPS_CAMPAIGN, else campaign.json). Only a
+    missing campaign.json without RPS_CAMPAIGN means the built-in story; a
+    configured file that is missing or unreadable is a CampaignError.
+    """
+    if path is None:
+        path = DEFAULT_PATH
+        if OPTIONAL and not os.path.exists(path):
+            return builtin_campaign()
+    try:
+        with open(path, encoding="utf-8") as f:
+            data = json.load(f)
+    except OSError as e:
+        raise CampaignError(f"{path}: {e.strerror}")
+    except ValueError as e:
+        raise CampaignError(f"{path}: not valid JSON ({e})")
+    return parse_campaign(data, path)
+
+
+# --- prefetching ---
+class Prefetcher:
+    """
+    Readies story enemies on one daemon thread: decodes their sounds into the
+    SoundBank cache and builds their strategy (Game.prepare_enemy). The Tk
+    thread only queues an index. An index can be queued again once its
+    prefetch is done (a restarted story needs its enemies ready again).
+    """
+
+    def __init__(self, game, sound_bank=None):
+        self.game = game
+        self.sound_bank = sound_bank
+        self._queue = queue.Queue()
+        self._thread = None
+        self._queued = set()          # indexes waiting or being prefetched
+        self.ready = set()            # enemy indexes fully prefetched
+        self.last_ms = 0.0            # time the last prefetch took
+
+    def prefetch(self, index):
+        """Get enemy `index` ready in the background (no-op if queued, in progress or out of range)."""
+        if not 0 <= index < len(self.game.story_enemies) or index in self._queued:
+            return
+        self._queued.add(index)
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="campaign-prefetch", daemon=True)
+            self._thread.start()
+        self._queue.put(index)
+
+    def _run(self):
+        while True:
+            index = self._queue.get()
+            if index is _STOP:
+                return
+            t0 = time.perf_counter()
+            try:
+                enemy = self.game.story_enemies[index]
+                if self.sound_bank is not None:
+                    for fname in enemy.get("sounds", {}).values():
+                        self.sound_bank.load(fname)
+                self.game.prepare_enemy(index)
+            except Exception as e:
+                print("Campaign prefetch error:", e)
+            self.last_ms = (time.perf_counter() - t0) * 1000
+            self.ready.add(index)
+            self._queued.discard(index)
+
+    def close(self):
+        if self._thread is not None:
+            self._queue.put(_STOP)
@@ -0,0 +1,205 @@
+# rps_charts.py
+"""
+Live analytics panel: the player's move mix, the bot's hit rate per
+bot_choice branch and the net score over the session, on one Canvas.
+A round only bumps counters (RoundStats.add, a few integer operations),
+so the round loop never waits for drawing. The panel redraws at most every
+REDRAW_MS and only what changed: bars are moved with canvas.coords, and
+the score line gets one new segment per point added since the last
+redraw. The line keeps at most MAX_POINTS points. When it is full, every
+other point is dropped (each point then covers twice as many rounds) and
+the line is drawn again once, so after 100k rounds a redraw costs what it
+did after 100.
+
+    charts        (cheat console: show / hide the panel; text bars in rps_tui.py)
+"""
+
+from rps_engine import BRANCH_NAMES, options
+
+MAX_POINTS = 400        # score-line points kept; then neighbours are merged
+REDRAW_MS = 100         # panel refresh interval while it is open
+WIDTH, HEIGHT = 520, 440
+LEFT, BAR_W = 150, 330  # bar charts: label column, longest bar
+PLOT_TOP, PLOT_BOTTOM = 300, 420
+SPARK = "▁▂▃▄▅▆▇█"
+
+
+class RoundStats:
+    """Session totals behind the charts (every round played, undone or not)."""
+
+    def __init__(self, max_points=MAX_POINTS):
+        self.max_points = max_points
+        self.rounds = 0
+        self.moves = [0, 0, 0]                        # player's rock/paper/scissor
+        self.branch = [[0, 0] for _ in BRANCH_NAMES]  # per branch: rounds, bot won
+        self.net = 0                                  # player's round wins minus the bot's
+        self.points = []                              # net at the end of each bucket of rounds
+        self.bucket = 1                               # rounds per point
+        self.merges = 0                               # times the points were thinned out
+        self._fill = 0
+
+    def add(self, user, bot, branch):
+        self.rounds += 1
+        self.moves[user] += 1
+        b = self.branch[branch]
+        b[0] += 1
+        r = (user - bot) % 3
+        if r == 1:
+            self.net += 1
+        elif r == 2:
+            self.net -= 1
+            b[1] += 1
+        self._fill += 1
+        if self._fill == self.bucket:
+            self._fill = 0
+            self.points.append(self.net)
+            if len(self.points) >= self.max_points:
+                # keep the end of every pair: each point now closes a bucket twice as long
+                self.points = self.points[1::2]
+                self.bucket *= 2
+                self.merges += 1
+
+    def move_shares(self):
+        n = self.rounds or 1
+        return [c / n for c in self.moves]
+
+    def hit_rates(self):
+        """(branch name, rounds, bot win rate) for every branch that picked a move."""
+        return [(name, n, won / n) for name, (n, won) in zip(BRANCH_NAMES, self.branch) if n]
+
+    def text(self, width=40):
+        """The same charts as text (rps_tui.py)."""
+        rows = [f"{self.rounds} rounds, net score {self.net:+d}"]
+        for name, share in zip(options, self.move_shares()):
+            rows.append(f"{name:<8} {'█' * round(share * width):<{width}} {share:4.0%}")
+        for name, n, rate in self.hit_rates():
+            rows.append(f"{name:<15} bot wins {rate:4.0%} of {n}")
+        pts = self.points[-width:]
+        if pts:
+            lo, hi = min(pts), max(pts)
+            span = (hi - lo) or 1
+            rows.append("net " + "".join(SPARK[(p - lo) * (len(SPARK) - 1) // span] for p in pts)
+                        + f"  ({self.bucket} round{'s' if self.bucket > 1 else ''}/point)")
+        return "\n".join(rows)
+
+
+class ChartPanel:
+    """The charts in their own window, built the first time it is shown."""
+
+    def __init__(self, root, stats, redraw_ms=REDRAW_MS):
+        self.root = root
+        self.stats = stats
+        self.redraw_ms = redraw_ms
+        self.win = None
+        self.canvas = None
+        self.visible = False
+        self._job = None
+        self.redraws = 0
+        self._drawn_rounds = -1
+
+    # --- window ---
+    def toggle(self):
+        if self.visible:
+            self.hide()
+        else:
+            self.show()
+
+    def show(self):
+        if self.win is None:
+            self._build()
+        else:
+            self.win.deiconify()
+        self.visible = True
+        self._drawn_rounds = -1
+        self._tick()
+
+    def hide(self):
+        self.visible = False
+        if self._job is not None:
+            self.root.after_cancel(self._job)
+            self._job = None
+        if self.win is not None:
+            self.win.withdraw()
+
+    def _build(self):
+        import tkinter as tk
+        self.win = tk.Toplevel(self.root)
+        self.win.title("📈 Analytics")
+        self.win.protocol("WM_DELETE_WINDOW", self.hide)
+        c = self.canvas = tk.Canvas(self.win, width=WIDTH, height=HEIGHT, bg="#0f0f12", highlightthickness=0)
+        c.pack()
+        c.create_text(10, 12, text="Your moves", fill="orange", anchor="w", font=("Arial", 11, "bold"))
+        self._move_bars = []
+        for i, name in enumerate(options):
+            y = 32 + i * 24
+            label = c.create_text(10, y + 8, text=name, fill="white", anchor="w")
+            bar = c.create_rectangle(LEFT, y, LEFT, y + 16, fill="#ff8c42", width=0)
+            self._move_bars.append((label, bar))
+        c.create_text(10, 118, text="Bot wins per branch", fill="orange", anchor="w", font=("Arial", 11, "bold"))
+        self._branch_bars = []
+        for i, name in enumerate(BRANCH_NAMES):
+            y = 138 + i * 24
+            label = c.create_text(10, y + 8, text=name, fill="white", anchor="w")
+            bar = c.create_rectangle(LEFT, y, LEFT, y + 16, fill="#8a2be2", width=0)
+            self._branch_bars.append((label, bar))
+        c.create_text(10, PLOT_TOP - 14, text="Net score", fill="orange", anchor="w", font=("Arial", 11, "bold"))
+        self._plot_label = c.create_text(WIDTH - 10, PLOT_TOP - 14, text="", fill="gray", anchor="e")
+        mid = (PLOT_TOP + PLOT_BOTTOM) / 2
+        c.create_line(10, mid, WIDTH - 10, mid, fill="#333")
+        self._reset_line()
+
+    def _tick(self):
+        self._job = None
+        if not self.visible:
+            return
+        if self.stats.rounds != self._drawn_rounds:
+            self.redraw()
+        self._job = self.root.after(self.redraw_ms, self._tick)
+
+    # --- drawing ---
+    def _reset_line(self):
+        self.canvas.delete("score")
+        self._span = 8              # net score at the top (and, negated, the bottom) of the plot
+        self._line_points = 0       # points already on the canvas
+        self._merges = self.stats.merges
+
+    def _xy(self, i, value):
+        x = 10 + i * (WIDTH - 20) / self.stats.max_points
+        mid = (PLOT_TOP + PLOT_BOTTOM) / 2
+        return x, mid - value * (PLOT_BOTTOM - PLOT_TOP) / 2 / self._span
+
+    def redraw(self):
+        """Bring the canvas up to date with the stats: a fixed number of item changes plus new segments."""
+        s, c = self.stats, self.canvas
+        self.redraws += 1
+        self._drawn_rounds = s.rounds
+        for (label, bar), name, share, count in zip(self._move_bars, options, s.move_shares(), s.moves):
+            x, y0, _, y1 = c.coords(bar)
+            c.coords(bar, x, y0, x + share * BAR_W, y1)
+            c.itemconfig(label, text=f"{name} {share:.0%} ({count})")
+        for (label, bar), name, (n, won) in zip(self._branch_bars, BRANCH_NAMES, s.branch):
+            rate = won / n if n else 0.0
+            x, y0, _, y1 = c.coords(bar)
+            c.coords(bar, x, y0, x + rate * BAR_W, y1)
+            c.itemconfig(label, text=f"{name} {rate:.0%} of {n}" if n else name)
+        pts = s.points
+        if s.merges != self._merges:
+            self._reset_line()      # points were thinned out: draw the shorter line anew
+        top = max(map(abs, pts[self._line_points:]), default=0)
+        if top > self._span:
+            old = self._span
+            while top > self._span:
+                self._span *= 2
+            # squeeze what is drawn instead of drawing it again
+            c.scale("score", 0, (PLOT_TOP + PLOT_BOTTOM) / 2, 1, old / self._span)
+        start = self._line_points
+        if start < len(pts):
+            # one item for the new stretch (a single segment per point when redraws keep up)
+            coords = []
+            for i in range(max(start - 1, 0), len(pts)):
+                coords.extend(self._xy(i, pts[i]))
+            if len(coords) >= 4:
+                c.create_line(*coords, fill="#7fff7f", tags="score")
+            self._line_points = len(pts)
+        c.itemconfig(self._plot_label, text=f"{s.net:+d} after {s.rounds} rounds, "
+                                            f"{s.bucket} round{'s' if s.bucket > 1 else ''}/point")
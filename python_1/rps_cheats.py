@@ -0,0 +1,111 @@
+# rps_cheats.py
+"""
+Typed cheat codes.
+All registered codes are compiled into one Aho-Corasick automaton, flattened
+into a DFA: every keystroke is a single dict lookup from the current state,
+no matter how many codes there are or how long they are. The last few keys
+sit in a fixed-size ring buffer, so codes added later can pick up a code
+that is already half typed.
+
+    cheats = CheatMatcher()
+    cheats.add("trickortreat", do_easter_egg)
+    root.bind_all("<Key>", cheats.key_event)
+"""
+
+from collections import deque
+
+RING_SIZE = 32         # recent keys kept; also the longest allowed code
+_NO_MATCH = ()
+
+
+class CheatMatcher:
+    def __init__(self):
+        self.codes = {}            # code -> action
+        self._delta = [{}]         # state -> {char: next state}, complete over the code alphabet
+        self._out = [_NO_MATCH]    # state -> codes that end here (longest first)
+        self.state = 0
+        self._recent = deque(maxlen=RING_SIZE)
+        self.keys = 0              # keystrokes seen
+        self.fired = 0             # codes matched
+
+    def add(self, code, action):
+        """Register (or replace) a code; the automaton is rebuilt right away, not per key."""
+        code = code.lower()
+        if not 0 < len(code) <= RING_SIZE:
+            raise ValueError(f"cheat codes must be 1-{RING_SIZE} characters, got {code!r}")
+        self.codes[code] = action
+        self._build()
+        return self
+
+    def remove(self, code):
+        self.codes.pop(code.lower(), None)
+        self._build()
+
+    def _build(self):
+        # trie
+        goto = [{}]
+        out = [[]]
+        for code in self.codes:
+            s = 0
+            for ch in code:
+                nxt = goto[s].get(ch)
+                if nxt is None:
+                    nxt = len(goto)
+                    goto[s][ch] = nxt
+                    goto.append({})
+                    out.append([])
+                s = nxt
+            out[s].append(code)
+        # failure links breadth-first, filling in every missing edge (DFA)
+        alphabet = {ch for code in self.codes for ch in code}
+        delta = [dict() for _ in goto]
+        fail = [0] * len(goto)
+        queue = deque()
+        for ch in alphabet:
+            nxt = goto[0].get(ch, 0)
+            delta[0][ch] = nxt
+            if nxt:
+                queue.append(nxt)
+        while queue:
+            s = queue.popleft()
+            out[s].extend(out[fail[s]])
+            for ch in alphabet:
+                nxt = goto[s].get(ch)
+                if nxt is not None:
+                    fail[nxt] = delta[fail[s]][ch]
+                    delta[s][ch] = nxt
+                    queue.append(nxt)
+                else:
+                    delta[s][ch] = delta[fail[s]][ch]
+        # characters outside the alphabet are left out: they send every state back to 0
+        delta = [{ch: t for ch, t in d.items() if t} for d in delta]
+        self._delta = delta
+        self._out = [tuple(sorted(o, key=len, reverse=True)) if o else _NO_MATCH for o in out]
+        # replay the recent keys so a half-typed code survives the rebuild
+        self.state = 0
+        for ch in self._recent:
+            self.state = delta[self.state].get(ch, 0)
+
+    def feed(self, ch):
+        """One typed character. Runs the actions of any codes it completes; returns those codes."""
+        self.keys += 1
+        self._recent.append(ch)
+        s = self.state = self._delta[self.state].get(ch, 0)
+        matched = self._out[s]
+        if matched:
+            # like the old buffer: a completed code starts over from scratch
+            self.state = 0
+            self._recent.clear()
+            self.fired += len(matched)
+            for code in matched:
+                try:
+                    self.codes[code]()
+                except Exception as e:
+                    print("Cheat error:", e)
+        return matched
+
+    def key_event(self, event):
+        """Tk <Key> handler: printable characters only, case-insensitive."""
+        ch = getattr(event, "char", "")
+        if ch and ch.isprintable():
+            self.feed(ch.lower())
@@ -0,0 +1,161 @@
+# rps_console.py
+"""
+Cheat console command registry.
+Commands are registered once with a name, a help line and their arguments
+(taken from the function signature). A console line may hold several
+commands separated by ";" (or newlines, in files run with "run <file>"),
+command names may be shortened to any unique prefix, and a whole batch runs
+under one UI hold, so hundreds of commands end in a single refresh and a
+single output message.
+
+    reset; bossbattle; autoplay 1000
+    run scenarios/boss_rush.txt
+"""
+
+import contextlib
+import inspect
+import os
+
+MAX_RUN_DEPTH = 4          # run <file> may nest this deep
+
+
+class ConsoleError(Exception):
+    """Bad command line: unknown or ambiguous command, wrong arguments."""
+
+
+class Command:
+    __slots__ = ("name", "func", "help", "usage", "min_args", "max_args")
+
+    def __init__(self, name, func, help=""):
+        self.name = name
+        self.func = func
+        self.help = help
+        params = list(inspect.signature(func).parameters.values())
+        positional = [p for p in params if p.kind in (p.POSITIONAL_ONLY, p.POSITIONAL_OR_KEYWORD)]
+        self.min_args = sum(1 for p in positional if p.default is p.empty)
+        varargs = any(p.kind == p.VAR_POSITIONAL for p in params)
+        self.max_args = None if varargs else len(positional)
+        words = [p.name if p.default is p.empty else f"[{p.name}]" for p in positional]
+        if varargs:
+            words.append("...")
+        self.usage = " ".join([name] + words)
+
+
+class CommandConsole:
+    """
+    show(title, text) displays command output (once per line typed);
+    hold() is a context manager that defers UI refreshes (Renderer.hold).
+    """
+
+    def __init__(self, show=None, hold=None):
+        self.commands = {}
+        self.show = show
+        self.hold = hold if hold is not None else contextlib.nullcontext
+        self.executed = 0
+        self.add("help", self.help_text, "list commands, or help <command>")
+        self.add("run", self._run_file, "run the commands in a file")
+        self._depth = 0
+
+    # --- registry ---
+    def add(self, name, func, help=""):
+        self.commands[name.lower()] = Command(name.lower(), func, help)
+        return func
+
+    def command(self, name, help=""):
+        """Decorator form of add()."""
+        def register(func):
+            return self.add(name, func, help)
+        return register
+
+    def complete(self, prefix):
+        prefix = prefix.lower()
+        return sorted(n for n in self.commands if n.startswith(prefix))
+
+    def resolve(self, word):
+        word = word.lower()
+        cmd = self.commands.get(word)
+        if cmd is not None:
+            return cmd
+        names = self.complete(word)
+        if len(names) == 1:
+            return self.commands[names[0]]
+        if names:
+            raise ConsoleError(f"'{word}' is ambiguous: {', '.join(names)}")
+        raise ConsoleError(f"'{word}' is not recognized. Type 'help' for commands.")
+
+    # --- running ---
+    @staticmethod
+    def split(text):
+        """Commands in a line or script: ';' and newlines separate, '#' starts a comment."""
+        out = []
+        for line in text.splitlines():
+            line = line.split("#", 1)[0]
+            out.extend(c.strip() for c in line.split(";") if c.strip())
+        return out
+
+    def run_one(self, line):
+        """Run one command; returns its output text (or None). Raises ConsoleError."""
+        words = line.split()
+        cmd = self.resolve(words[0])
+        args = words[1:]
+        if len(args) < cmd.min_args or (cmd.max_args is not None and len(args) > cmd.max_args):
+            raise ConsoleError(f"usage: {cmd.usage}")
+        self.executed += 1
+        out = cmd.func(*args)
+        return None if out is None else str(out)
+
+    def execute(self, text):
+        """
+        Run every command in `text` under one UI hold and show the collected
+        output once. Returns the list of output/error lines.
+        """
+        lines = self.split(text)
+        if not lines:
+            return []
+        outputs = []
+        with self.hold():
+            for line in lines:
+                outputs.extend(self._run_logged(line))
+        if outputs and self.show is not None:
+            title = self.resolve_name(lines[0]) if len(lines) == 1 else f"Console ({len(lines)} commands)"
+            self.show(title, "\n".join(outputs))
+        return outputs
+
+    def _run_logged(self, line):
+        try:
+            out = self.run_one(line)
+        except ConsoleError as e:
+            return [str(e)]
+        except Exception as e:
+            print("Console error:", line, e)
+            return [f"{line}: {e}"]
+        return [out] if out else []
+
+    def resolve_name(self, line):
+        try:
+            return self.resolve(line.split()[0]).name.capitalize()
+        except ConsoleError:
+            return "Console"
+
+    # --- built-ins ---
+    def help_text(self, name=None):
+        if name is not None:
+            cmd = self.resolve(name)
+            return f"{cmd.usage}\n{cmd.help}"
+        rows = [f"- {c.usage}" + (f" — {c.help}" if c.help else "") for c in self.commands.values()]
+        return ("Commands (any unique prefix works; separate several with ';'):\n" + "\n".join(rows))
+
+    def _run_file(self, path):
+        if self._depth >= MAX_RUN_DEPTH:
+            raise ConsoleError(f"run: nested deeper than {MAX_RUN_DEPTH} files")
+        with open(os.path.expanduser(path), encoding="utf-8") as f:
+            lines = self.split(f.read())
+        self._depth += 1
+        try:
+            outputs = []
+            for line in lines:
+                outputs.extend(self._run_logged(line))
+        finally:
+            self._depth -= 1
+        outputs.append(f"ran {len(lines)} commands from {path}")
+        return "\n".join(outputs)
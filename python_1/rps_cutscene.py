@@ -0,0 +1,132 @@
+# rps_cutscene.py
+"""
+Story-intro cutscene ("test video") for demo.py.
+Every pumpkin's canvas items share a tag, so a frame is one canvas.move for
+the whole parade (plus one per pumpkin that wraps around). Positions come
+from elapsed time, not from a fixed step per tick, so the parade keeps its
+speed when frames are late; a small overlay counts late and dropped frames.
+"""
+
+import time
+import tkinter as tk
+
+from rps_profiler import profiled
+
+SPEED = 150.0        # px per second (the old 6 px every 40 ms)
+FRAME_MS = 16        # target frame interval (~60 fps)
+
+
+class FrameStats:
+    """Frame interval bookkeeping for the timing overlay."""
+
+    def __init__(self, frame_ms):
+        self.frame_s = frame_ms / 1000.0
+        self.frames = 0
+        self.late = 0         # frames that arrived more than 1.5 intervals after the last one
+        self.dropped = 0      # whole intervals skipped
+        self.worst_ms = 0.0
+        self.last = None
+
+    def tick(self, now):
+        if self.last is not None:
+            dt = now - self.last
+            self.worst_ms = max(self.worst_ms, dt * 1000.0)
+            if dt > 1.5 * self.frame_s:
+                self.late += 1
+                self.dropped += int(dt / self.frame_s) - 1
+        self.last = now
+        self.frames += 1
+
+    def text(self, elapsed):
+        fps = self.frames / elapsed if elapsed > 0 else 0.0
+        return f"{fps:4.0f} fps  late {self.late}  dropped {self.dropped}  worst {self.worst_ms:.0f} ms"
+
+
+def play_cutscene(root, on_done, duration=5.0, pumpkins=6, frame_ms=FRAME_MS, show_timing=True,
+                  title="🎃 Haunted Tournament — Story Intro"):
+    """
+    Plays a small animated cutscene in a modal window, then calls on_done().
+    Returns the FrameStats of the run (filled in as it plays).
+    """
+    cut = tk.Toplevel(root)
+    cut.transient(root)
+    cut.grab_set()
+    cut.title("🎬 Story Intro")
+    # We'll center it and make it slightly larger than the main canvas area
+    w, h = 700, 380
+    x = root.winfo_x() + max((root.winfo_width() - w)//2, 0)
+    y = root.winfo_y() + max((root.winfo_height() - h)//2, 0)
+    cut.geometry(f"{w}x{h}+{x}+{y}")
+    cut.config(bg="black")
+
+    canvas = tk.Canvas(cut, width=w, height=h, bg="black", highlightthickness=0)
+    canvas.pack(fill="both", expand=True)
+
+    title = canvas.create_text(w//2, 60, text=title, font=("Arial", 22, "bold"), fill="orange")
+    overlay = None
+    if show_timing:
+        overlay = canvas.create_text(8, h - 8, anchor="sw", text="", font=("Courier", 10), fill="#7f7f7f")
+
+    # Pumpkins: oval + eyes + mouth under one tag each, all under "pumpkin"
+    span = w + 200                  # a pumpkin wraps after travelling this far
+    start_x = []
+    for i in range(pumpkins):
+        px = -100 - i*110
+        py = h//2 + (i%2)*30 - 20
+        tags = ("pumpkin", f"pumpkin{i}")
+        canvas.create_oval(px, py, px+80, py+80, fill="#ff8c42", outline="", tags=tags)
+        canvas.create_oval(px+20, py+20, px+30, py+30, fill="black", tags=tags)
+        canvas.create_oval(px+50, py+20, px+60, py+30, fill="black", tags=tags)
+        canvas.create_line(px+20, py+55, px+60, py+55, fill="black", width=3, tags=tags)
+        start_x.append(px)
+    drawn_x = list(start_x)         # where each pumpkin is on the canvas right now
+
+    stats = FrameStats(frame_ms)
+    start_time = None               # set by the first frame
+    last_t = 0.0                    # elapsed time at the previous frame
+
+    def position(i, t):
+        # left edge from elapsed time; off the right side (> w + 50) wraps back by `span`
+        x = start_x[i] + SPEED * t
+        if x > w + 50:
+            x -= span * (int((x - (w + 50)) // span) + 1)
+        return x
+
+    @profiled("cutscene tick")
+    def animate():
+        nonlocal start_time, last_t
+        now = time.perf_counter()
+        if start_time is None:
+            start_time = now
+        t = now - start_time
+        stats.tick(now)
+        # whole parade in one move, then fix up the pumpkins that wrapped around
+        common = SPEED * (t - last_t)
+        last_t = t
+        canvas.move("pumpkin", common, 0)
+        for i in range(pumpkins):
+            target = position(i, t)
+            off = target - (drawn_x[i] + common)
+            if abs(off) > 0.5:
+                canvas.move(f"pumpkin{i}", off, 0)
+            drawn_x[i] = target
+        # Flicker text for spooky feel
+        canvas.itemconfig(title, fill="orange" if int(t*4) % 2 == 0 else "#ffd27f")
+        if overlay is not None:
+            canvas.itemconfig(overlay, text=stats.text(t))
+        if t < duration:
+            # aim at the next frame boundary, not "frame_ms from now"
+            next_at = start_time + (int(t * 1000 / frame_ms) + 1) * frame_ms / 1000.0
+            cut.after(max(1, int((next_at - time.perf_counter()) * 1000)), animate)
+        else:
+            # clean up and start story
+            try:
+                cut.grab_release()
+                cut.destroy()
+            except Exception:
+                pass
+            on_done()
+
+    # Start animation after short delay
+    cut.after(80, animate)
+    return stats
@@ -0,0 +1,694 @@
+# rps_engine.py
+"""
+Headless Rock-Paper-Scissors rules (Halloween edition).
+No Tk, no sound, no dialogs: every call returns what happened and the
+front-ends (demo.py, Rock_Paper_Scissor.py) decide how to show it.
+
+Moves are ints inside the engine: 0 = rock, 1 = paper, 2 = scissor.
+play_round() returns (bot_move, events) where events is a bit set of EV_* flags.
+"""
+
+import hashlib
+import random
+import time
+
+# --- Moves ---
+ROCK, PAPER, SCISSOR = 0, 1, 2
+options = ["rock", "paper", "scissor"]
+MOVE_INDEX = {"rock": ROCK, "paper": PAPER, "scissor": SCISSOR, "scissors": SCISSOR}
+COUNTER = (PAPER, SCISSOR, ROCK)   # COUNTER[m] beats m
+# (user - bot) % 3 -> 0 tie, 1 user wins, 2 bot wins
+
+# --- Round events (bit flags) ---
+EV_TIE = 1
+EV_WIN = 2
+EV_LOSS = 4
+EV_BOSS_APPEARS = 8
+EV_BOSS_WEAKENED = 16
+EV_BOSS_DEFEATED = 32
+EV_VICTORY = 64          # normal match won (stats already reset)
+EV_DEFEAT = 128          # normal match lost (stats already reset)
+EV_ENEMY_DEFEATED = 256  # story enemy beaten
+EV_NEXT_ENEMY = 512      # story moved on to the next enemy
+EV_STORY_COMPLETE = 1024 # last story enemy beaten, story mode over
+EV_STORY_LOST = 2048     # story enemy won; front-end restarts the story
+# user * 3 + bot -> EV_TIE, EV_WIN or EV_LOSS
+OUTCOME = tuple((EV_TIE, EV_WIN, EV_LOSS)[(u - b) % 3] for u in range(3) for b in range(3))
+
+# --- Which branch of bot_choice picked the last move (Game.branch) ---
+BR_RANDOM = 0           # plain random move
+BR_FREQUENCY = 1        # countered the most-played move
+BR_PREDICTOR = 2        # countered the n-gram prediction
+BR_ENSEMBLE = 3         # meta-strategy bot
+BR_ADAPTIVE_RANDOM = 4  # adaptive path, but the bias roll said random
+BR_GIVEN = 5            # bot move supplied by the caller
+BRANCH_NAMES = ("random", "frequency", "predictor", "ensemble", "adaptive-random", "given")
+
+# --- Control notes (Game.recorder(code, arg)): every call besides play_round that changes a game ---
+CT_SESSION = 0          # written by the recorder itself when it attaches (rps_matchlog)
+CT_DIFFICULTY = 1       # arg: index in DIFFICULTIES, 255 for any other name (plays like Hard)
+CT_RESET = 2
+CT_STORY = 3
+CT_BOSS = 4
+CT_PUMPKIN = 5
+CT_EASTER = 6
+CT_WARM = 7             # arg: rock | paper << 21 | scissor << 42
+CT_GOAL = 8             # arg: new score goal
+CT_CAMPAIGN = 9         # arg: campaign_key() of the story enemies (written on attach)
+CT_COUNTS = 10          # arg: move counts of the state restored next (rock | paper << 21 | scissor << 42)
+CT_RESTORE = 11         # arg: GameState.pack() state word; the game was put back to that state
+CT_WIDE = 12            # arg: field << 60 | value, the full value of a field CT_RESTORE could not hold
+DIFFICULTIES = ("Easy", "Medium", "Hard", "Ensemble")
+
+# --- Bot tuning (demo.py rules) ---
+ADAPTIVE_BIAS = {"Easy": 0.25, "Medium": 0.5, "Hard": 0.8}
+BOSS_BIAS = 0.95                                            # Hard + boss
+BOT_ADAPTIVE_RATE = {"Easy": 0.0, "Medium": 0.35, "Hard": 0.7}
+STORY_ADAPTIVE_RATE = {"easy": 0.25, "medium": 0.5, "hard": 0.75}
+
+# --- Bot tuning (Rock_Paper_Scissor.py rules) ---
+QUICK_ADAPTIVE_BIAS = {"Easy": 0.25, "Medium": 0.5, "Hard": 0.85}
+QUICK_BOSS_BONUS = 0.15
+
+story_enemies = [
+    {"name": "👻 Ghost Bot", "difficulty": "Easy", "rounds": 2, "bg": "#2f2f36"},
+    {"name": "🧙 Witch Bot", "difficulty": "Medium", "rounds": 3, "bg": "#3a1a4a"},
+    {"name": "💀 Boss Bot", "difficulty": "Hard", "rounds": 4, "bg": "#2b0712", "strategy": "ensemble"}
+]
+# longer campaigns come from JSON files (rps_campaign)
+
+SIM_CHUNK = 4096        # player moves simulate() draws at a time
+
+
+def stream_seed(seed, *keys):
+    """Independent 64-bit seed per (seed, keys), so derived streams never share draws."""
+    h = hashlib.sha256(repr((seed,) + keys).encode()).digest()
+    return int.from_bytes(h[:8], "little")
+
+
+def campaign_key(enemies):
+    """64-bit key of what a story campaign changes in play (not names, colours or sounds)."""
+    return stream_seed(0, tuple((e["rounds"], e.get("difficulty", "Easy").lower(), e.get("strategy") == "ensemble")
+                                for e in enemies))
+
+
+# GameState fields pack() has to cut, by field number (CT_WIDE): the word's four, then the move counts
+_WIDE_FIELDS = (("user_score", 0xFFFF), ("computer_score", 0xFFFF), ("current_enemy_index", 0xFF),
+                ("score_goal", 0xFFF))
+_COUNT_MAX = (1 << 21) - 1
+
+
+class GameState:
+    """
+    One match as a value (Game.snapshot()): scores, cheats used, boss and
+    story progress, move counts, difficulty and goal. It is immutable and
+    shares nothing the game still changes, so a snapshot is one small
+    allocation and can be kept, compared or restored any number of times.
+    The bot's brain (rng, predictor, ensemble) is not part of it: that keeps
+    learning for the whole session, as it does across matches.
+    """
+    __slots__ = ("difficulty", "score_goal", "user_score", "computer_score", "pumpkin_power_used",
+                 "boss_mode_active", "boss_defeated", "move_counts", "story_mode", "current_enemy_index")
+
+    def __init__(self, difficulty, score_goal, user_score, computer_score, pumpkin_power_used,
+                 boss_mode_active, boss_defeated, move_counts, story_mode, current_enemy_index):
+        self.difficulty = difficulty
+        self.score_goal = score_goal
+        self.user_score = user_score
+        self.computer_score = computer_score
+        self.pumpkin_power_used = pumpkin_power_used
+        self.boss_mode_active = boss_mode_active
+        self.boss_defeated = boss_defeated
+        self.move_counts = move_counts          # (rock, paper, scissor) tuple
+        self.story_mode = story_mode
+        self.current_enemy_index = current_enemy_index
+
+    def pack(self, clamp=False):
+        """
+        The state as two 64-bit words (for the match log and save files):
+        user 16 | bot 16 | flags 4 | enemy 8 | difficulty 8 | goal 12 bits,
+        and the move counts at 21 bits each. ValueError if a field does not fit,
+        unless `clamp`: then it is cut to the largest value that does (see overflow()).
+        """
+        if not clamp and self.overflow():
+            raise ValueError("game state too large to pack")
+        c = [min(n, _COUNT_MAX) for n in self.move_counts]
+        us, cs, enemy, goal = (min(getattr(self, k), top) for k, top in _WIDE_FIELDS)
+        flags = self.pumpkin_power_used | self.boss_mode_active << 1 | self.boss_defeated << 2 | self.story_mode << 3
+        d = DIFFICULTIES.index(self.difficulty) if self.difficulty in DIFFICULTIES else 255
+        word = us | cs << 16 | flags << 32 | enemy << 36 | d << 44 | goal << 52
+        return word, c[0] | c[1] << 21 | c[2] << 42
+
+    def overflow(self):
+        """(field, value) for each field too large for pack(): 0-3 as in _WIDE_FIELDS, 4-6 the move counts."""
+        wide = [(i, getattr(self, k)) for i, (k, top) in enumerate(_WIDE_FIELDS) if getattr(self, k) > top]
+        wide += [(4 + i, n) for i, n in enumerate(self.move_counts) if n > _COUNT_MAX]
+        return wide
+
+    def widen(self, wide):
+        """This state with the fields in `wide` ({field: value}, from overflow()) put back to their full value."""
+        if not wide:
+            return self
+        values = {k: getattr(self, k) for k in self.__slots__}
+        counts = list(self.move_counts)
+        for i, value in wide.items():
+            if i < len(_WIDE_FIELDS):
+                values[_WIDE_FIELDS[i][0]] = value
+            else:
+                counts[i - len(_WIDE_FIELDS)] = value
+        values["move_counts"] = tuple(counts)
+        return GameState(**values)
+
+    @classmethod
+    def unpack(cls, word, counts):
+        d = word >> 44 & 0xFF
+        flags = word >> 32 & 15
+        m = (1 << 21) - 1
+        return cls(DIFFICULTIES[d] if d < len(DIFFICULTIES) else "Hard", word >> 52, word & 0xFFFF,
+                   word >> 16 & 0xFFFF, bool(flags & 1), bool(flags & 2), bool(flags & 4),
+                   (counts & m, counts >> 21 & m, counts >> 42 & m), bool(flags & 8), word >> 36 & 0xFF)
+
+    def __eq__(self, other):
+        return isinstance(other, GameState) and all(getattr(self, k) == getattr(other, k) for k in self.__slots__)
+
+    def __repr__(self):
+        return "GameState(" + ", ".join(f"{k}={getattr(self, k)!r}" for k in self.__slots__) + ")"
+
+
+class Game:
+    """
+    One player's game against the bot, using the demo.py rules
+    (difficulty-weighted bot, boss battle, story mode).
+    After every bot move, `branch` says which BR_* path picked it.
+
+    Every bot decision draws from `rng`, seeded from `seed`; the seed plus
+    the player's moves and the calls noted to `recorder` replay the game
+    exactly (rps_replay). Anything else random (comments, scripted players)
+    takes its own generator from stream().
+    """
+    __slots__ = ("seed", "rng", "recorder", "_streams", "score_goal", "difficulty", "boss_threshold", "boss_extra",
+                 "user_score", "computer_score", "pumpkin_power_used",
+                 "boss_mode_active", "boss_defeated", "move_counts", "total_moves", "most",
+                 "story_enemies", "story_mode", "current_enemy_index", "enemy_target",
+                 "predictor", "ensemble", "_spare_ensemble", "_adaptive_bias", "_boss_bias", "_bot_rate", "_enemy_rate",
+                 "_smart", "_use_ensemble", "branch")
+
+    def __init__(self, score_goal=3, difficulty="Easy", boss_threshold=3, rng=None, enemies=None,
+                 predictor=None, seed=None):
+        if seed is None:
+            seed = random.SystemRandom().getrandbits(64)
+        self.seed = seed
+        # a caller-supplied rng is used as is (and the game is only as reproducible as it is)
+        self.rng = rng if rng is not None else random.Random(seed)
+        self.recorder = None       # recorder(code, arg) for each CT_* call, e.g. MatchLog.note
+        self._streams = 0
+        # optional n-gram brain (rps_predict) used by Hard and the boss; learns for the whole session
+        self.predictor = predictor
+        # meta-strategy bot (rps_strategies), created when the "Ensemble" difficulty or an enemy asks for it
+        self.ensemble = None
+        self._spare_ensemble = None    # built ahead of time by prepare_enemy()
+        self._use_ensemble = False
+        self.branch = BR_RANDOM
+        self.score_goal = score_goal
+        self.boss_threshold = boss_threshold
+        self.boss_extra = 2
+        self.story_enemies = enemies if enemies is not None else story_enemies
+        self.story_mode = False
+        self.current_enemy_index = 0
+        self.enemy_target = self.story_enemies[0]["rounds"]
+        self._enemy_rate = 0.0
+        self.set_difficulty(difficulty)
+        self.reset_stats()
+
+    # --- setup ---
+    def _note(self, code, arg=0):
+        if self.recorder is not None:
+            self.recorder(code, arg)
+
+    def stream(self, name):
+        """A new generator derived from the seed that never touches the bot's draws."""
+        self._streams += 1
+        return random.Random(stream_seed(self.seed, name, self._streams))
+
+    def set_goal(self, goal):
+        self._note(CT_GOAL, goal)
+        self.score_goal = goal
+
+    def set_difficulty(self, difficulty):
+        self._note(CT_DIFFICULTY, DIFFICULTIES.index(difficulty) if difficulty in DIFFICULTIES else 255)
+        self._set_difficulty(difficulty)
+
+    def _set_difficulty(self, difficulty):
+        self.difficulty = difficulty
+        self._adaptive_bias = ADAPTIVE_BIAS.get(difficulty, ADAPTIVE_BIAS["Hard"])
+        self._boss_bias = self._adaptive_bias if difficulty in ("Easy", "Medium") else BOSS_BIAS
+        self._bot_rate = BOT_ADAPTIVE_RATE.get(difficulty, BOT_ADAPTIVE_RATE["Hard"])
+        self._smart = difficulty not in ("Easy", "Medium")
+        self._refresh_brain()
+
+    def _refresh_brain(self):
+        """Use the ensemble bot for the "Ensemble" difficulty, or for story enemies with strategy "ensemble"."""
+        if self.story_mode:
+            wanted = self.current_enemy.get("strategy") == "ensemble"
+        else:
+            wanted = self.difficulty == "Ensemble"
+        if wanted and self.ensemble is None:
+            if self._spare_ensemble is not None:
+                self.ensemble, self._spare_ensemble = self._spare_ensemble, None
+            else:
+                from rps_strategies import EnsembleBot
+                self.ensemble = EnsembleBot(rng=self.rng)
+        self._use_ensemble = wanted
+
+    def prepare_enemy(self, index):
+        """
+        Build what story enemy `index` needs before the fight reaches it; safe
+        from another thread. A fresh bot has drawn nothing yet, so play and
+        replays do not depend on when this ran.
+        """
+        enemy = self.story_enemies[index]
+        if enemy.get("strategy") == "ensemble" and self.ensemble is None and self._spare_ensemble is None:
+            from rps_strategies import EnsembleBot
+            self._spare_ensemble = EnsembleBot(rng=self.rng)
+
+    def reset_stats(self):
+        self._note(CT_RESET)
+        self._reset()
+
+    def _reset(self):
+        # story mode (if on) survives a reset; only the scores start over
+        self.user_score = 0
+        self.computer_score = 0
+        self.pumpkin_power_used = False
+        self.boss_mode_active = False
+        self.boss_defeated = False
+        self.move_counts = [0, 0, 0]
+        self.total_moves = 0
+        self.most = ROCK
+
+    # --- snapshots ---
+    def snapshot(self):
+        """The current match as an immutable GameState (a few microseconds)."""
+        return GameState(self.difficulty, self.score_goal, self.user_score, self.computer_score,
+                         self.pumpkin_power_used, self.boss_mode_active, self.boss_defeated,
+                         tuple(self.move_counts), self.story_mode, self.current_enemy_index)
+
+    def restore(self, state):
+        """Put the match back to `state` (undo, resume). The bot keeps what it has learned."""
+        if state.story_mode and state.current_enemy_index >= len(self.story_enemies):
+            raise ValueError(f"no story enemy {state.current_enemy_index + 1} in this campaign")
+        if self.recorder is not None:
+            # a long session can outgrow the packed word: whatever it cuts is logged in full first
+            for field, value in state.overflow():
+                self._note(CT_WIDE, field << 60 | min(value, (1 << 60) - 1))
+            word, counts = state.pack(clamp=True)
+            self._note(CT_COUNTS, counts)
+            self._note(CT_RESTORE, word)
+        if state.difficulty != self.difficulty:
+            self._set_difficulty(state.difficulty)
+        self.score_goal = state.score_goal
+        self.story_mode = state.story_mode
+        if state.story_mode:
+            self._enter_enemy(state.current_enemy_index)
+        else:
+            self.current_enemy_index = state.current_enemy_index
+            self._refresh_brain()
+        self.user_score = state.user_score
+        self.computer_score = state.computer_score
+        self.pumpkin_power_used = state.pumpkin_power_used
+        self.boss_mode_active = state.boss_mode_active
+        self.boss_defeated = state.boss_defeated
+        c = self.move_counts = list(state.move_counts)
+        self.total_moves = sum(c)
+        # the most-played move, ties to the first, as record_move() keeps it
+        self.most = ROCK if (c[0] >= c[1] and c[0] >= c[2]) else (PAPER if c[1] >= c[2] else SCISSOR)
+
+    def user_move_counts(self):
+        return dict(zip(options, self.move_counts))
+
+    def warm_start(self, counts):
+        """Seed a fresh match's move counts (rock, paper, scissor) from a stored player profile."""
+        if counts is None or self.total_moves:
+            return False
+        self.move_counts = [int(c) for c in counts]
+        c = self.move_counts
+        self._note(CT_WARM, c[0] | c[1] << 21 | c[2] << 42)
+        self.total_moves = sum(c)
+        self.most = ROCK if (c[0] >= c[1] and c[0] >= c[2]) else (PAPER if c[1] >= c[2] else SCISSOR)
+        return True
+
+    # --- bot ---
+    def adaptive_choice(self):
+        # was get_adaptive_choice(): counter the player's most-used move
+        rng = self.rng
+        if not self.total_moves:
+            self.branch = BR_ADAPTIVE_RANDOM
+            return int(rng.random() * 3)
+        boss = self.boss_mode_active
+        if rng.random() < (self._boss_bias if boss else self._adaptive_bias):
+            if self.predictor is not None and (boss or self._smart):
+                guess = self.predictor.guess
+                if guess >= 0:
+                    self.branch = BR_PREDICTOR
+                    return COUNTER[guess]
+            self.branch = BR_FREQUENCY
+            return COUNTER[self.most]
+        self.branch = BR_ADAPTIVE_RANDOM
+        return int(rng.random() * 3)
+
+    def bot_choice(self):
+        # was get_bot_choice(): boss, story enemy or menu difficulty decides the odds
+        if self._use_ensemble:
+            self.branch = BR_ENSEMBLE
+            return self.ensemble.choose()
+        rng = self.rng
+        boss = self.boss_mode_active
+        if not boss:
+            rate = self._enemy_rate if self.story_mode else self._bot_rate
+            if not rate or rng.random() >= rate:
+                self.branch = BR_RANDOM
+                return int(rng.random() * 3)
+        # adaptive_choice(), inlined: it runs on most Hard rounds and every boss round
+        if self.total_moves and rng.random() < (self._boss_bias if boss else self._adaptive_bias):
+            if self.predictor is not None and (boss or self._smart):
+                guess = self.predictor.guess
+                if guess >= 0:
+                    self.branch = BR_PREDICTOR
+                    return COUNTER[guess]
+            self.branch = BR_FREQUENCY
+            return COUNTER[self.most]
+        self.branch = BR_ADAPTIVE_RANDOM
+        return int(rng.random() * 3)
+
+    # --- rounds ---
+    def record_move(self, user):
+        counts = self.move_counts
+        counts[user] += 1
+        self.total_moves += 1
+        most = self.most
+        # same tie-break as max() over {"rock", "paper", "scissor"}: first key wins
+        if user != most and (counts[user] > counts[most] or (counts[user] == counts[most] and user < most)):
+            self.most = user
+
+    def play_round(self, user, bot=None):
+        """
+        Play one round for move `user` (0-2). The bot picks unless `bot` is given.
+        Returns (bot_move, events).
+        """
+        # record_move(), inlined: this is the hot path
+        counts = self.move_counts
+        counts[user] += 1
+        self.total_moves += 1
+        most = self.most
+        if user != most and (counts[user] > counts[most] or (counts[user] == counts[most] and user < most)):
+            self.most = user
+        if bot is None:
+            bot = self.bot_choice()
+        else:
+            self.branch = BR_GIVEN
+        if self.predictor is not None:
+            # after the bot chose: the predictor guesses this move from the ones before it
+            self.predictor.update(user)
+        if self.ensemble is not None:
+            self.ensemble.update(user)
+        ev = OUTCOME[user * 3 + bot]
+        if ev == EV_TIE:
+            return bot, ev
+        if ev == EV_WIN:
+            self.user_score += 1
+        else:
+            self.computer_score += 1
+        # most points decide nothing: skip after_point() while both scores are below
+        # the target and the player's is below the boss threshold
+        target = self.enemy_target if self.story_mode else self.score_goal
+        score = self.user_score
+        if score < target and score < self.boss_threshold and self.computer_score < target:
+            return bot, ev
+        return bot, ev | self.after_point()
+
+    def after_point(self):
+        """Boss, story and match checks after the score changed."""
+        ev = EV_BOSS_APPEARS if self.check_for_boss() else 0
+        if self.story_mode:
+            # in story mode, threshold is enemy_target rounds
+            if self.user_score >= self.enemy_target:
+                ev |= EV_ENEMY_DEFEATED | self.next_enemy()
+            elif self.computer_score >= self.enemy_target:
+                ev |= EV_STORY_LOST
+            return ev
+        if self.user_score >= self.score_goal:
+            if self.boss_mode_active and not self.boss_defeated:
+                if self.user_score >= self.score_goal + self.boss_extra:
+                    self.boss_defeated = True
+                    self.boss_mode_active = False
+                    ev |= EV_BOSS_DEFEATED
+                    self._reset()
+                else:
+                    ev |= EV_BOSS_WEAKENED
+            else:
+                ev |= EV_VICTORY
+                self._reset()
+        elif self.computer_score >= self.score_goal:
+            ev |= EV_DEFEAT
+            self._reset()
+        return ev
+
+    # --- boss ---
+    def check_for_boss(self):
+        if not self.boss_mode_active and self.user_score >= self.boss_threshold and not self.boss_defeated:
+            self.boss_mode_active = True
+            return True
+        return False
+
+    def force_boss(self):
+        self._note(CT_BOSS)
+        if self.boss_mode_active:
+            return False
+        self.boss_mode_active = True
+        return True
+
+    # --- cheats ---
+    def pumpkin_power(self):
+        """+1 once per match. Returns None if already used, else the boss events."""
+        self._note(CT_PUMPKIN)
+        if self.pumpkin_power_used:
+            return None
+        self.pumpkin_power_used = True
+        self.user_score += 1
+        return EV_BOSS_APPEARS if self.check_for_boss() else 0
+
+    def easter_egg(self):
+        self._note(CT_EASTER)
+        self.user_score += 1
+
+    # --- story mode ---
+    @property
+    def current_enemy(self):
+        return self.story_enemies[self.current_enemy_index]
+
+    def _enter_enemy(self, index):
+        self.current_enemy_index = index
+        self.user_score = 0
+        self.computer_score = 0
+        enemy = self.story_enemies[index]
+        self.enemy_target = enemy["rounds"]
+        ed = enemy.get("difficulty", "Easy").lower()
+        self._enemy_rate = STORY_ADAPTIVE_RATE.get(ed, STORY_ADAPTIVE_RATE["hard"])
+        self._refresh_brain()
+
+    def start_story(self):
+        self._note(CT_STORY)
+        self.story_mode = True
+        self._enter_enemy(0)
+
+    def next_enemy(self):
+        """Move to the next enemy or finish story mode."""
+        if self.current_enemy_index + 1 < len(self.story_enemies):
+            self._enter_enemy(self.current_enemy_index + 1)
+            return EV_NEXT_ENEMY
+        self.story_mode = False
+        self.current_enemy_index = 0
+        self._refresh_brain()
+        return EV_STORY_COMPLETE
+
+
+class QuickGame(Game):
+    """
+    Rock_Paper_Scissor.py rules: the bot is always adaptive, the boss adds
+    a flat bias bonus and Hard brings the boss in earlier.
+    """
+    __slots__ = ()
+
+    def __init__(self, score_goal=4, difficulty="Easy", boss_threshold=3, rng=None, predictor=None, seed=None):
+        Game.__init__(self, score_goal, difficulty, boss_threshold, rng, predictor=predictor, seed=seed)
+
+    def _set_difficulty(self, difficulty):
+        Game._set_difficulty(self, difficulty)
+        self._adaptive_bias = QUICK_ADAPTIVE_BIAS.get(difficulty, QUICK_ADAPTIVE_BIAS["Hard"])
+        self._boss_bias = min(1.0, self._adaptive_bias + QUICK_BOSS_BONUS)
+        self.boss_threshold = 2 if difficulty == "Hard" else 3
+
+    def bot_choice(self):
+        if self._use_ensemble:
+            self.branch = BR_ENSEMBLE
+            return self.ensemble.choose()
+        return self.adaptive_choice()
+
+
+# the engine's own round methods, for simulate(): class -> (bot_choice, always adaptive)
+# (rps_profiler.profile_method() replaces them on the class, and simulate() then calls them)
+_PLAY_ROUND = Game.play_round
+_BOT_CHOICE = {Game: (Game.bot_choice, False), QuickGame: (QuickGame.bot_choice, True)}
+
+
+def simulate(game, rounds, player=None):
+    """
+    Play `rounds` rounds headless. `player` is an optional callable returning
+    the next user move (0-2); by default the player is uniformly random
+    (from its own stream, so the bot's draws are the same as in a replay).
+    A lost story restarts the story right away, like the cutscene would.
+    Returns a dict of round and match totals.
+    """
+    sim = game.stream("simulate")
+    totals = [0] * 6        # wins, losses, ties, victories, defeats, bosses
+    if player is not None:
+        _play_rounds(game, (player() for _ in range(rounds)), totals)
+    else:
+        for start in range(0, rounds, SIM_CHUNK):
+            # choices() draws exactly what int(random() * 3) per round would
+            moves = sim.choices((ROCK, PAPER, SCISSOR), k=min(SIM_CHUNK, rounds - start))
+            done = _play_plain(game, moves, totals) if _plain(game) else 0
+            if done < len(moves):
+                _play_rounds(game, moves[done:], totals)
+    wins, losses, ties, victories, defeats, bosses = totals
+    return {"rounds": rounds, "wins": wins, "losses": losses, "ties": ties,
+            "victories": victories, "defeats": defeats, "bosses": bosses}
+
+
+def _count(game, ev, totals):
+    """simulate()'s match totals for one round's events (a tie has none)."""
+    if ev & (EV_VICTORY | EV_BOSS_DEFEATED | EV_STORY_COMPLETE):
+        totals[3] += 1
+    elif ev & (EV_DEFEAT | EV_STORY_LOST):
+        totals[4] += 1
+        if ev & EV_STORY_LOST:
+            game.start_story()
+    if ev & EV_BOSS_APPEARS:
+        totals[5] += 1
+
+
+def _play_rounds(game, moves, totals):
+    play = game.play_round
+    for user in moves:
+        ev = play(user)[1]
+        if ev & EV_TIE:
+            totals[2] += 1
+            continue
+        totals[0 if ev & EV_WIN else 1] += 1
+        _count(game, ev, totals)
+
+
+def _plain(game):
+    """True if _play_plain() plays `game` exactly as play_round() would."""
+    cls = type(game)
+    return (not game._use_ensemble and game.ensemble is None and cls.play_round is _PLAY_ROUND
+            and _BOT_CHOICE.get(cls, (None,))[0] is cls.bot_choice)
+
+
+def _play_plain(game, moves, totals):
+    """
+    play_round() and bot_choice() inlined over `moves`, with the game's
+    fields in locals: simulate() spends most of a round here. What only
+    after_point() changes is read again after each call to it. Stops early
+    when the game needs the ensemble; returns the number of rounds played.
+    """
+    rand = game.rng.random
+    predictor = game.predictor
+    update = predictor.update if predictor is not None else None
+    always = _BOT_CHOICE[type(game)][1]
+    wins, losses, ties = totals[:3]
+    branch = game.branch
+    i, n = 0, len(moves)
+    while i < n and not game._use_ensemble:
+        counts = game.move_counts
+        total, most = game.total_moves, game.most
+        us, cs = game.user_score, game.computer_score
+        boss = game.boss_mode_active
+        adaptive = boss or always
+        rate = game._enemy_rate if game.story_mode else game._bot_rate
+        bias = game._boss_bias if boss else game._adaptive_bias
+        smart = predictor is not None and (boss or game._smart)
+        target = game.enemy_target if game.story_mode else game.score_goal
+        threshold = game.boss_threshold
+        while i < n:
+            user = moves[i]
+            i += 1
+            counts[user] += 1
+            total += 1
+            if user != most and (counts[user] > counts[most] or (counts[user] == counts[most] and user < most)):
+                most = user
+            if adaptive or (rate and rand() < rate):
+                if rand() < bias:
+                    guess = predictor.guess if smart else -1
+                    if guess >= 0:
+                        branch = BR_PREDICTOR
+                        bot = COUNTER[guess]
+                    else:
+                        branch = BR_FREQUENCY
+                        bot = COUNTER[most]
+                else:
+                    branch = BR_ADAPTIVE_RANDOM
+                    bot = int(rand() * 3)
+            else:
+                branch = BR_RANDOM
+                bot = int(rand() * 3)
+            if update is not None:
+                update(user)
+            ev = OUTCOME[user * 3 + bot]
+            if ev == EV_TIE:
+                ties += 1
+                continue
+            if ev == EV_WIN:
+                us += 1
+                wins += 1
+            else:
+                cs += 1
+                losses += 1
+            if us < target and us < threshold and cs < target:
+                continue
+            game.total_moves, game.most, game.branch = total, most, branch
+            game.user_score, game.computer_score = us, cs
+            _count(game, game.after_point(), totals)
+            break
+        else:
+            game.total_moves, game.most, game.branch = total, most, branch
+            game.user_score, game.computer_score = us, cs
+    totals[:3] = wins, losses, ties
+    return i
+
+
+if __name__ == "__main__":
+    # throughput check against the 1M rounds/s per core target: python rps_engine.py (exits 1 below it)
+    # simulate() includes drawing the player's moves. The n-gram brain still costs about 1 µs a round
+    # in update() alone, so that path is held to its own floor instead of the 1M target.
+    import sys
+    from rps_predict import NGramPredictor
+    TARGET = 1_000_000
+    NGRAM_TARGET = 350_000
+    ROUNDS, RUNS = 300_000, 3
+    failed = 0
+    for name, make, target in (
+            ("demo Hard", lambda: Game(difficulty="Hard", seed=1), TARGET),
+            ("quick Hard", lambda: QuickGame(difficulty="Hard", seed=1), TARGET),
+            ("demo Hard + n-gram", lambda: Game(difficulty="Hard", seed=1, predictor=NGramPredictor()), NGRAM_TARGET)):
+        best = 0
+        for _ in range(RUNS):       # best of RUNS: a busy host only ever makes a run slower
+            g = make()
+            t0 = time.perf_counter()
+            totals = simulate(g, ROUNDS)
+            best = max(best, ROUNDS / (time.perf_counter() - t0))
+        ok = best >= target
+        failed += not ok
+        print(f"{name}: {best:,.0f} rounds/s ({best / target:.0%} of {target:,})  {'ok' if ok else 'TOO SLOW'}  "
+              f"{totals}")
+    sys.exit(1 if failed else 0)
@@ -0,0 +1,112 @@
+# rps_events.py
+"""
+Event bus from worker threads to the Tk main loop.
+Worker threads (voice, profile loading, and any network or audio thread
+that needs the UI) never call Tk themselves, not even root.after: they
+post() a callable, which is one deque append (atomic, no lock). The Tk
+side drains the bus every DRAIN_MS and runs the batch back to back; the
+widget changes it records land in one render flush (rps_render). A posted
+event therefore runs within one drain interval plus the batch ahead of it.
+A drain stops after BATCH_BUDGET_S and leaves the rest for the next tick,
+so a flood of events cannot freeze the window.
+
+Events posted with a key coalesce: only the newest one per key runs in a
+batch (status and progress updates).
+
+    bus = EventBus().attach(root)                # Tk thread
+    bus.post(play_round, "rock")                 # any thread
+    bus.post(show_progress, 40, key="progress")  # coalesced
+    events                                       (cheat console: counts and latency)
+"""
+
+import collections
+import time
+
+import rps_profiler
+
+DRAIN_MS = 16             # drain cadence: one 60 Hz frame between post and run at most
+BATCH_BUDGET_S = 0.008    # longest a single drain may run callbacks
+
+
+class EventBus:
+    def __init__(self, interval_ms=DRAIN_MS, budget_s=BATCH_BUDGET_S):
+        self._events = collections.deque()      # (posted ns, key, func, args); append/popleft are thread-safe
+        self.interval_ms = interval_ms
+        self.budget_s = budget_s
+        self.root = None
+        self._job = None
+        self.latency = rps_profiler.histogram("event latency")
+        # accounting (Tk thread only)
+        self.run = 0
+        self.coalesced = 0
+        self.batches = 0
+        self.largest_batch = 0
+        self.max_latency_ns = 0
+
+    # --- any thread ---
+    def post(self, func, *args, key=None):
+        self._events.append((time.perf_counter_ns(), key, func, args))
+
+    def pending(self):
+        return len(self._events)
+
+    # --- Tk thread ---
+    def attach(self, root):
+        """Drain on root's main loop every interval_ms."""
+        self.root = root
+        self._job = root.after(self.interval_ms, self._tick)
+        return self
+
+    def detach(self):
+        if self._job is not None:
+            self.root.after_cancel(self._job)
+            self._job = None
+
+    def _tick(self):
+        self.drain()
+        self._job = self.root.after(self.interval_ms, self._tick)
+
+    def drain(self):
+        """Run what has been posted so far (within the time budget). Returns the number of events run."""
+        events = self._events
+        n = len(events)
+        if not n:
+            return 0
+        batch = [events.popleft() for _ in range(n)]
+        latest = {}
+        for i, (_, key, _, _) in enumerate(batch):
+            if key is not None:
+                latest[key] = i
+        clock = time.perf_counter_ns
+        deadline = clock() + int(self.budget_s * 1e9)
+        done = 0
+        for i, (t, key, func, args) in enumerate(batch):
+            if key is not None and latest[key] != i:
+                self.coalesced += 1
+                continue
+            now = clock()
+            if done and now > deadline:
+                # over budget: the rest goes back in front of anything posted meanwhile
+                events.extendleft(reversed(batch[i:]))
+                break
+            wait = now - t
+            if wait > self.max_latency_ns:
+                self.max_latency_ns = wait
+            if rps_profiler.enabled:
+                self.latency.add(wait)
+            try:
+                func(*args)
+            except Exception as e:
+                print("Event error:", e)
+            done += 1
+        self.run += done
+        self.batches += 1
+        if done > self.largest_batch:
+            self.largest_batch = done
+        return done
+
+    def stats(self):
+        return (f"{self.run} events run in {self.batches} batches (largest {self.largest_batch}), "
+                f"{self.coalesced} coalesced, {self.pending()} waiting\n"
+                f"drain every {self.interval_ms} ms; slowest post-to-run {self.max_latency_ns / 1e6:.1f} ms "
+                f"(percentiles: profile on, then stats)")
@@ -0,0 +1,132 @@
+# rps_loadtest.py
+"""
+Load generator for rps_server.
+Opens many simulated players at once; each plays random moves for a number
+of rounds, one request at a time, and times every reply. Prints rounds per
+second and p50/p99/max move latency.
+
+    python rps_loadtest.py --players 2000 --rounds 50            # starts a server process
+    python rps_loadtest.py --connect 127.0.0.1:8765 --players 5000
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import sys
+import time
+
+from rps_server import GameServer, DEFAULT_HOST
+
+MOVES = (b"play rock\n", b"play paper\n", b"play scissor\n")
+
+
+def percentile(sorted_values, q):
+    if not sorted_values:
+        return 0.0
+    i = min(len(sorted_values) - 1, int(q * len(sorted_values)))
+    return sorted_values[i]
+
+
+async def player(host, port, rounds, difficulty, latencies, errors, rng, gate):
+    async with gate:      # caps connections being opened at once
+        try:
+            reader, writer = await asyncio.open_connection(host, port)
+        except OSError:
+            errors.append("connect")
+            return
+    try:
+        await reader.readline()                         # greeting
+        if difficulty:
+            writer.write(f"difficulty {difficulty}\n".encode())
+            await reader.readline()
+        clock = time.perf_counter
+        for _ in range(rounds):
+            t0 = clock()
+            writer.write(MOVES[int(rng.random() * 3)])
+            reply = await reader.readline()
+            latencies.append(clock() - t0)
+            if not reply.startswith(b"round"):
+                errors.append(reply.decode(errors="replace").strip() or "closed")
+                break
+        writer.write(b"quit\n")
+    except (ConnectionError, asyncio.IncompleteReadError):
+        errors.append("connection lost")
+    finally:
+        writer.close()
+        try:
+            await writer.wait_closed()
+        except (ConnectionError, OSError):
+            pass
+
+
+async def spawn_server(rules):
+    """Start rps_server.py in its own process on a free port; returns (process, port)."""
+    script = os.path.join(os.path.dirname(os.path.abspath(__file__)), "rps_server.py")
+    proc = await asyncio.create_subprocess_exec(sys.executable, script, "--port", "0", "--rules", rules,
+                                                stdout=asyncio.subprocess.PIPE)
+    line = await proc.stdout.readline()       # "RPS server (...) on host:port"
+    if not line:
+        raise RuntimeError("server process did not start")
+    return proc, int(line.decode().rsplit(":", 1)[1])
+
+
+async def run(players=1000, rounds=50, host=None, port=None, rules="demo", difficulty="Hard",
+              connect_limit=256, seed=None, in_process=False):
+    """
+    Returns a dict of throughput and latency figures. Without host/port a server
+    is started for the run: a child process, or on this loop with in_process
+    (then client and server share one CPU and the latencies add up).
+    """
+    srv = proc = None
+    if host is None:
+        host = DEFAULT_HOST
+        if in_process:
+            srv = GameServer(rules)
+            port = await srv.start(host, 0)
+        else:
+            proc, port = await spawn_server(rules)
+    rng = random.Random(seed)
+    latencies, errors = [], []
+    gate = asyncio.Semaphore(connect_limit)
+    t0 = time.perf_counter()
+    await asyncio.gather(*(player(host, port, rounds, difficulty, latencies, errors,
+                                  random.Random(rng.random()), gate) for _ in range(players)))
+    elapsed = time.perf_counter() - t0
+    if srv is not None:
+        srv.close()
+    if proc is not None:
+        proc.terminate()
+        await proc.wait()
+    latencies.sort()
+    return {"players": players, "rounds": len(latencies), "errors": len(errors),
+            "first_error": errors[0] if errors else None, "seconds": elapsed,
+            "rounds_per_s": len(latencies) / elapsed if elapsed else 0.0,
+            "p50_ms": percentile(latencies, 0.50) * 1000, "p99_ms": percentile(latencies, 0.99) * 1000,
+            "max_ms": (latencies[-1] * 1000) if latencies else 0.0}
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Hammer rps_server with simulated players.")
+    ap.add_argument("--players", type=int, default=1000)
+    ap.add_argument("--rounds", type=int, default=50, help="rounds per player")
+    ap.add_argument("--connect", default=None, help="host:port of a running server (default: start one)")
+    ap.add_argument("--rules", choices=("demo", "quick"), default="demo", help="rules for the started server")
+    ap.add_argument("--in-process", action="store_true", help="run the server on the client's event loop")
+    ap.add_argument("--difficulty", default="Hard")
+    ap.add_argument("--seed", type=int, default=None)
+    args = ap.parse_args(argv)
+    host = port = None
+    if args.connect:
+        host, _, p = args.connect.rpartition(":")
+        port = int(p)
+    r = asyncio.run(run(args.players, args.rounds, host, port, args.rules, args.difficulty,
+                        seed=args.seed, in_process=args.in_process))
+    print(f"{r['players']} players, {r['rounds']} rounds in {r['seconds']:.2f}s: {r['rounds_per_s']:,.0f} rounds/s")
+    print(f"move latency p50 {r['p50_ms']:.2f} ms, p99 {r['p99_ms']:.2f} ms, max {r['max_ms']:.2f} ms")
+    if r["errors"]:
+        print(f"{r['errors']} errors, first: {r['first_error']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,322 @@
+# rps_matchlog.py
+"""
+Append-only binary match log.
+Every round becomes one fixed-width 24-byte record (time, match, moves, the
+bot branch that picked the move, boss/story state, events and scores).
+Once a game is attached, its seed and every other call that changes it
+(difficulty, reset, story, cheats, warm start) go in as control records of
+the same size, so rps_replay can rebuild any match exactly. One process
+writes to a log file at a time.
+Records are buffered in memory and written in batches. The reader maps the
+file and scans it in chunks (as NumPy views when available), so tens of
+millions of rounds can be summarised without building Python objects.
+
+    python rps_matchlog.py matches.rpslog
+"""
+
+import atexit
+import mmap
+import os
+import struct
+import sys
+import time
+
+from rps_engine import (QuickGame, options, campaign_key, BRANCH_NAMES, BR_ENSEMBLE, CT_SESSION,
+                        CT_RESET, CT_STORY, CT_CAMPAIGN, EV_VICTORY, EV_DEFEAT, EV_BOSS_DEFEATED, EV_STORY_COMPLETE,
+                        EV_STORY_LOST)
+
+MAGIC = b"RPSLOG1\0"
+HEADER = struct.Struct("<8sII")            # magic, record size, reserved
+RECORD = struct.Struct("<dIBBBBHHHH")      # see FIELDS
+FIELDS = ("ts", "match", "user", "bot", "branch", "state", "events", "user_score", "computer_score",
+          "detail")
+# control records: ts, match, CONTROL (where a round has its move), CT_* code, a, b, arg
+CONTROL_RECORD = struct.Struct("<dIBBBBQ")
+CONTROL = 0xFF
+STATE_BOSS = 1            # boss was up going into the round
+STATE_STORY = 2           # story mode was on; enemy index (mod 16) in the high nibble
+# detail: for ensemble moves, how many predictors the bot evaluated (0 = not recorded)
+MATCH_END = EV_VICTORY | EV_DEFEAT | EV_BOSS_DEFEATED | EV_STORY_COMPLETE | EV_STORY_LOST
+
+FLUSH_RECORDS = 256       # write after this many buffered rounds ...
+FLUSH_SECONDS = 2.0       # ... or when the oldest buffered round is this old
+SCAN_CHUNK = 1 << 20      # records per reader chunk
+
+DEFAULT_PATH = os.environ.get("RPS_MATCH_LOG", "matches.rpslog")
+
+# numpy is imported by the reader on first use (it would add ~80 ms to every startup);
+# without it the reader falls back to struct
+np = None
+RECORD_DTYPE = None
+
+
+def _load_numpy():
+    global np, RECORD_DTYPE
+    if np is None:
+        try:
+            import numpy
+        except Exception:
+            np = False
+        else:
+            RECORD_DTYPE = numpy.dtype({"names": list(FIELDS),
+                                        "formats": ["<f8", "<u4", "u1", "u1", "u1", "u1", "<u2", "<u2", "<u2", "<u2"],
+                                        "offsets": [0, 8, 12, 13, 14, 15, 16, 18, 20, 22],
+                                        "itemsize": RECORD.size})
+            np = numpy
+    return np
+
+
+def _check_header(data, path):
+    if len(data) < HEADER.size:
+        raise ValueError(f"{path}: not a match log (too short)")
+    magic, size, _ = HEADER.unpack_from(data)
+    if magic != MAGIC or size != RECORD.size:
+        raise ValueError(f"{path}: not a match log (bad header)")
+
+
+class MatchLog:
+    """
+    Writer. play(game, user) plays the round through the engine and records it;
+    record() is for callers that already have the result. attach(game) right
+    after creating the game makes its matches replayable.
+    """
+
+    def __init__(self, path=DEFAULT_PATH):
+        self.path = path
+        self._buf = bytearray()
+        self._pending = 0
+        self._oldest = 0.0
+        self.match_id = 0
+        self.rounds = 0            # rounds recorded by this process
+        self._match_rounds = 0     # rounds recorded in the current match
+        self._file = None
+        try:
+            self._open()
+        except Exception as e:
+            print("Match log error:", e)
+        atexit.register(self.close)
+
+    def _open(self):
+        size = os.path.getsize(self.path) if os.path.exists(self.path) else 0
+        if size:
+            with open(self.path, "rb") as f:
+                head = f.read(HEADER.size)
+                _check_header(head, self.path)
+                n = (size - HEADER.size) // RECORD.size
+                if n:
+                    # carry on numbering after the last match in the file
+                    f.seek(HEADER.size + (n - 1) * RECORD.size)
+                    self.match_id = RECORD.unpack(f.read(RECORD.size))[1] + 1
+                # drop a torn record left by a crash so the file stays aligned
+                if size != HEADER.size + n * RECORD.size:
+                    os.truncate(self.path, HEADER.size + n * RECORD.size)
+        self._file = open(self.path, "ab")
+        if not size:
+            self._file.write(HEADER.pack(MAGIC, RECORD.size, 0))
+            self._file.flush()
+
+    def attach(self, game):
+        """Log the game's seed and setup, then every control call it makes (Game.recorder)."""
+        if self._match_rounds:
+            self.match_id += 1
+            self._match_rounds = 0
+        rules = 1 if isinstance(game, QuickGame) else 0
+        order = game.predictor.order if game.predictor is not None else 0
+        self.note(CT_SESSION, game.seed, rules | order << 4, game.boss_threshold)
+        self.note(CT_CAMPAIGN, campaign_key(game.story_enemies))
+        game.recorder = self.note
+        # the setup the replay cannot know from the constructor defaults
+        game.set_difficulty(game.difficulty)
+        game.set_goal(game.score_goal)
+
+    def note(self, code, arg=0, a=0, b=0):
+        """One CT_* control record. A reset or a new story also starts a new match."""
+        if code in (CT_RESET, CT_STORY) and self._match_rounds:
+            self.match_id += 1
+            self._match_rounds = 0
+        now = time.time()
+        self._append(CONTROL_RECORD.pack(now, self.match_id, CONTROL, code, a, b, arg), now)
+
+    def play(self, game, user, bot=None):
+        """game.play_round(user, bot), recorded. Returns (bot, events) like the engine."""
+        state = STATE_BOSS if game.boss_mode_active else 0
+        if game.story_mode:
+            state |= STATE_STORY | (game.current_enemy_index << 4)
+        us, cs = game.user_score, game.computer_score
+        bot, ev = game.play_round(user, bot)
+        # scores as they stood after the point, before a finished match reset them
+        r = (user - bot) % 3
+        branch = game.branch
+        detail = game.ensemble.evaluated if branch == BR_ENSEMBLE else 0
+        self.record(user, bot, branch, state, ev, us + (r == 1), cs + (r == 2), detail)
+        return bot, ev
+
+    def record(self, user, bot, branch, state, events, user_score, computer_score, detail=0):
+        now = time.time()
+        self._append(RECORD.pack(now, self.match_id, user, bot, branch, state & 0xFF,
+                                 events & 0xFFFF, min(user_score, 0xFFFF), min(computer_score, 0xFFFF),
+                                 min(detail, 0xFFFF)), now)
+        self.rounds += 1
+        self._match_rounds += 1
+        if events & MATCH_END:
+            self.match_id += 1
+            self._match_rounds = 0
+
+    def _append(self, rec, now):
+        self._buf += rec
+        if not self._pending:
+            self._oldest = now
+        self._pending += 1
+        if self._pending >= FLUSH_RECORDS or now - self._oldest >= FLUSH_SECONDS:
+            self.flush()
+
+    def flush(self):
+        if self._file is not None and self._buf:
+            try:
+                self._file.write(self._buf)
+                self._file.flush()
+            except Exception as e:
+                print("Match log error:", e)
+        # without a file (it failed to open) the records are dropped, so the buffer stays bounded
+        self._buf.clear()
+        self._pending = 0
+
+    def close(self):
+        self.flush()
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+
+# --- reading ---
+class _Totals:
+    def __init__(self):
+        self.rounds = 0
+        self.results = [0, 0, 0]                      # tie, user won, bot won
+        self.moves = [0, 0, 0]                        # player's rock/paper/scissor
+        self.bot_moves = [0, 0, 0]
+        self.branch = [[0, 0] for _ in BRANCH_NAMES]  # per branch: rounds, bot won
+        self.matches_won = 0
+        self.matches_lost = 0
+        self.first_ts = None
+        self.last_ts = None
+
+
+def _scan_numpy(mm, n, t):
+    for lo in range(0, n, SCAN_CHUNK):
+        k = min(SCAN_CHUNK, n - lo)
+        a = np.frombuffer(mm, dtype=RECORD_DTYPE, count=k, offset=HEADER.size + lo * RECORD.size)
+        rounds = a["user"] != CONTROL
+        if not rounds.all():
+            a = a[rounds]
+            k = len(a)
+            if not k:
+                continue
+        user = a["user"]
+        res = (user.astype(np.int8) - a["bot"].astype(np.int8)) % 3
+        t.rounds += k
+        for i, c in enumerate(np.bincount(res, minlength=3)[:3]):
+            t.results[i] += int(c)
+        for i, c in enumerate(np.bincount(user, minlength=3)[:3]):
+            t.moves[i] += int(c)
+        for i, c in enumerate(np.bincount(a["bot"], minlength=3)[:3]):
+            t.bot_moves[i] += int(c)
+        nb = len(BRANCH_NAMES)
+        br = np.minimum(a["branch"], nb - 1)
+        tot = np.bincount(br, minlength=nb)
+        won = np.bincount(br[res == 2], minlength=nb)
+        for i in range(nb):
+            t.branch[i][0] += int(tot[i])
+            t.branch[i][1] += int(won[i])
+        ev = a["events"]
+        t.matches_won += int(np.count_nonzero(ev & (EV_VICTORY | EV_BOSS_DEFEATED | EV_STORY_COMPLETE)))
+        t.matches_lost += int(np.count_nonzero(ev & (EV_DEFEAT | EV_STORY_LOST)))
+        if t.first_ts is None:
+            t.first_ts = float(a["ts"][0])
+        t.last_ts = float(a["ts"][-1])
+        del a    # release the view before the map closes
+
+
+def _scan_struct(mm, n, t):
+    won_ev = EV_VICTORY | EV_BOSS_DEFEATED | EV_STORY_COMPLETE
+    lost_ev = EV_DEFEAT | EV_STORY_LOST
+    nb = len(BRANCH_NAMES)
+    view = memoryview(mm)
+    try:
+        for lo in range(0, n, SCAN_CHUNK):
+            k = min(SCAN_CHUNK, n - lo)
+            start = HEADER.size + lo * RECORD.size
+            for ts, _, user, bot, branch, _, ev, _, _, _ in RECORD.iter_unpack(view[start:start + k * RECORD.size]):
+                if user == CONTROL:
+                    continue
+                t.rounds += 1
+                r = (user - bot) % 3
+                t.results[r] += 1
+                t.moves[user] += 1
+                t.bot_moves[bot] += 1
+                b = t.branch[min(branch, nb - 1)]
+                b[0] += 1
+                if r == 2:
+                    b[1] += 1
+                if ev & won_ev:
+                    t.matches_won += 1
+                elif ev & lost_ev:
+                    t.matches_lost += 1
+                if t.first_ts is None:
+                    t.first_ts = ts
+                t.last_ts = ts
+    finally:
+        view.release()
+
+
+def scan(path=DEFAULT_PATH, use_numpy=True):
+    """
+    Totals over the whole log: round results, move distributions, bot hit rate
+    per branch and finished matches. Returns a dict.
+    """
+    t = _Totals()
+    with open(path, "rb") as f:
+        size = os.fstat(f.fileno()).st_size
+        _check_header(f.read(HEADER.size), path)
+        n = (size - HEADER.size) // RECORD.size
+        if n:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                if use_numpy and _load_numpy():
+                    _scan_numpy(mm, n, t)
+                else:
+                    _scan_struct(mm, n, t)
+    played = t.results[1] + t.results[2]
+    finished = t.matches_won + t.matches_lost
+    return {
+        "rounds": t.rounds,
+        "ties": t.results[0], "user_rounds": t.results[1], "bot_rounds": t.results[2],
+        "round_win_rate": t.results[1] / played if played else 0.0,
+        "matches": finished, "matches_won": t.matches_won,
+        "match_win_rate": t.matches_won / finished if finished else 0.0,
+        "moves": dict(zip(options, t.moves)),
+        "bot_moves": dict(zip(options, t.bot_moves)),
+        "branches": {name: {"rounds": r, "bot_win_rate": w / r if r else 0.0}
+                     for name, (r, w) in zip(BRANCH_NAMES, t.branch) if r},
+        "span_seconds": (t.last_ts - t.first_ts) if t.rounds else 0.0,
+    }
+
+
+def summary_text(s):
+    if not s["rounds"]:
+        return "Match log is empty."
+    moves = ", ".join(f"{k} {v / s['rounds']:.0%}" for k, v in s["moves"].items())
+    lines = [f"{s['rounds']} rounds, {s['matches']} matches "
+             f"(won {s['match_win_rate']:.0%}), rounds won {s['round_win_rate']:.0%} of decided",
+             f"your moves: {moves}"]
+    for name, b in s["branches"].items():
+        lines.append(f"bot {name}: {b['rounds']} rounds, bot won {b['bot_win_rate']:.0%}")
+    return "\n".join(lines)
+
+
+if __name__ == "__main__":
+    path = sys.argv[1] if len(sys.argv) > 1 else DEFAULT_PATH
+    t0 = time.perf_counter()
+    s = scan(path)
+    dt = time.perf_counter() - t0
+    print(summary_text(s))
+    print(f"scanned in {dt:.2f}s ({s['rounds'] / dt if dt else 0:,.0f} rounds/s)")
@@ -0,0 +1,116 @@
+# rps_predict.py
+"""
+Incremental n-gram (Markov) predictor of the player's next move.
+For every context of the last 1..k moves it counts what the player did
+next, in one flat fixed-size list, and keeps each context's clear
+favourite beside it. update() counts the move in at most k contexts and
+works out the next guess in the same call, so predict() is one attribute
+read. The guess for a full history is cached until some favourite
+changes, which after the first few hundred moves is rare. Memory never
+grows however long the session runs.
+"""
+
+import sys
+
+COUNT_LIMIT = 60000     # a full cell halves its context (old habits fade)
+NONE = 3                # favourite of a context without one
+
+
+class NGramPredictor:
+    __slots__ = ("order", "counts", "favourite", "offsets", "mods", "history", "seen", "bases", "guess",
+                 "_full_bases", "_guesses")
+
+    def __init__(self, order=4):
+        self.order = order
+        self.mods = [3 ** o for o in range(order + 1)]
+        self.offsets = [0] * (order + 1)
+        size = 0
+        for o in range(1, order + 1):
+            self.offsets[o] = size
+            size += self.mods[o] * 3      # 3^o contexts x 3 next moves
+        self.counts = [0] * size
+        # once `order` moves are known the context cells depend on the history alone
+        self._full_bases = [self._bases_for(h, order) for h in range(self.mods[order])]
+        self.reset()
+
+    def _bases_for(self, h, seen):
+        return tuple(self.offsets[o] + (h % self.mods[o]) * 3 for o in range(seen, 0, -1))
+
+    def reset(self):
+        self.counts = [0] * len(self.counts)
+        self.favourite = [NONE] * len(self.counts)   # at each context's first cell: the move that
+                                                     # followed it more than half the time (and twice)
+        self.history = 0                  # last `order` moves as base-3 digits, newest lowest
+        self.seen = 0                     # moves seen so far, capped at order
+        self.bases = ()                   # count cells of the current contexts, longest first
+        self.guess = -1                   # what predict() returns
+        self._guesses = [None] * self.mods[self.order]  # guess per full history, while no favourite changes
+
+    def update(self, move):
+        """
+        Count `move` as the follow-up of every current context, shift it into
+        the history, and work out the guess for the move after it.
+        """
+        c = self.counts
+        fav = self.favourite
+        changed = False
+        for base in self.bases:
+            i = base + move
+            n = c[i] = c[i] + 1
+            f = fav[base]
+            if n >= COUNT_LIMIT:
+                c[base] >>= 1
+                c[base + 1] >>= 1
+                c[base + 2] >>= 1
+            elif f == move:
+                continue                  # the favourite only got stronger
+            else:
+                t = c[base] + c[base + 1] + c[base + 2]
+                if f == NONE:
+                    if 2 * n <= t or n < 2:
+                        continue          # still no favourite
+                elif 2 * c[base + f] > t:
+                    continue              # the favourite held
+            r, p, s = c[base], c[base + 1], c[base + 2]
+            t = r + p + s
+            if 2 * r > t and r > 1:
+                g = 0
+            elif 2 * p > t and p > 1:
+                g = 1
+            elif 2 * s > t and s > 1:
+                g = 2
+            else:
+                g = NONE
+            if g != f:
+                fav[base] = g
+                changed = True
+        h = self.history = (self.history * 3 + move) % self.mods[self.order]
+        if self.seen == self.order:
+            self.bases = self._full_bases[h]
+            if changed:
+                self._guesses = [None] * len(self._guesses)
+            g = self._guesses[h]
+            if g is None:
+                g = self._guesses[h] = self._first_favourite()
+            self.guess = g
+        else:
+            self.seen += 1
+            self.bases = self._bases_for(h, self.seen)
+            self.guess = self._first_favourite()
+
+    def _first_favourite(self):
+        fav = self.favourite
+        for base in self.bases:
+            if fav[base] != NONE:
+                return fav[base]
+        return -1
+
+    def predict(self):
+        """
+        Most likely next move from the longest context that has a clear
+        favourite (more than half of what followed it), or -1.
+        """
+        return self.guess
+
+    def nbytes(self):
+        return sys.getsizeof(self.counts) + sys.getsizeof(self.favourite)
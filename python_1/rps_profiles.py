@@ -0,0 +1,164 @@
+# rps_profiles.py
+"""
+Per-player move profiles, kept across matches and sessions.
+Lifetime rock/paper/scissor counts per character live in a small SQLite
+database in WAL mode. The Tk thread never touches the database: record()
+only updates an in-memory copy and queues the move; a writer thread groups
+queued moves into one transaction every BATCH_SECONDS. prior() is a dict
+lookup, so warm-starting a match costs microseconds.
+"""
+
+import atexit
+import os
+import queue
+import sqlite3
+import threading
+import time
+
+DEFAULT_PATH = os.environ.get("RPS_PROFILE_DB", "profiles.sqlite3")
+BATCH_SECONDS = 1.0     # the writer waits this long to group moves into one transaction
+PRIOR_MOVES = 6         # a stored profile counts as this many moves of the new match
+
+_STOP = object()
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS profiles (
+    player  TEXT PRIMARY KEY,
+    rock    INTEGER NOT NULL DEFAULT 0,
+    paper   INTEGER NOT NULL DEFAULT 0,
+    scissor INTEGER NOT NULL DEFAULT 0,
+    updated REAL NOT NULL DEFAULT 0
+)
+"""
+
+UPSERT = """
+INSERT INTO profiles (player, rock, paper, scissor, updated) VALUES (?, ?, ?, ?, ?)
+ON CONFLICT(player) DO UPDATE SET
+    rock = rock + excluded.rock,
+    paper = paper + excluded.paper,
+    scissor = scissor + excluded.scissor,
+    updated = excluded.updated
+"""
+
+
+class ProfileStore:
+    def __init__(self, path=DEFAULT_PATH, batch_seconds=BATCH_SECONDS):
+        self.path = path
+        self.batch_seconds = batch_seconds
+        self._cache = {}                 # player -> [rock, paper, scissor], includes unwritten moves
+        self._lock = threading.Lock()
+        self._queue = queue.Queue()
+        self._thread = None
+        self._on_loaded = None
+        self.loaded = threading.Event()  # set once the stored profiles are in the cache
+        self.transactions = 0            # batches committed
+        self.written = 0                 # moves committed
+        atexit.register(self.close)
+
+    def start(self, on_loaded=None):
+        """
+        Open the database and load the profiles on the writer thread.
+        on_loaded() is called from that thread once prior() knows the stored profiles.
+        """
+        if self._thread is None:
+            self._on_loaded = on_loaded
+            self._thread = threading.Thread(target=self._run, daemon=True)
+            self._thread.start()
+        return self
+
+    # --- Tk thread ---
+    def record(self, player, move):
+        with self._lock:
+            c = self._cache.get(player)
+            if c is None:
+                c = self._cache[player] = [0, 0, 0]
+            c[move] += 1
+        self._queue.put((player, move))
+
+    def counts(self, player):
+        with self._lock:
+            c = self._cache.get(player)
+            return tuple(c) if c is not None else None
+
+    def prior(self, player, moves=PRIOR_MOVES):
+        """The player's lifetime distribution scaled down to `moves` counts, or None if unknown."""
+        c = self.counts(player)
+        if not c:
+            return None
+        total = c[0] + c[1] + c[2]
+        if not total:
+            return None
+        scale = min(1.0, moves / total)
+        return [int(round(x * scale)) for x in c]
+
+    # --- writer thread ---
+    def _connect(self):
+        db = sqlite3.connect(self.path)
+        db.execute("PRAGMA journal_mode=WAL")
+        db.execute("PRAGMA synchronous=NORMAL")
+        db.execute(SCHEMA)
+        db.commit()
+        return db
+
+    def _run(self):
+        try:
+            db = self._connect()
+            rows = db.execute("SELECT player, rock, paper, scissor FROM profiles").fetchall()
+        except Exception as e:
+            print("Profile store error:", e)
+            self.loaded.set()
+            self._drain_forever()
+            return
+        with self._lock:
+            # moves recorded before the load finished are added on top
+            for player, r, p, s in rows:
+                c = self._cache.get(player, (0, 0, 0))
+                self._cache[player] = [r + c[0], p + c[1], s + c[2]]
+        self.loaded.set()
+        if self._on_loaded is not None:
+            self._on_loaded()
+
+        stop = False
+        while not stop:
+            item = self._queue.get()
+            batch = {}
+            deadline = time.monotonic() + self.batch_seconds
+            while True:
+                if item is _STOP:
+                    stop = True
+                    break
+                player, move = item
+                d = batch.get(player)
+                if d is None:
+                    d = batch[player] = [0, 0, 0]
+                d[move] += 1
+                left = deadline - time.monotonic()
+                try:
+                    item = self._queue.get(timeout=left) if left > 0 else self._queue.get_nowait()
+                except queue.Empty:
+                    break
+            if batch:
+                self._write(db, batch)
+        db.close()
+
+    def _write(self, db, batch):
+        now = time.time()
+        try:
+            with db:
+                db.executemany(UPSERT, [(p, d[0], d[1], d[2], now) for p, d in batch.items()])
+            self.transactions += 1
+            self.written += sum(sum(d) for d in batch.values())
+        except Exception as e:
+            print("Profile store error:", e)
+
+    def _drain_forever(self):
+        # no database: keep the in-memory profiles working and discard the queue
+        while self._queue.get() is not _STOP:
+            pass
+
+    def close(self, timeout=2.0):
+        """Write what is still queued and stop the writer."""
+        if self._thread is not None and self._thread.is_alive():
+            self._queue.put(_STOP)
+            self._thread.join(timeout)
+        self._thread = None
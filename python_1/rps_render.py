@@ -0,0 +1,98 @@
+# rps_render.py
+"""
+Coalesced UI refresh for the Tk front-ends.
+Instead of configuring widgets one by one while a round is resolved, the
+round records what it wants (ui.config / ui.set) and everything is applied
+in a single after_idle flush. A widget option set twice in one round is
+only applied once, and options that already have that value are skipped.
+"""
+
+import contextlib
+
+
+class Renderer:
+    def __init__(self, root):
+        self.root = root
+        self._pending = {}       # widget -> {option: value}, last write wins
+        self._vars = {}          # StringVar -> value
+        self._applied = {}       # (widget, option) -> value last pushed to Tk
+        self._scheduled = False
+        self._held = 0           # > 0 inside hold(): nothing is flushed
+        # redraw accounting
+        self.rounds = 0
+        self.flushes = 0
+        self.updates = 0         # widget.config / var.set calls actually made
+        self.round_flushes = 0   # ... during the current (or last) round
+        self.round_updates = 0
+
+    # --- recording ---
+    def config(self, widget, **options):
+        self._pending.setdefault(widget, {}).update(options)
+        self._schedule()
+
+    def set(self, var, value):
+        self._vars[var] = value
+        self._schedule()
+
+    def begin_round(self):
+        self.rounds += 1
+        self.round_flushes = 0
+        self.round_updates = 0
+
+    @contextlib.contextmanager
+    def hold(self):
+        """Record updates but flush nothing until the block ends (e.g. a console batch)."""
+        self._held += 1
+        try:
+            yield self
+        finally:
+            self._held -= 1
+            if not self._held and (self._pending or self._vars):
+                self._schedule()
+
+    def _schedule(self):
+        if not self._scheduled:
+            self._scheduled = True
+            self.root.after_idle(self.flush)
+
+    # --- applying ---
+    def flush(self):
+        """Apply everything recorded since the last flush (normally called from after_idle)."""
+        self._scheduled = False
+        if self._held:
+            return      # hold() schedules a flush when it ends
+        pending, self._pending = self._pending, {}
+        vars_, self._vars = self._vars, {}
+        applied = self._applied
+        n = 0
+        for widget, options in pending.items():
+            changed = {k: v for k, v in options.items() if applied.get((widget, k), self) != v}
+            if changed:
+                try:
+                    widget.config(**changed)
+                except Exception as e:   # widget destroyed meanwhile
+                    print("Render error:", e)
+                    continue
+                for k, v in changed.items():
+                    applied[(widget, k)] = v
+                n += 1
+        for var, value in vars_.items():
+            if applied.get((var, None), self) != value:
+                var.set(value)
+                applied[(var, None)] = value
+                n += 1
+        if n:
+            self.flushes += 1
+            self.round_flushes += 1
+            self.updates += n
+            self.round_updates += n
+
+    def forget(self, widget):
+        """Drop cached values for a widget that was changed directly (or destroyed)."""
+        for key in [k for k in self._applied if k[0] is widget]:
+            del self._applied[key]
+
+    def stats(self):
+        per_round = self.updates / self.rounds if self.rounds else 0.0
+        return (f"rounds {self.rounds}, flushes {self.flushes}, widget updates {self.updates} "
+                f"({per_round:.1f}/round); last round: {self.round_flushes} flush, {self.round_updates} updates")
@@ -0,0 +1,370 @@
+# rps_replay.py
+"""
+Exact replay of logged matches.
+The match log (rps_matchlog) holds each game's seed and setup, every call
+that changed the game and every round. Replaying rebuilds the Game from
+that, feeds it the logged player moves and checks each bot move, branch,
+event and score against the log, at full engine speed (no UI, sounds or
+waits). The bot keeps learning from match to match, so a match is replayed
+from the start of its session. Story matches need the campaign they were
+played with (by default the one the game would load, see rps_campaign).
+
+    python rps_replay.py matches.rpslog          check every session in the log
+    python rps_replay.py matches.rpslog 42       rebuild match 42
+    replay 42                                    (cheat console; default: the last match)
+    python rps_replay.py --selftest              play seeded sessions, replay them, exit 1 on a difference
+"""
+
+import mmap
+import os
+import random
+import sys
+import tempfile
+import time
+from contextlib import closing
+
+from rps_engine import (Game, GameState, QuickGame, campaign_key, simulate, story_enemies, DIFFICULTIES, BR_GIVEN,
+                        BR_ENSEMBLE,
+                        CT_SESSION, CT_DIFFICULTY, CT_RESET, CT_STORY, CT_BOSS, CT_PUMPKIN, CT_EASTER,
+                        CT_WARM, CT_GOAL, CT_CAMPAIGN, CT_COUNTS, CT_RESTORE, CT_WIDE, EV_VICTORY, EV_BOSS_DEFEATED,
+                        EV_STORY_COMPLETE, EV_DEFEAT, EV_STORY_LOST)
+from rps_matchlog import (DEFAULT_PATH, HEADER, RECORD, CONTROL_RECORD, CONTROL, STATE_BOSS,
+                          STATE_STORY, MatchLog, _check_header)
+from rps_predict import NGramPredictor
+
+_WARM_MASK = (1 << 21) - 1
+SELFTEST_ROUNDS = 1000      # rounds per --selftest session
+
+# CT_* code -> how to redo it on the rebuilt game
+_APPLY = {
+    CT_DIFFICULTY: lambda g, arg: g.set_difficulty(DIFFICULTIES[arg] if arg < len(DIFFICULTIES) else "Hard"),
+    CT_RESET: lambda g, arg: g.reset_stats(),
+    CT_STORY: lambda g, arg: g.start_story(),
+    CT_BOSS: lambda g, arg: g.force_boss(),
+    CT_PUMPKIN: lambda g, arg: g.pumpkin_power(),
+    CT_EASTER: lambda g, arg: g.easter_egg(),
+    CT_WARM: lambda g, arg: g.warm_start((arg & _WARM_MASK, arg >> 21 & _WARM_MASK, arg >> 42 & _WARM_MASK)),
+    CT_GOAL: lambda g, arg: g.set_goal(arg),
+}
+
+
+class ReplayError(Exception):
+    """The log cannot be replayed: no such match, or it was logged without a seed."""
+
+
+def _records(mm, first, n):
+    """(index, record) from record `first` on; control records come unpacked with CONTROL_RECORD."""
+    view = memoryview(mm)[HEADER.size + first * RECORD.size:HEADER.size + n * RECORD.size]
+    try:
+        for i, rec in enumerate(RECORD.iter_unpack(view), first):
+            if rec[2] == CONTROL:
+                rec = CONTROL_RECORD.unpack_from(mm, HEADER.size + i * RECORD.size)
+            yield i, rec
+    finally:
+        view.release()
+
+
+def _new_game(a, b, seed, enemies):
+    order = a >> 4
+    predictor = NGramPredictor(order) if order else None
+    if a & 15:
+        return QuickGame(boss_threshold=b, predictor=predictor, seed=seed)
+    return Game(boss_threshold=b, predictor=predictor, seed=seed, enemies=enemies)
+
+
+def _replay_session(mm, n, start, until=None, enemies=None):
+    """
+    Replay the session whose CT_SESSION record is at `start`, up to the end of
+    match `until` (default: the whole session). Stops at the first mismatch.
+    """
+    r = {"seed": None, "rounds": 0, "matches": {}, "mismatch": None}
+    game = None
+    counts = 0          # CT_COUNTS comes right before its CT_RESTORE
+    wide = {}           # CT_WIDE fields of that CT_RESTORE, if any
+    t0 = time.perf_counter()
+    with closing(_records(mm, start, n)) as recs:
+        for i, rec in recs:
+            match = rec[1]
+            if until is not None and match > until:
+                break
+            if rec[2] == CONTROL:
+                _, _, _, code, a, b, arg = rec
+                if code == CT_SESSION:
+                    if game is not None:
+                        break               # the next session
+                    game = _new_game(a, b, arg, enemies or story_enemies)
+                    r["seed"] = arg
+                elif code == CT_COUNTS:
+                    counts = arg
+                elif code == CT_WIDE:
+                    wide[arg >> 60] = arg & (1 << 60) - 1
+                elif code == CT_RESTORE:
+                    game.restore(GameState.unpack(arg, counts).widen(wide))
+                    wide = {}
+                elif code == CT_CAMPAIGN:
+                    if arg != campaign_key(game.story_enemies):
+                        r["mismatch"] = f"record {i}: the session was played with a different story campaign"
+                        break
+                else:
+                    _APPLY[code](game, arg)
+                continue
+            _, _, user, bot, branch, state, events, us, cs, detail = rec
+            st = STATE_BOSS if game.boss_mode_active else 0
+            if game.story_mode:
+                st |= STATE_STORY | (game.current_enemy_index << 4)
+            if branch == BR_ENSEMBLE and game.ensemble is not None:
+                game.ensemble.limit = detail or None
+            pu, pc = game.user_score, game.computer_score
+            got_bot, ev = game.play_round(user, bot if branch == BR_GIVEN else None)
+            res = (user - got_bot) % 3
+            # scores are logged clamped to 16 bits (MatchLog.record)
+            got = (got_bot, game.branch, st & 0xFF, ev & 0xFFFF, min(pu + (res == 1), 0xFFFF),
+                   min(pc + (res == 2), 0xFFFF))
+            r["rounds"] += 1
+            r["matches"][match] = (us, cs, events)
+            if got != (bot, branch, state, events, us, cs):
+                names = ("bot", "branch", "state", "events", "user_score", "computer_score")
+                diff = [f"{k} {w} vs {g}" for k, w, g in zip(names, (bot, branch, state, events, us, cs), got)
+                        if w != g]
+                r["mismatch"] = f"record {i} (match {match}): logged vs replayed {', '.join(diff)}"
+                break
+    r["seconds"] = time.perf_counter() - t0
+    return r
+
+
+def _outcome(events):
+    if events & (EV_VICTORY | EV_BOSS_DEFEATED | EV_STORY_COMPLETE):
+        return "won"
+    if events & (EV_DEFEAT | EV_STORY_LOST):
+        return "lost"
+    return "unfinished"
+
+
+def _open(path):
+    f = open(path, "rb")
+    _check_header(f.read(HEADER.size), path)
+    return f
+
+
+def replay(path=DEFAULT_PATH, match=None, enemies=None):
+    """
+    Rebuild one match (default: the last one with rounds) and check it
+    against the log. `enemies` is the story campaign (default: built-in).
+    Returns a dict; "ok" is False at the first difference.
+    """
+    with _open(path) as f:
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            n = (len(mm) - HEADER.size) // RECORD.size
+            if match is None:
+                for i in range(n - 1, -1, -1):
+                    rec = RECORD.unpack_from(mm, HEADER.size + i * RECORD.size)
+                    if rec[2] != CONTROL:
+                        match = rec[1]
+                        break
+                else:
+                    raise ReplayError("the log has no rounds")
+            start = found = None
+            with closing(_records(mm, 0, n)) as recs:
+                for i, rec in recs:
+                    if rec[2] == CONTROL and rec[3] == CT_SESSION:
+                        start = i
+                    if rec[1] == match:
+                        found = i
+                        break
+            if found is None:
+                raise ReplayError(f"no match {match} in {path}")
+            if start is None:
+                raise ReplayError(f"match {match} was logged before seeds were recorded")
+            r = _replay_session(mm, n, start, until=match, enemies=enemies)
+    if match not in r["matches"]:
+        raise ReplayError(r["mismatch"] or f"match {match} has no rounds")
+    us, cs, events = r["matches"][match]
+    return {"match": match, "seed": r["seed"], "ok": r["mismatch"] is None, "mismatch": r["mismatch"],
+            "user_score": us, "computer_score": cs, "result": _outcome(events),
+            "rounds": r["rounds"], "seconds": r["seconds"]}
+
+
+def verify(path=DEFAULT_PATH, enemies=None):
+    """Replay every session in the log. Returns one dict per session."""
+    out = []
+    with _open(path) as f:
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            n = (len(mm) - HEADER.size) // RECORD.size
+            with closing(_records(mm, 0, n)) as recs:
+                starts = [i for i, rec in recs if rec[2] == CONTROL and rec[3] == CT_SESSION]
+            for start in starts:
+                r = _replay_session(mm, n, start, enemies=enemies)
+                out.append({"seed": r["seed"], "ok": r["mismatch"] is None, "mismatch": r["mismatch"],
+                            "matches": len(r["matches"]), "rounds": r["rounds"], "seconds": r["seconds"]})
+    return out
+
+
+def _rate(r):
+    return f"{r['rounds'] / r['seconds']:,.0f} rounds/s" if r["seconds"] > 0 else "instant"
+
+
+def replay_text(r):
+    head = (f"Match {r['match']} (seed {r['seed']}): {r['result']}, "
+            f"you {r['user_score']} - bot {r['computer_score']}")
+    check = "replayed exactly" if r["ok"] else f"DIVERGED at {r['mismatch']}"
+    return f"{head}\n{check} — {r['rounds']} session rounds, {_rate(r)}"
+
+
+# --- self-check ---
+# (name, game) for --selftest: both rule sets, every bot brain, story mode with the ensemble boss
+_SELFTEST_GAMES = (
+    ("demo Easy", lambda seed: Game(difficulty="Easy", seed=seed)),
+    ("demo Hard + n-gram", lambda seed: Game(difficulty="Hard", predictor=NGramPredictor(), seed=seed)),
+    ("demo Ensemble", lambda seed: Game(difficulty="Ensemble", predictor=NGramPredictor(), seed=seed)),
+    ("demo story + n-gram", lambda seed: Game(predictor=NGramPredictor(), seed=seed)),
+    ("quick Hard + n-gram", lambda seed: QuickGame(difficulty="Hard", predictor=NGramPredictor(), seed=seed)),
+)
+
+
+def _play_selftest_session(log, name, game, rounds):
+    """
+    Play `rounds` seeded rounds with the cheats, boss, story restarts and undos
+    the front-ends use. Returns the snapshot taken before each round.
+    """
+    log.attach(game)
+    if "story" in name:
+        game.start_story()
+    else:
+        game.set_goal(5)
+        game.warm_start((3, 1, 2))
+    moves = game.stream("selftest").random
+    undo = []
+    states = []
+    for i in range(rounds):
+        if i % 59 == 3:
+            game.easter_egg()
+        if i % 97 == 5:
+            game.pumpkin_power()
+        if i % 131 == 7:
+            game.force_boss()
+        if undo and i % 41 == 11:
+            game.restore(undo.pop())
+        undo.append(game.snapshot())
+        states.append(undo[-1])
+        _, ev = log.play(game, int(moves() * 3))
+        if ev & EV_STORY_LOST:
+            game.start_story()
+    return states
+
+
+def _play_wide_session(log, game, rounds):
+    """A session that restores a state too large for GameState.pack() (CT_WIDE), plays on, then undoes into it."""
+    log.attach(game)
+    # clamped, the goal would end the match at once and the counts would tie: every field shows in play
+    wide = GameState("Hard", 100000, 70000, 65000, False, False, False, ((1 << 21) + 100, 5, 1 << 22), False, 0)
+    game.restore(wide)
+    moves = game.stream("selftest").random
+    for _ in range(rounds):
+        log.play(game, int(moves() * 3))
+    game.restore(wide)
+    for _ in range(rounds):
+        log.play(game, int(moves() * 3))
+    return wide
+
+
+def _unhurried(game):
+    """No time budget for the game's ensemble bots (built now if a story enemy needs one): same decisions every run."""
+    for i in range(len(game.story_enemies)):
+        game.prepare_enemy(i)
+    for bot in (game.ensemble, game._spare_ensemble):
+        if bot is not None:
+            bot.budget = float("inf")
+
+
+def selftest(rounds=SELFTEST_ROUNDS):
+    """
+    Log seeded sessions of every kind to a scratch file and replay them: each
+    bot move, branch, event and score must come back the same. Returns a list
+    of (check, problem or None).
+    """
+    checks = []
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "selftest.rpslog")
+        log = MatchLog(path)
+        states = []
+        for k, (name, make) in enumerate(_SELFTEST_GAMES):
+            states += _play_selftest_session(log, name, make(1000 + k), rounds)
+        wide = _play_wide_session(log, Game(predictor=NGramPredictor(), seed=999), rounds // 10)
+        log.close()
+        sessions = verify(path, story_enemies)
+        names = [name for name, _ in _SELFTEST_GAMES] + ["state too large to pack"]
+        for name, s in zip(names, sessions):
+            problem = s["mismatch"]
+            expected = rounds if name in dict(_SELFTEST_GAMES) else rounds // 10 * 2
+            if problem is None and s["rounds"] != expected:
+                problem = f"replayed {s['rounds']} of {expected} rounds"
+            checks.append((f"replay {name}", problem))
+        if len(sessions) != len(names):
+            checks.append(("replay sessions", f"{len(sessions)} in the log, {len(names)} played"))
+        # snapshots: pack() and unpack() round-trip; a state too large for pack() round-trips through CT_WIDE
+        bad = next((st for st in states if GameState.unpack(*st.pack()) != st), None)
+        checks.append((f"pack {len(states)} snapshots", None if bad is None else f"{bad} changed"))
+        try:
+            wide.pack()
+            problem = "pack() took a state too large for it"
+        except ValueError:
+            back = GameState.unpack(*wide.pack(clamp=True)).widen(dict(wide.overflow()))
+            problem = None if back == wide else f"{wide} came back as {back}"
+        checks.append(("pack state too large", problem))
+        # save files: what resume() reads is what save_game() wrote
+        from rps_save import SaveError, load_save, save_game
+        save = os.path.join(tmp, "selftest.rpssave")
+        game = Game(predictor=NGramPredictor(), seed=7)
+        problem = None
+        for st in states[::97]:
+            game.restore(st)
+            save_game(game, save)
+            if load_save(game, save) != st:
+                problem = f"{st} came back as {load_save(game, save)}"
+                break
+        checks.append(("save and resume", problem))
+        game.restore(wide)
+        try:
+            save_game(game, save)
+            problem = "saved a state too large for the file"
+        except SaveError:
+            problem = None
+        checks.append(("save state too large", problem))
+    # simulate() plays most games in its own inlined loop: it must match play_round() move for move
+    for k, (name, make) in enumerate(_SELFTEST_GAMES):
+        fast, slow = make(2000 + k), make(2000 + k)
+        for g in (fast, slow):
+            _unhurried(g)
+            if "story" in name:
+                g.start_story()
+        draw = slow.stream("simulate").random      # the stream simulate() gives itself, as a player
+        a = simulate(fast, rounds * 5)
+        b = simulate(slow, rounds * 5, player=lambda: int(draw() * 3))
+        same = a == b and fast.snapshot() == slow.snapshot() and fast.branch == slow.branch
+        checks.append((f"simulate {name}", None if same else f"{a} vs play_round() {b}"))
+    return checks
+
+
+if __name__ == "__main__":
+    if sys.argv[1:] == ["--selftest"]:
+        results = selftest()
+        for check, problem in results:
+            print(f"{check:<32} {'ok' if problem is None else 'FAILED: ' + problem}")
+        sys.exit(1 if any(problem is not None for _, problem in results) else 0)
+    from rps_campaign import CampaignError, load_campaign
+    path = sys.argv[1] if len(sys.argv) > 1 else DEFAULT_PATH
+    try:
+        enemies = load_campaign().enemies
+        if len(sys.argv) > 2:
+            print(replay_text(replay(path, int(sys.argv[2]), enemies)))
+        else:
+            sessions = verify(path, enemies)
+            for s in sessions:
+                state = "exact" if s["ok"] else f"DIVERGED at {s['mismatch']}"
+                print(f"seed {s['seed']}: {s['matches']} matches, {s['rounds']} rounds, {_rate(s)} — {state}")
+            if not sessions:
+                print("No replayable sessions (the log predates seed recording).")
+            sys.exit(0 if all(s["ok"] for s in sessions) else 1)
+    except (ReplayError, CampaignError) as e:
+        print("Replay error:", e)
+        sys.exit(2)
@@ -0,0 +1,80 @@
+# rps_save.py
+"""
+Save and resume a game in a small binary file.
+A save is the packed GameState (scores, cheats used, boss and story
+progress, move counts, difficulty, goal) plus the rules and the story
+campaign it was played with: 33 bytes. Resuming restores that state into
+the running game, so story progress carries over between sessions. The
+bot starts the new session with a fresh brain, as it does after a restart.
+The front-ends also keep a GameState from before each of the last
+UNDO_DEPTH rounds for undo.
+
+    save [path]      resume [path]      undo [rounds]      (cheat console)
+    RPS_SAVE=story.rpssave python demo.py
+"""
+
+import os
+import struct
+
+from rps_engine import GameState, QuickGame, campaign_key
+
+MAGIC = b"RPSSAVE1"
+SAVE = struct.Struct("<8sBQQQ")     # magic, rules (1 = quick), campaign key, state word, move counts
+DEFAULT_PATH = os.environ.get("RPS_SAVE", "game.rpssave")
+UNDO_DEPTH = 50                     # rounds the front-ends can take back
+
+
+class SaveError(ValueError):
+    """The save file is missing or damaged, or was written for other rules or another campaign."""
+
+
+def save_game(game, path=DEFAULT_PATH):
+    """Write the game's current state to `path`. Returns the file size."""
+    try:
+        word, counts = game.snapshot().pack()
+    except ValueError as e:
+        raise SaveError(f"cannot save: {e}")
+    data = SAVE.pack(MAGIC, isinstance(game, QuickGame), campaign_key(game.story_enemies), word, counts)
+    tmp = path + ".tmp"
+    try:
+        with open(tmp, "wb") as f:
+            f.write(data)
+        os.replace(tmp, path)       # a crash mid-write never leaves half a save
+    except OSError as e:
+        raise SaveError(f"{path}: {e.strerror}")
+    return len(data)
+
+
+def load_save(game, path=DEFAULT_PATH):
+    """The GameState saved in `path`, checked against `game` (same rules and campaign)."""
+    try:
+        with open(path, "rb") as f:
+            data = f.read(SAVE.size + 1)
+    except OSError as e:
+        raise SaveError(f"{path}: {e.strerror}")
+    if len(data) != SAVE.size or not data.startswith(MAGIC):
+        raise SaveError(f"{path}: not a save file")
+    _, quick, key, word, counts = SAVE.unpack(data)
+    if quick != isinstance(game, QuickGame):
+        raise SaveError(f"{path}: saved with the {'Rock_Paper_Scissor.py' if quick else 'demo.py'} rules")
+    if key != campaign_key(game.story_enemies):
+        raise SaveError(f"{path}: saved with a different story campaign")
+    return GameState.unpack(word, counts)
+
+
+def resume(game, path=DEFAULT_PATH):
+    """Load `path` and put the game in that state. Returns the GameState."""
+    state = load_save(game, path)
+    game.restore(state)
+    return state
+
+
+def describe(game):
+    """One line on where the game stands, for the console."""
+    score = f"you {game.user_score} - bot {game.computer_score}"
+    if game.story_mode:
+        enemy = game.current_enemy
+        return (f"story enemy {game.current_enemy_index + 1}/{len(game.story_enemies)} {enemy['name']} "
+                f"(first to {game.enemy_target}), {score}")
+    boss = ", boss battle" if game.boss_mode_active else ""
+    return f"{game.difficulty}, first to {game.score_goal}{boss}, {score}"
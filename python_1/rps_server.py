@@ -0,0 +1,154 @@
+# rps_server.py
+"""
+Multi-match game server.
+Every TCP connection gets its own rps_engine Game (same rules and bot brains
+as the Tk games), so thousands of matches run side by side on one asyncio
+loop. The protocol is one text line per request and per reply:
+
+    -> play rock            <- round paper 4 0 1      (bot move, events, your score, bot score)
+    -> difficulty Hard      <- ok Hard
+    -> story                <- ok story
+    -> reset                <- ok reset
+    -> quit                 (connection closed)
+    anything else           <- error <reason>
+    a line over MAX_LINE    <- error request line too long   (connection closed)
+
+Events are the EV_* bit flags from rps_engine. A lost story restarts the
+story on the next round, like the cutscene does in demo.py.
+
+    python rps_server.py --port 8765 --rules quick
+"""
+
+import argparse
+import asyncio
+
+from rps_engine import Game, QuickGame, options, MOVE_INDEX, EV_STORY_LOST
+from rps_predict import NGramPredictor
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+DIFFICULTIES = ("Easy", "Medium", "Hard", "Ensemble")
+GREETING = b"hello rps 1\n"
+MAX_LINE = 1024             # bytes per request line (the stream limit)
+ENSEMBLE_BUDGET = 0.0002    # seconds per Ensemble decision: one player's round never holds up the loop for long
+
+
+def new_game(rules="demo"):
+    if rules == "quick":
+        return QuickGame(score_goal=4, difficulty="Easy", predictor=NGramPredictor())
+    return Game(score_goal=3, difficulty="Easy", boss_threshold=3, predictor=NGramPredictor())
+
+
+def handle_line(game, line):
+    """One request line -> reply line (str), or None to close the connection."""
+    parts = line.split()
+    if not parts:
+        return "error empty request"
+    cmd = parts[0].lower()
+    if cmd == "play" and len(parts) == 2:
+        move = parts[1].lower()
+        user = MOVE_INDEX.get(move)
+        if user is None:
+            if move in ("0", "1", "2"):
+                user = int(move)
+            else:
+                return f"error unknown move {move}"
+        bot, ev = game.play_round(user)
+        if ev & EV_STORY_LOST:
+            game.start_story()
+        return f"round {options[bot]} {ev} {game.user_score} {game.computer_score}"
+    if cmd == "difficulty" and len(parts) == 2:
+        d = parts[1].capitalize()
+        if d not in DIFFICULTIES:
+            return f"error unknown difficulty {parts[1]}"
+        game.set_difficulty(d)
+        return f"ok {d}"
+    if cmd == "story" and not isinstance(game, QuickGame):
+        game.start_story()
+        return "ok story"
+    if cmd == "reset":
+        game.reset_stats()
+        return "ok reset"
+    if cmd == "quit":
+        return None
+    return f"error unknown command {cmd}"
+
+
+class GameServer:
+    def __init__(self, rules="demo"):
+        self.rules = rules
+        self.connections = 0     # open right now
+        self.served = 0          # connections since start
+        self.rounds = 0
+        self.server = None
+
+    async def start(self, host=DEFAULT_HOST, port=DEFAULT_PORT, backlog=4096):
+        self.server = await asyncio.start_server(self.handle, host, port, backlog=backlog, limit=MAX_LINE)
+        return self.server.sockets[0].getsockname()[1]
+
+    async def handle(self, reader, writer):
+        game = new_game(self.rules)        # per-connection state, no globals
+        self.connections += 1
+        self.served += 1
+        try:
+            writer.write(GREETING)
+            while True:
+                try:
+                    raw = await reader.readline()
+                except (ValueError, asyncio.LimitOverrunError):
+                    # longer than MAX_LINE: readline() dropped it, and the client is not speaking the protocol
+                    writer.write(b"error request line too long\n")
+                    await writer.drain()
+                    break
+                if not raw:
+                    break
+                reply = handle_line(game, raw.decode("utf-8", "replace"))
+                if reply is None:
+                    break
+                if game.ensemble is not None:
+                    # the ensemble bot thinks on the loop thread: keep its next decision short
+                    game.ensemble.budget = ENSEMBLE_BUDGET
+                if reply.startswith("round"):
+                    self.rounds += 1
+                writer.write(reply.encode() + b"\n")
+                await writer.drain()
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            self.connections -= 1
+            writer.close()
+            try:
+                await writer.wait_closed()      # let the transport finish closing
+            except (ConnectionError, OSError):
+                pass
+
+    async def serve_forever(self):
+        async with self.server:
+            await self.server.serve_forever()
+
+    def close(self):
+        if self.server is not None:
+            self.server.close()
+
+
+async def _main(args):
+    srv = GameServer(args.rules)
+    port = await srv.start(args.host, args.port)
+    print(f"RPS server ({args.rules} rules) on {args.host}:{port}", flush=True)
+    await srv.serve_forever()
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Host many Rock-Paper-Scissors matches over TCP.")
+    ap.add_argument("--host", default=DEFAULT_HOST)
+    ap.add_argument("--port", type=int, default=DEFAULT_PORT)
+    ap.add_argument("--rules", choices=("demo", "quick"), default="demo", help="demo.py or Rock_Paper_Scissor.py rules")
+    args = ap.parse_args(argv)
+    try:
+        asyncio.run(_main(args))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,141 @@
+# rps_sound.py
+"""
+Sound bank shared by demo.py and Rock_Paper_Scissor.py.
+Every WAV is decoded once on a background thread and kept in a small LRU
+cache; play() only hands a cached Sound to one of a fixed pool of mixer
+channels, so a round never touches the disk or the decoder.
+pygame itself is imported lazily on that same thread, never at startup.
+"""
+
+import os
+import threading
+import time
+from collections import OrderedDict
+
+from rps_startup import optional_import
+
+QUEUED_PLAY_MAX_AGE = 0.3   # seconds a sound may wait for the mixer to come up
+
+# None until the mixer is first needed (first sound or background warm-up)
+SOUND_AVAILABLE = None
+_mixer_lock = threading.Lock()
+
+
+def load_mixer():
+    """Import pygame and start the mixer once. Returns the pygame module or None."""
+    global SOUND_AVAILABLE
+    with _mixer_lock:
+        pygame = optional_import("pygame", "pygame", "Sound")
+        if SOUND_AVAILABLE is None:
+            try:
+                pygame.mixer.init()
+                SOUND_AVAILABLE = True
+            except Exception as e:
+                SOUND_AVAILABLE = False
+                if pygame is not None:
+                    print("pygame mixer failed. Sound disabled.", e)
+        return pygame if SOUND_AVAILABLE else None
+
+
+class SoundBank:
+    """
+    Decoded sounds by filename. Missing or broken files are remembered as
+    None so they cost nothing on later plays.
+    """
+
+    def __init__(self, names, max_cached=16, channels=8):
+        self.names = list(names)
+        self.max_cached = max_cached
+        self._cache = OrderedDict()     # fname -> pygame.mixer.Sound or None
+        self._pending = set()           # queued for a background load
+        self._lock = threading.Lock()
+        self._channels = []
+        self._next_channel = 0
+        self._loader = None
+        self._queued = None             # (fname, time) asked for before the mixer was up
+        self.num_channels = channels
+
+    # --- loading ---
+    def preload(self):
+        """
+        Start the mixer and decode all known sounds on a daemon thread. Safe to
+        call more than once, and from several threads (Tk, campaign prefetcher):
+        only the first call starts the loader.
+        """
+        if SOUND_AVAILABLE is False:
+            return
+        with self._lock:
+            if self._loader is not None:
+                return
+            self._pending.update(n for n in self.names if n not in self._cache)
+            self._loader = threading.Thread(target=self._load_all, name="sound-preload", daemon=True)
+            self._loader.start()
+
+    def _load_all(self):
+        pygame = load_mixer()
+        if pygame is None:
+            return
+        pygame.mixer.set_num_channels(self.num_channels)
+        self._channels = [pygame.mixer.Channel(i) for i in range(self.num_channels)]
+        for fname in self.names:
+            self.load(fname)
+        # the sound that woke the bank up still plays if it is not stale yet
+        queued, self._queued = self._queued, None
+        if queued is not None and time.perf_counter() - queued[1] < QUEUED_PLAY_MAX_AGE:
+            self.play(queued[0])
+
+    def load(self, fname):
+        """Decode one file into the cache (runs on the loader thread)."""
+        with self._lock:
+            if fname in self._cache:
+                return self._cache[fname]
+        sound = None
+        pygame = load_mixer()
+        try:
+            if pygame is not None and os.path.isfile(fname):
+                sound = pygame.mixer.Sound(fname)
+        except Exception as e:
+            print("Sound load error:", fname, e)
+        with self._lock:
+            self._pending.discard(fname)
+            self._cache[fname] = sound
+            self._cache.move_to_end(fname)
+            while len(self._cache) > self.max_cached:
+                self._cache.popitem(last=False)
+        return sound
+
+    def wait(self, timeout=None):
+        """Block until the preload thread is done (for tools and benchmarks, not the UI)."""
+        if self._loader is not None:
+            self._loader.join(timeout)
+
+    # --- playing ---
+    def play(self, fname):
+        if not SOUND_AVAILABLE:
+            if SOUND_AVAILABLE is None:
+                # first sound of the session: bring the mixer up in the background
+                self._queued = (fname, time.perf_counter())
+                self.preload()
+            return
+        load = False
+        with self._lock:
+            sound = self._cache.get(fname, False)
+            if sound is not False:
+                self._cache.move_to_end(fname)
+            elif fname not in self._pending:
+                self._pending.add(fname)
+                load = True
+        if sound is False:
+            # not decoded yet (still preloading or evicted): never decode here
+            if load:
+                threading.Thread(target=self.load, args=(fname,), daemon=True).start()
+            return
+        if sound is None or not self._channels:
+            return
+        try:
+            # round-robin over the fixed pool; the oldest sound gets cut off first
+            ch = self._channels[self._next_channel]
+            self._next_channel = (self._next_channel + 1) % len(self._channels)
+            ch.play(sound)
+        except Exception as e:
+            print("Sound play error:", e)
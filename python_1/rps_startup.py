@@ -0,0 +1,82 @@
+# rps_startup.py
+"""
+Startup timing and lazy optional imports for the Tk front-ends.
+Import this module first: the startup clock starts when it loads.
+
+    RPS_STARTUP_REPORT=1          print the timing report once the first frame is drawn
+    RPS_EXIT_AFTER_FIRST_FRAME=1  quit right after the first frame (for timing cold starts)
+"""
+
+import importlib
+import os
+import threading
+import time
+
+T0 = time.perf_counter()
+STARTUP_BUDGET_MS = 400     # time-to-first-frame we hold ourselves to
+
+marks = []                  # (label, ms since T0)
+first_frame_ms = None
+
+_modules = {}
+_import_lock = threading.Lock()
+
+
+def mark(label):
+    marks.append((label, (time.perf_counter() - T0) * 1000.0))
+
+
+def report():
+    """One line per mark, then time-to-first-frame against the budget."""
+    lines = [f"  {ms:8.1f} ms  {label}" for label, ms in marks]
+    if first_frame_ms is not None:
+        verdict = "OK" if first_frame_ms <= STARTUP_BUDGET_MS else "OVER BUDGET"
+        lines.append(f"time-to-first-frame {first_frame_ms:.1f} ms (budget {STARTUP_BUDGET_MS} ms) {verdict}")
+    return "Startup timing:\n" + "\n".join(lines)
+
+
+def optional_import(name, label, feature):
+    """
+    Import an optional package the first time it is needed.
+    Returns the module, or None (and prints why) if it can't be loaded.
+    The answer is cached, so later calls are free.
+    """
+    with _import_lock:
+        if name not in _modules:
+            try:
+                _modules[name] = importlib.import_module(name)
+            except Exception as e:
+                _modules[name] = None
+                print(f"{label} not available. {feature} disabled.", e)
+        return _modules[name]
+
+
+def warm_up(*jobs):
+    """Run slow optional loads on a daemon thread so they are ready before first use."""
+    def run():
+        for job in jobs:
+            try:
+                job()
+            except Exception as e:
+                print("Warm-up error:", e)
+    threading.Thread(target=run, name="warm-up", daemon=True).start()
+
+
+def after_first_frame(root, callback=None):
+    """
+    Record time-to-first-frame once Tk has drawn the window, then run `callback`
+    (the place for warm-ups and the ready sound).
+    """
+    def drawn():
+        global first_frame_ms
+        first_frame_ms = (time.perf_counter() - T0) * 1000.0
+        mark("first frame")
+        if os.environ.get("RPS_STARTUP_REPORT"):
+            print(report())
+        if os.environ.get("RPS_EXIT_AFTER_FIRST_FRAME"):
+            root.after(0, root.destroy)
+            return
+        if callback is not None:
+            callback()
+    # after(0) fires once mainloop runs; the idle callback lands after the first redraw
+    root.after(0, lambda: root.after_idle(drawn))
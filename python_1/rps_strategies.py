@@ -0,0 +1,213 @@
+# rps_strategies.py
+"""
+Meta-strategy ("Ensemble") bot.
+Several predictors guess the player's next move side by side: frequency
+(the old user_move_counts logic), recency, pattern matching (n-gram and
+history match) and anti-rotation. Each guess is played three ways: beat
+the guess, or second-guess it once or twice. Every variant keeps a decayed
+score of how it would have done, and the bot plays the best one.
+
+choose() works through the predictors best-first and stops at a hard
+per-move time budget, so dozens of strategies never stall the UI.
+"""
+
+import random
+import time
+
+from rps_predict import NGramPredictor
+
+MOVE_BUDGET = 0.002     # seconds per decision
+
+
+class FrequencyPredictor:
+    """Most-played move so far (today's user_move_counts logic)."""
+    name = "frequency"
+
+    def __init__(self):
+        self.counts = [0, 0, 0]
+
+    def predict(self):
+        r, p, s = self.counts
+        if not (r or p or s):
+            return -1
+        if r >= p and r >= s:
+            return 0
+        return 1 if p >= s else 2
+
+    def update(self, move):
+        self.counts[move] += 1
+
+
+class RecencyPredictor:
+    """Most-played move with older moves fading by `decay` each round."""
+
+    def __init__(self, decay):
+        self.name = f"recency {decay}"
+        self.decay = decay
+        self.weights = [0.0, 0.0, 0.0]
+
+    def predict(self):
+        r, p, s = self.weights
+        if not (r or p or s):
+            return -1
+        if r >= p and r >= s:
+            return 0
+        return 1 if p >= s else 2
+
+    def update(self, move):
+        d = self.decay
+        w = self.weights
+        w[0] *= d
+        w[1] *= d
+        w[2] *= d
+        w[move] += 1.0
+
+
+class PatternPredictor:
+    """What followed the player's last few moves before (rps_predict n-gram tables)."""
+
+    def __init__(self, order):
+        self.name = f"pattern {order}"
+        self.ngram = NGramPredictor(order)
+
+    def predict(self):
+        return self.ngram.predict()
+
+    def update(self, move):
+        self.ngram.update(move)
+
+
+class HistoryMatchPredictor:
+    """Find the longest earlier repeat of the recent moves (within `window`) and predict what came next."""
+
+    def __init__(self, window, max_len=8):
+        self.name = f"history {window}"
+        self.window = window
+        self.max_len = max_len
+        self.history = ""
+
+    def predict(self):
+        h = self.history
+        end = len(h) - 1
+        for n in range(min(self.max_len, end), 0, -1):
+            i = h.rfind(h[-n:], 0, end)
+            if i >= 0:
+                return ord(h[i + n]) - 48
+        return -1
+
+    def update(self, move):
+        self.history += "012"[move]
+        if len(self.history) > 2 * self.window:
+            self.history = self.history[-self.window:]
+
+
+class RotationPredictor:
+    """Anti-rotation: the player's usual step from one move to the next (stay, +1 or -1)."""
+
+    def __init__(self, decay):
+        self.name = f"rotation {decay}"
+        self.decay = decay
+        self.steps = [0.0, 0.0, 0.0]
+        self.last = -1
+
+    def predict(self):
+        if self.last < 0:
+            return -1
+        a, b, c = self.steps
+        if not (a or b or c):
+            return -1
+        step = 0 if (a >= b and a >= c) else (1 if b >= c else 2)
+        return (self.last + step) % 3
+
+    def update(self, move):
+        if self.last >= 0:
+            d = self.decay
+            st = self.steps
+            st[0] *= d
+            st[1] *= d
+            st[2] *= d
+            st[(move - self.last) % 3] += 1.0
+        self.last = move
+
+
+def default_predictors():
+    return ([FrequencyPredictor()]
+            + [RecencyPredictor(d) for d in (0.5, 0.7, 0.9, 0.97)]
+            + [PatternPredictor(k) for k in (1, 2, 3, 4, 5, 6)]
+            + [HistoryMatchPredictor(w) for w in (20, 100, 500)]
+            + [RotationPredictor(d) for d in (0.7, 0.95)])
+
+
+class EnsembleBot:
+    """
+    choose() returns the bot move (0-2); update(move) must follow with the
+    player's actual move. `budget` is the wall-clock limit per choose();
+    setting `limit` instead evaluates exactly that many predictors (a replay
+    uses the logged `evaluated` count to make the same decision).
+    """
+
+    def __init__(self, predictors=None, budget=MOVE_BUDGET, decay=0.9, rng=None):
+        self.predictors = predictors if predictors is not None else default_predictors()
+        self.budget = budget
+        self.decay = decay
+        self.rng = rng if rng is not None else random.Random()
+        n = len(self.predictors)
+        self.scores = [[0.0, 0.0, 0.0] for _ in range(n)]   # per predictor: beat it / 2nd / 3rd guess
+        self.order = list(range(n))                         # best-scoring predictors first
+        self._played = [None] * n                           # variant moves offered this round
+        self.last_choice = None                             # (predictor name, variant) or None
+        self.evaluated = 0                                  # predictors that fit in the last budget
+        self.over_budget = 0                                # decisions cut short by the budget
+        self.limit = None                                   # fixed predictor count instead of the budget
+
+    def choose(self):
+        limit = self.limit
+        deadline = time.perf_counter() + self.budget if limit is None else float("inf")
+        stop = len(self.order) if limit is None else limit
+        best, best_score, pick = -1, None, None
+        played = self._played
+        scores = self.scores
+        evaluated = 0
+        for i in self.order:
+            guess = self.predictors[i].predict()
+            evaluated += 1
+            if guess >= 0:
+                beat = (guess + 1) % 3
+                variants = (beat, (beat + 1) % 3, (beat + 2) % 3)
+                played[i] = variants
+                sc = scores[i]
+                v = 0 if (sc[0] >= sc[1] and sc[0] >= sc[2]) else (1 if sc[1] >= sc[2] else 2)
+                if best_score is None or sc[v] > best_score:
+                    best, best_score, pick = variants[v], sc[v], (i, v)
+            if evaluated == stop:
+                break
+            if time.perf_counter() >= deadline:
+                if evaluated < len(self.order):
+                    self.over_budget += 1
+                break
+        self.evaluated = evaluated
+        if best < 0 or best_score < 0:
+            # nobody has a winning record yet: stay unpredictable
+            self.last_choice = None
+            return int(self.rng.random() * 3)
+        self.last_choice = (self.predictors[pick[0]].name, pick[1])
+        return best
+
+    def update(self, move):
+        d = self.decay
+        played = self._played
+        for i, variants in enumerate(played):
+            if variants is not None:
+                sc = self.scores[i]
+                for v in range(3):
+                    r = (variants[v] - move) % 3      # 1: that variant would have won
+                    sc[v] = sc[v] * d + (1.0 if r == 1 else (-1.0 if r == 2 else 0.0))
+                played[i] = None
+        for p in self.predictors:
+            p.update(move)
+        self.order.sort(key=lambda i: max(self.scores[i]), reverse=True)
+
+    def leaderboard(self, top=5):
+        rows = [(max(self.scores[i]), self.predictors[i].name) for i in range(len(self.predictors))]
+        rows.sort(reverse=True)
+        return rows[:top]
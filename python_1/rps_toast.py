@@ -0,0 +1,63 @@
+# rps_toast.py
+"""
+In-window notifications ("toasts") for match transitions.
+Unlike messagebox.showinfo they never block the event loop: voice input,
+animations and sounds keep running. Messages posted in the same tick are
+combined into one toast, toasts auto-dismiss, and a short gap between
+toasts plus a bounded queue keep a burst of events from flickering.
+"""
+
+import tkinter as tk
+from collections import deque
+
+DURATION_MS = 2200      # how long a one-line toast stays up
+EXTRA_LINE_MS = 700     # ... plus this for each extra line
+GAP_MS = 250            # pause between two toasts
+MAX_QUEUE = 6           # older messages beyond this are dropped (and counted)
+
+
+class Toaster:
+    def __init__(self, root, bg="#0f0f12", fg="orange"):
+        self.root = root
+        self.label = tk.Label(root, text="", font=("Arial", 11, "bold"), bg=bg, fg=fg,
+                              bd=2, relief="ridge", padx=12, pady=6, justify="center")
+        self._queue = deque()
+        self._dropped = 0
+        self._visible = False
+        self._scheduled = False
+        self.shown = 0          # toasts displayed
+        self.posted = 0         # messages posted
+
+    def show(self, title, message=""):
+        self.posted += 1
+        self._queue.append(f"{title} {message}".strip() if title else message)
+        if len(self._queue) > MAX_QUEUE:
+            self._queue.popleft()
+            self._dropped += 1
+        if not self._visible and not self._scheduled:
+            # wait for the rest of this tick so back-to-back events share one toast
+            self._scheduled = True
+            self.root.after_idle(self._pump)
+
+    def _pump(self):
+        self._scheduled = False
+        if self._visible or not self._queue:
+            return
+        lines = list(self._queue)
+        self._queue.clear()
+        if self._dropped:
+            lines.append(f"(+{self._dropped} more)")
+            self._dropped = 0
+        self.label.config(text="\n".join(lines))
+        self.label.place(relx=0.5, y=12, anchor="n")
+        self.label.lift()
+        self._visible = True
+        self.shown += 1
+        self.root.after(DURATION_MS + EXTRA_LINE_MS * (len(lines) - 1), self._dismiss)
+
+    def _dismiss(self):
+        self.label.place_forget()
+        self._visible = False
+        if self._queue:
+            self._scheduled = True
+            self.root.after(GAP_MS, self._pump)
@@ -0,0 +1,248 @@
+# rps_tournament.py
+"""
+Round-robin bot tournament.
+Every bot configuration (menu difficulties, the boss, each story enemy, the
+quick game's bot, the ensemble and a random baseline; add more to
+CONTESTANTS) plays every other one on a process pool. In each round both
+bots pick at the same time, then each engine Game is told the other's move
+as its "user" move, so boss, story and match-reset rules all apply as in a
+real game. Every task gets its own seeded RNG stream, so a run is
+reproducible for a given --seed whatever the number of workers.
+
+Results are fitted to Elo ratings (maximum likelihood on all games, mean
+1500) with bootstrap 95% intervals.
+
+    python rps_tournament.py --games 200 --rounds 100 --seed 1
+"""
+
+import argparse
+import math
+import os
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from rps_engine import Game, QuickGame, story_enemies, stream_seed
+from rps_predict import NGramPredictor
+
+GAMES = 100            # games per pairing
+ROUNDS = 100           # rounds per game; the bot with more round wins takes the game
+CHUNK = 25             # games per pool task
+BOOTSTRAP = 200        # resamples for the confidence intervals
+ELO_SCALE = 400.0
+PRIOR_DRAWS = 1.0      # virtual draws per bot against an average bot
+
+
+class RandomBot:
+    """Uniform random baseline (no Game behind it)."""
+
+    def __init__(self, seed):
+        self.rand = random.Random(seed).random
+
+    def choose(self):
+        return int(self.rand() * 3)
+
+    def observe(self, mine, theirs):
+        pass
+
+
+class GameBot:
+    """One engine Game seen from the bot's side: the opponent is its 'user'."""
+
+    def __init__(self, game):
+        self.game = game
+        if game.ensemble is not None:
+            # no wall-clock budget here: the same seed must give the same games on any machine
+            game.ensemble.budget = float("inf")
+
+    def choose(self):
+        return self.game.bot_choice()
+
+    def observe(self, mine, theirs):
+        self.game.play_round(theirs, mine)
+
+
+def _menu(difficulty):
+    def make(seed):
+        return GameBot(Game(difficulty=difficulty, seed=seed, predictor=NGramPredictor()))
+    return make
+
+
+def _boss(seed):
+    # boss bias for the whole game: no match goal ends it
+    g = Game(score_goal=10**9, difficulty="Hard", seed=seed, predictor=NGramPredictor())
+    g.force_boss()
+    return GameBot(g)
+
+
+def _enemy(enemy):
+    def make(seed):
+        # one enemy that is never beaten, so the story never moves on
+        g = Game(seed=seed, predictor=NGramPredictor(), enemies=[dict(enemy, rounds=10**9)])
+        g.start_story()
+        return GameBot(g)
+    return make
+
+
+def _quick(seed):
+    return GameBot(QuickGame(difficulty="Hard", seed=seed, predictor=NGramPredictor()))
+
+
+CONTESTANTS = {
+    "Easy": _menu("Easy"),
+    "Medium": _menu("Medium"),
+    "Hard": _menu("Hard"),
+    "Ensemble": _menu("Ensemble"),
+    "Boss": _boss,
+    "quick Hard": _quick,
+    "random": RandomBot,
+}
+for _e in story_enemies:
+    CONTESTANTS[f"story {_e['name']}"] = _enemy(_e)
+
+
+def play_games(a, b, games, rounds, seed):
+    """Pool task: `games` games of a vs b. Returns (a wins, draws, b wins)."""
+    rng = random.Random(seed)
+    wins = draws = losses = 0
+    make_a, make_b = CONTESTANTS[a], CONTESTANTS[b]
+    for _ in range(games):
+        bot_a = make_a(rng.getrandbits(64))
+        bot_b = make_b(rng.getrandbits(64))
+        diff = 0
+        for _ in range(rounds):
+            x = bot_a.choose()
+            y = bot_b.choose()
+            bot_a.observe(x, y)
+            bot_b.observe(y, x)
+            r = (x - y) % 3
+            if r == 1:
+                diff += 1
+            elif r == 2:
+                diff -= 1
+        if diff > 0:
+            wins += 1
+        elif diff < 0:
+            losses += 1
+        else:
+            draws += 1
+    return wins, draws, losses
+
+
+def fit_elo(names, results, iterations=200):
+    """
+    Ratings that best explain the pair results (Bradley-Terry on the Elo scale,
+    draws count half), fitted with the minorize-maximize iteration.
+    results: {(i, j): (i wins, draws, j wins)}. Each bot also gets PRIOR_DRAWS
+    virtual draws against an average bot, which keeps a bot that won (or lost)
+    every game at a finite rating.
+    """
+    n = len(names)
+    score = [PRIOR_DRAWS / 2] * n       # wins + draws / 2, including the virtual draws
+    games = {}                          # (i, j) -> games played
+    for (i, j), (w, d, l) in results.items():
+        score[i] += w + d / 2
+        score[j] += l + d / 2
+        games[(i, j)] = w + d + l
+    strength = [1.0] * n                # 10 ** (rating / ELO_SCALE); the average bot is 1
+    for _ in range(iterations):
+        denom = [PRIOR_DRAWS / (s + 1.0) for s in strength]
+        for (i, j), g in games.items():
+            if g:
+                x = g / (strength[i] + strength[j])
+                denom[i] += x
+                denom[j] += x
+        new = [score[i] / denom[i] for i in range(n)]
+        change = max(abs(a - b) / b for a, b in zip(new, strength))
+        strength = new
+        if change < 1e-6:
+            break
+    ratings = [ELO_SCALE * math.log10(s) for s in strength]
+    mean = sum(ratings) / n
+    return [1500.0 + x - mean for x in ratings]
+
+
+def bootstrap_ci(names, results, rounds=BOOTSTRAP, seed=0):
+    """95% interval per rating, resampling every pairing's games."""
+    rng = random.Random(seed)
+    samples = [[] for _ in names]
+    for _ in range(rounds):
+        res = {}
+        for key, (w, d, l) in results.items():
+            total = w + d + l
+            pw, pd = w / total, d / total
+            sw = sd = 0
+            for _ in range(total):
+                u = rng.random()
+                if u < pw:
+                    sw += 1
+                elif u < pw + pd:
+                    sd += 1
+            res[key] = (sw, sd, total - sw - sd)
+        for i, x in enumerate(fit_elo(names, res, iterations=100)):
+            samples[i].append(x)
+    out = []
+    for s in samples:
+        s.sort()
+        out.append((s[int(0.025 * (len(s) - 1))], s[int(0.975 * (len(s) - 1))]))
+    return out
+
+
+def run_tournament(names=None, games=GAMES, rounds=ROUNDS, seed=None, workers=None, chunk=CHUNK):
+    names = list(names or CONTESTANTS)
+    for nm in names:
+        if nm not in CONTESTANTS:
+            raise ValueError(f"unknown contestant {nm!r}; known: {', '.join(CONTESTANTS)}")
+    seed = seed if seed is not None else random.SystemRandom().getrandbits(32)
+    tasks = []
+    for i in range(len(names)):
+        for j in range(i + 1, len(names)):
+            for c in range(0, games, chunk):
+                tasks.append((i, j, min(chunk, games - c), stream_seed(seed, names[i], names[j], c)))
+    results = {}
+    with ProcessPoolExecutor(max_workers=workers or os.cpu_count()) as pool:
+        futures = [(i, j, pool.submit(play_games, names[i], names[j], g, rounds, s)) for i, j, g, s in tasks]
+        for i, j, f in futures:
+            w, d, l = f.result()
+            pw, pd, pl = results.get((i, j), (0, 0, 0))
+            results[(i, j)] = (pw + w, pd + d, pl + l)
+    ratings = fit_elo(names, results)
+    ci = bootstrap_ci(names, results, seed=seed)
+    table = []
+    for k, nm in enumerate(names):
+        w = d = l = 0
+        for (i, j), (a, b, c) in results.items():
+            if i == k:
+                w, d, l = w + a, d + b, l + c
+            elif j == k:
+                w, d, l = w + c, d + b, l + a
+        table.append({"name": nm, "elo": ratings[k], "ci95": ci[k], "wins": w, "draws": d, "losses": l})
+    table.sort(key=lambda row: -row["elo"])
+    return {"seed": seed, "games": games, "rounds": rounds, "table": table}
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Rank every bot configuration in a round-robin tournament.")
+    ap.add_argument("--games", type=int, default=GAMES, help="games per pairing")
+    ap.add_argument("--rounds", type=int, default=ROUNDS, help="rounds per game")
+    ap.add_argument("--seed", type=int, default=None)
+    ap.add_argument("--workers", type=int, default=None, help="processes (default: all cores)")
+    ap.add_argument("--only", nargs="*", default=None, metavar="NAME", help="contestants to include")
+    args = ap.parse_args(argv)
+    unknown = [nm for nm in args.only or () if nm not in CONTESTANTS]
+    if unknown:
+        ap.error(f"unknown contestant(s) {', '.join(unknown)}; known: {', '.join(CONTESTANTS)}")
+    t0 = time.perf_counter()
+    res = run_tournament(args.only, args.games, args.rounds, args.seed, args.workers)
+    print(f"{res['games']} games of {res['rounds']} rounds per pairing, seed {res['seed']}")
+    for row in res["table"]:
+        lo, hi = row["ci95"]
+        played = row["wins"] + row["draws"] + row["losses"]
+        score = (row["wins"] + row["draws"] / 2) / played if played else 0.0
+        print(f"{row['name']:<18} {row['elo']:7.0f}  [{lo:5.0f}, {hi:5.0f}]  "
+              f"W/D/L {row['wins']}/{row['draws']}/{row['losses']}  score {score:.0%}")
+    print(f"done in {time.perf_counter() - t0:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
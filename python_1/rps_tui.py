@@ -0,0 +1,562 @@
+# rps_tui.py
+"""
+Terminal front-end (curses) for hosts without a display.
+Same engine, cheat console commands, typed cheat codes, boss battles and
+story campaign as demo.py (or the Rock_Paper_Scissor.py rules with
+--quick), but no Tk, sound or X display: it starts in milliseconds, stays
+at a few MB and runs fine over SSH. The screen is only redrawn after
+something changed, and curses sends just the characters that differ.
+
+    python rps_tui.py                            demo rules
+    python rps_tui.py --quick                    quick rules
+    python rps_tui.py --run "autoplay 100000" --exit
+                                                 soak run: quit when autoplay is done
+
+Keys: r/p/s or 1/2/3 play, ':' opens the cheat console (Enter runs, Tab
+completes, Esc closes), q quits.
+"""
+
+import rps_startup   # first: starts the startup clock
+import argparse
+import curses
+import heapq
+import itertools
+import locale
+import os
+import threading
+import time
+from collections import deque
+
+from rps_engine import (Game, QuickGame, options, EV_TIE, EV_WIN, EV_BOSS_APPEARS, EV_BOSS_WEAKENED,
+                        EV_BOSS_DEFEATED, EV_VICTORY, EV_DEFEAT, EV_ENEMY_DEFEATED, EV_NEXT_ENEMY,
+                        EV_STORY_LOST)
+from rps_predict import NGramPredictor
+from rps_cheats import CheatMatcher
+from rps_console import CommandConsole, ConsoleError
+from rps_autoplay import Autoplay, make_player
+from rps_matchlog import MatchLog, scan, summary_text
+from rps_replay import ReplayError, replay, replay_text
+from rps_charts import RoundStats
+from rps_save import DEFAULT_PATH as SAVE_PATH, UNDO_DEPTH, SaveError, describe, resume, save_game
+from rps_profiles import ProfileStore
+from rps_campaign import CampaignError, Prefetcher, builtin_campaign, load_campaign
+import rps_profiler
+from rps_profiler import profiled
+
+rps_startup.mark("imports")
+
+TOAST_SECONDS = 2.5      # how long a toast line stays up
+MAX_WAIT_MS = 500        # longest getch() wait when no timer is due
+KEYS = {"r": "rock", "p": "paper", "s": "scissor", "1": "rock", "2": "paper", "3": "scissor"}
+SECRET_CODE = "trickortreat"
+
+win_comments = ["✅ You win this round!", "🎃 You smashed the bot!", "🔥 Nice move!"]
+funny_bot_comments = [
+    "😏 I’m just warming up...",
+    "😂 Did you really think that would work?",
+    "🧠 Big brain move... for me!",
+    "👀 You got lucky this time!",
+    "💀 I smell fear!",
+    "🎃 Even ghosts play better than you!",
+    "😎 I’m not programmed to lose!"
+]
+
+# timed while profiling is on (patched on the classes once, whichever rules this session plays)
+rps_profiler.profile_method(Game, "bot_choice")
+rps_profiler.profile_method(QuickGame, "bot_choice")
+
+
+class Timers:
+    """
+    after()/after_cancel() like a Tk root, run by the terminal main loop
+    (Autoplay uses it as `root`). after() may be called from any thread.
+    A callback that raises is reported to on_error(exc): curses owns the
+    terminal, so printing would scribble over the screen.
+    """
+
+    def __init__(self, on_error=None):
+        self.on_error = on_error
+        self._heap = []
+        self._seq = itertools.count()
+        self._cancelled = set()
+        self._lock = threading.Lock()
+
+    def after(self, ms, func):
+        with self._lock:
+            job = next(self._seq)
+            heapq.heappush(self._heap, (time.perf_counter() + ms / 1000.0, job, func))
+        return job
+
+    def after_cancel(self, job):
+        with self._lock:
+            self._cancelled.add(job)
+
+    def _pop_due(self, now):
+        with self._lock:
+            heap = self._heap
+            while heap and heap[0][0] <= now:
+                _, job, func = heapq.heappop(heap)
+                if job in self._cancelled:
+                    self._cancelled.discard(job)
+                else:
+                    return func
+        return None
+
+    def run_due(self):
+        now = time.perf_counter()
+        func = self._pop_due(now)
+        while func is not None:
+            try:
+                func()
+            except Exception as e:
+                if self.on_error is not None:
+                    self.on_error(e)
+            func = self._pop_due(now)
+
+    def wait_ms(self, longest):
+        with self._lock:
+            if not self._heap:
+                return longest
+            return max(0, min(longest, int((self._heap[0][0] - time.perf_counter()) * 1000) + 1))
+
+
+class TerminalGame:
+    def __init__(self, quick=False):
+        self.quick = quick
+        if quick:
+            self.campaign = None
+            self.game = QuickGame(score_goal=4, difficulty="Easy", predictor=NGramPredictor())
+        else:
+            # story campaign from RPS_CAMPAIGN (default campaign.json), else the built-in three enemies
+            try:
+                self.campaign = load_campaign()
+            except CampaignError as e:
+                print("Campaign error:", e)
+                self.campaign = builtin_campaign()
+            self.game = Game(score_goal=3, difficulty="Easy", boss_threshold=3, predictor=NGramPredictor(),
+                             enemies=self.campaign.enemies)
+        self.match_log = MatchLog()
+        self.match_log.attach(self.game)
+        self.comment_rng = self.game.stream("comments")
+        self.undo_stack = deque(maxlen=UNDO_DEPTH)   # game.snapshot() before each round
+        self.round_stats = RoundStats()
+        self.profiles = ProfileStore()
+        self.prefetcher = Prefetcher(self.game)
+        self.timers = Timers(on_error=lambda e: self.show_toast("Timer error", str(e)))
+        self.character = "🎃"
+        # what is on screen
+        self.hands = ("", "")
+        self.comment = "👻 Welcome! Press : for the cheat console (type help)."
+        self.toast = ""
+        self._toast_job = None
+        self.output = []
+        self.console_open = False
+        self.line = ""
+        self.dirty = True
+        self.frames = 0
+        self.running = True
+        self.autoplay = None
+        self.exit_when_done = False
+        self.report = []            # printed after the screen closes
+        self._build_console()
+
+    # --- view state ---
+    def say(self, text):
+        self.comment = text
+        self.dirty = True
+
+    def show_toast(self, title, text):
+        self.toast = f"{title}: {text}".replace("\n", " ")
+        self.dirty = True
+        if self._toast_job is not None:
+            self.timers.after_cancel(self._toast_job)
+        self._toast_job = self.timers.after(int(TOAST_SECONDS * 1000), self._clear_toast)
+
+    def _clear_toast(self):
+        self._toast_job = None
+        self.toast = ""
+        self.dirty = True
+
+    def show_output(self, title, text):
+        self.output = [f"{title}:"] + text.splitlines()
+        self.dirty = True
+
+    # --- game ---
+    def warm_start(self):
+        # a new match starts from what this character usually plays
+        self.game.warm_start(self.profiles.prior(self.character))
+
+    def reset_stats(self):
+        self.game.reset_stats()
+        self.warm_start()
+        self.hands = ("", "")
+        self.say("👻 New game! Choose your move...")
+
+    def announce_boss(self):
+        self.say("👹 Boss Battle! The Boss Bot appears...")
+        self.timers.after(1200, lambda: self.say("💀 Boss is ready! Choose carefully..."))
+
+    @profiled("play_round")
+    def play_round(self, user_choice):
+        game = self.game
+        enemy = game.current_enemy
+        move = options.index(user_choice)
+        self.undo_stack.append(game.snapshot())
+        bot, ev = self.play_logged(game, move)
+        self.profiles.record(self.character, move)
+        if not game.total_moves:
+            self.warm_start()    # the engine just finished a match and reset
+        self.hands = (user_choice, options[bot])
+        self.dirty = True
+        if ev & EV_TIE:
+            self.say("😐 It's a tie — no points.")
+            return
+        self.say(self.comment_rng.choice(win_comments if ev & EV_WIN else funny_bot_comments))
+        if ev & EV_BOSS_APPEARS:
+            self.announce_boss()
+        if ev & EV_ENEMY_DEFEATED:
+            self.show_toast("Victory!", f"You defeated {enemy['name']}!")
+            self.next_enemy(ev)
+            return
+        if ev & EV_STORY_LOST:
+            self.show_toast("Defeat!", "💀 You were defeated! Restarting story mode...")
+            self.start_story()
+            return
+        if ev & EV_BOSS_DEFEATED:
+            self.show_toast("Boss Defeated!", "🏆 You defeated the Boss Bot! Congratulations!")
+            self.reset_stats()
+        elif ev & EV_BOSS_WEAKENED:
+            self.say("🏁 You weakened the Boss — keep fighting!")
+        elif ev & EV_VICTORY:
+            self.show_toast("You Win!", f"🎉 You reached {game.score_goal} wins! You defeated the bot.")
+            self.reset_stats()
+        elif ev & EV_DEFEAT:
+            self.show_toast("You Lose", f"🤖 The bot reached {game.score_goal} wins. Better luck next time.")
+            self.reset_stats()
+
+    def play_logged(self, game, move):
+        # every round, by hand or by autoplay: logged, then counted for the charts
+        bot, ev = self.match_log.play(game, move)
+        self.round_stats.add(move, bot, game.branch)
+        return bot, ev
+
+    # --- story (no cutscenes in a terminal: their titles become toasts) ---
+    def start_story(self):
+        self.prefetcher.prefetch(0)
+        self.game.start_story()
+        enemy = self.game.current_enemy
+        self.show_toast("Story Mode", f"{self.campaign.intro['title']} — first opponent: {enemy['name']}")
+        self.prefetcher.prefetch(1)
+        self.dirty = True
+
+    def next_enemy(self, ev):
+        game = self.game
+        if ev & EV_NEXT_ENEMY:
+            enemy = game.current_enemy
+            title = enemy["cutscene"]["title"] + " — " if enemy["cutscene"] else ""
+            self.show_toast("Next Battle!", f"{title}Now facing {enemy['name']} ({enemy['difficulty']})")
+            self.prefetcher.prefetch(game.current_enemy_index + 1)
+        else:
+            self.show_toast("Victory!", "🎉 You defeated all haunted bots! You unlocked the Secret Ending!")
+
+    # --- cheats ---
+    def activate_pumpkin_power(self):
+        ev = self.game.pumpkin_power()
+        if ev is None:
+            self.show_toast("No Cheating Twice!", "You already used Pumpkin Power!")
+            return
+        self.say("🎃 Pumpkin Power activated! +1 point")
+        if ev & EV_BOSS_APPEARS:
+            self.announce_boss()
+
+    def force_boss_battle(self):
+        if not self.game.force_boss():
+            self.say("👾 Boss already active!")
+            return
+        self.say("👹 Boss forced! Prepare...")
+        self.timers.after(1000, lambda: self.say("💀 Boss is ready!"))
+
+    def do_easter_egg(self):
+        self.game.easter_egg()
+        self.say("🎃 Trick or Treat! Pumpkin theme unlocked +1 bonus point!")
+
+    # --- console commands ---
+    def log_stats(self):
+        self.match_log.flush()
+        return summary_text(scan(self.match_log.path))
+
+    def replay_command(self, match=None):
+        self.match_log.flush()
+        enemies = self.campaign.enemies if self.campaign is not None else None
+        try:
+            return replay_text(replay(self.match_log.path, None if match is None else int(match), enemies))
+        except (ReplayError, ValueError) as e:
+            raise ConsoleError(f"replay: {e}")
+
+    def undo_command(self, rounds="1"):
+        try:
+            n = int(rounds)
+        except ValueError:
+            n = 0
+        if n < 1:
+            raise ConsoleError("usage: undo [rounds]")
+        if not self.undo_stack:
+            return "Nothing to undo."
+        n = min(n, len(self.undo_stack))
+        for _ in range(n - 1):
+            self.undo_stack.pop()
+        try:
+            self.game.restore(self.undo_stack.pop())
+        except ValueError as e:
+            raise ConsoleError(f"undo: {e}")
+        self.hands = ("", "")
+        self.say(f"↩️ Took back {n} round{'s' if n > 1 else ''}.")
+        return None
+
+    def save_command(self, path=SAVE_PATH):
+        try:
+            size = save_game(self.game, path)
+        except SaveError as e:
+            raise ConsoleError(f"save: {e}")
+        return f"Saved to {path} ({size} bytes): {describe(self.game)}"
+
+    def resume_command(self, path=SAVE_PATH):
+        try:
+            resume(self.game, path)
+        except (SaveError, ValueError) as e:
+            raise ConsoleError(f"resume: {e}")
+        self.undo_stack.clear()
+        if self.game.story_mode:
+            self.prefetcher.prefetch(self.game.current_enemy_index + 1)
+        self.hands = ("", "")
+        self.dirty = True
+        return f"Resumed {path}: {describe(self.game)}"
+
+    def profile_command(self, action):
+        if action in ("on", "off"):
+            rps_profiler.set_enabled(action == "on")
+            self.say("⏱️ Profiling on — type 'stats' to see timings." if action == "on" else "⏱️ Profiling off.")
+            return None
+        if action == "dump":
+            return f"Profile written to {rps_profiler.dump()}"
+        raise ConsoleError("usage: profile on | off | dump")
+
+    def campaign_text(self):
+        ready = ", ".join(str(i + 1) for i in sorted(self.prefetcher.ready.copy())) or "none yet"
+        return f"{self.campaign.summary()}\nprefetched enemies: {ready}"
+
+    def difficulty_command(self, name):
+        d = name.lower()
+        if d not in ("easy", "medium", "hard", "ensemble"):
+            raise ConsoleError("usage: difficulty Easy | Medium | Hard | Ensemble")
+        self.game.set_difficulty(d.capitalize())
+        return f"Difficulty set to {self.game.difficulty}"
+
+    def goal_command(self, wins):
+        try:
+            g = int(wins)
+        except ValueError:
+            g = 0
+        if not 1 <= g <= 50:
+            raise ConsoleError("usage: goal N (1-50)")
+        self.game.set_goal(g)
+        self.dirty = True
+        return f"First to {g} wins!"
+
+    def character_command(self, name="🎃"):
+        self.character = name
+        self.dirty = True
+
+    def render_autoplay(self, ap):
+        if ap.last is not None:
+            user, bot, _ = ap.last
+            self.hands = (options[user], options[bot])
+        self.say(f"🤖 Autoplay {ap.played}/{ap.rounds} — {ap.rate():,.0f} rounds/s")
+
+    def autoplay_done(self, ap):
+        self.autoplay = None
+        self.show_toast("Autoplay", ap.summary())
+        self.report.append(ap.summary())
+        if self.exit_when_done:
+            self.running = False
+
+    def autoplay_command(self, rounds, every="0", player="random"):
+        if rounds == "stop":
+            if self.autoplay is None:
+                return "Autoplay is not running."
+            self.autoplay.stop()
+            return None
+        if self.autoplay is not None:
+            raise ConsoleError("autoplay is already running (autoplay stop)")
+        try:
+            n, k = int(rounds), int(every)
+            bot_player = make_player(player, self.game.stream("autoplay"))
+        except ValueError as e:
+            raise ConsoleError(f"usage: autoplay N [every] [player] | autoplay stop ({e})")
+        if n <= 0 or k < 0:
+            raise ConsoleError("usage: autoplay N [every] [player]; N > 0, every >= 0")
+        self.autoplay = Autoplay(self.timers, self.game, n, self.render_autoplay, self.autoplay_done,
+                                 bot_player, every=k, play=self.play_logged).start()
+        return None
+
+    def _build_console(self):
+        # same commands as the Tk front-ends, plus the settings their menu buttons hold
+        c = self.console = CommandConsole(show=self.show_output)
+        c.add("pumpkinpower", self.activate_pumpkin_power, "+1 point, once per match")
+        c.add("trickortreat", self.do_easter_egg, "bonus point")
+        if not self.quick:
+            c.add("bossbattle", self.force_boss_battle, "summon the Boss Bot now")
+            c.add("storymode", self.start_story, "start story mode")
+            c.add("campaign", self.campaign_text, "story campaign enemies and prefetch status")
+        c.add("reset", self.reset_stats, "start a new match")
+        c.add("undo", self.undo_command, f"take back the last round(s), up to {UNDO_DEPTH}")
+        c.add("save", self.save_command, "save scores and story progress to a file")
+        c.add("resume", self.resume_command, "continue from a saved file")
+        c.add("charts", self.round_stats.text, "move mix, bot wins per branch and net score so far")
+        c.add("redraws", lambda: f"{self.frames} screen updates", "screen update count")
+        c.add("startup", rps_startup.report, "startup timing")
+        c.add("logstats", self.log_stats, "match log summary")
+        c.add("stats", rps_profiler.stats_text, "profiler latency percentiles")
+        c.add("profile", self.profile_command, "profile on | off | dump")
+        c.add("autoplay", self.autoplay_command, "play N rounds for you (draw every k-th; player random|cycle|rock|ensemble|r,p,s) or stop")
+        c.add("replay", self.replay_command, "rebuild a logged match from its seed and check it (default: the last)")
+        c.add("difficulty", self.difficulty_command, "Easy | Medium | Hard | Ensemble")
+        c.add("goal", self.goal_command, "wins needed to win a match")
+        c.add("character", self.character_command, "your character (emoji or name)")
+        c.add("quit", self.quit, "leave the game")
+        # typed cheat codes work while the console is open
+        self.cheats = CheatMatcher()
+        self.cheats.add(SECRET_CODE, self.do_easter_egg)
+
+    def quit(self):
+        self.running = False
+
+    # --- keys ---
+    def key(self, k):
+        if k == curses.KEY_RESIZE:
+            self.dirty = True
+        elif self.console_open:
+            self._console_key(k)
+        elif isinstance(k, str):
+            if k.lower() in KEYS:
+                self.play_round(KEYS[k.lower()])
+            elif k == ":":
+                self.console_open = True
+                self.dirty = True
+            elif k.lower() == "q":
+                self.quit()
+
+    def _console_key(self, k):
+        self.dirty = True
+        if k in ("\n", "\r", curses.KEY_ENTER):
+            line, self.line = self.line, ""
+            self.console_open = False
+            self.console.execute(line)
+        elif k == "\x1b":
+            self.line = ""
+            self.console_open = False
+        elif k in ("\x7f", "\b", curses.KEY_BACKSPACE):
+            self.line = self.line[:-1]
+        elif k == "\t":
+            # complete the command word being typed (after the last ';')
+            head, sep, word = self.line.rpartition(";")
+            names = self.console.complete(word.strip()) if word.strip() and " " not in word.strip() else []
+            if len(names) == 1:
+                self.line = f"{head}{sep}{' ' if sep else ''}{names[0]} "
+            elif names:
+                self.show_output("Completions", "  ".join(names))
+        elif isinstance(k, str) and k.isprintable():
+            self.line += k
+            if self.cheats.feed(k.lower()):
+                self.line = ""          # the code already ran; Enter must not run it again
+
+    # --- screen ---
+    def draw(self, scr):
+        game = self.game
+        h, w = scr.getmaxyx()
+        scr.erase()
+        rules = "quick" if self.quick else "demo"
+        rows = [(f"🎃 RPS Halloween — terminal ({rules} rules, {game.difficulty}, first to {game.score_goal})",
+                 curses.A_BOLD)]
+        if game.story_mode:
+            enemy = game.current_enemy
+            rows.append((f"⚔️ {enemy['name']} — {enemy['difficulty']} (first to {game.enemy_target})",
+                         curses.A_BOLD))
+        elif game.boss_mode_active:
+            rows.append(("👹 BOSS BATTLE", curses.A_BOLD | curses.A_REVERSE))
+        else:
+            rows.append(("", 0))
+        user, bot = self.hands
+        rows.append((f"{self.character} You: {user:<8}  🤖 Bot: {bot}", 0))
+        rows.append((f"📊 Score: You {game.user_score} - Bot {game.computer_score}", curses.A_BOLD))
+        rows.append((self.comment, 0))
+        rows.append((self.toast, curses.A_REVERSE if self.toast else 0))
+        rows.append(("", 0))
+        rows.extend((line, 0) for line in self.output)
+        for y, (text, attr) in enumerate(rows[:h - 1]):
+            self._put(scr, y, text, attr, w)
+        if self.console_open:
+            self._put(scr, h - 1, ":" + self.line, 0, w)
+            curses.curs_set(1)
+        else:
+            self._put(scr, h - 1, "r/p/s play   : cheat console   q quit", curses.A_DIM, w)
+            curses.curs_set(0)
+        scr.refresh()
+        self.frames += 1
+
+    @staticmethod
+    def _put(scr, y, text, attr, w):
+        try:
+            scr.addnstr(y, 0, text, w - 1, attr)
+        except curses.error:
+            pass     # wide characters at the right edge
+
+    def run(self, scr, commands=""):
+        try:
+            curses.curs_set(0)
+        except curses.error:
+            pass
+        self.profiles.start(lambda: self.timers.after(0, self.warm_start))
+        self.draw(scr)
+        rps_startup.first_frame_ms = (time.perf_counter() - rps_startup.T0) * 1000.0
+        rps_startup.mark("first frame")
+        if os.environ.get("RPS_EXIT_AFTER_FIRST_FRAME"):
+            return
+        if commands:
+            self.console.execute(commands)
+        while self.running:
+            self.timers.run_due()
+            if self.dirty and self.running:
+                self.dirty = False
+                self.draw(scr)
+            scr.timeout(self.timers.wait_ms(MAX_WAIT_MS))
+            try:
+                k = scr.get_wch()
+            except curses.error:
+                continue          # timed out: run the timers
+            self.key(k)
+        if self.autoplay is not None:
+            self.autoplay.stop()
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Rock-Paper-Scissors (Halloween) in the terminal.")
+    ap.add_argument("--quick", action="store_true", help="Rock_Paper_Scissor.py rules instead of demo.py")
+    ap.add_argument("--run", default="", metavar="COMMANDS", help="cheat console commands to run at start")
+    ap.add_argument("--exit", action="store_true", help="quit once autoplay (from --run) is done")
+    args = ap.parse_args(argv)
+    locale.setlocale(locale.LC_ALL, "")
+    os.environ.setdefault("ESCDELAY", "25")     # Esc closes the console without a 1 s wait
+    app = TerminalGame(quick=args.quick)
+    app.exit_when_done = args.exit
+    curses.wrapper(app.run, args.run)
+    app.match_log.close()
+    app.profiles.close()
+    for line in app.report:
+        print(line)
+    if os.environ.get("RPS_STARTUP_REPORT"):
+        print(rps_startup.report())
+
+
+if __name__ == "__main__":
+    main()
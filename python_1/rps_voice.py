@@ -0,0 +1,189 @@
+# rps_voice.py
+"""
+Long-lived voice-command worker.
+One thread opens the microphone, calibrates for ambient noise once and then
+listens continuously while voice mode is on. Each short phrase goes to a
+pluggable offline keyword recognizer that only knows rock / paper / scissor,
+so a move needs no network and no per-toggle setup.
+
+A recognizer is any callable taking a speech_recognition AudioData and
+returning "rock", "paper", "scissor" or None.
+"""
+
+import json
+import os
+import threading
+
+from rps_startup import optional_import
+from rps_profiler import profiled
+
+KEYWORDS = ("rock", "paper", "scissor", "scissors")
+VOSK_MODEL_DIR = os.environ.get("RPS_VOSK_MODEL", "vosk-model-small-en-us")
+
+
+def parse_move(text):
+    """Map recognized text to a move name (or None)."""
+    text = (text or "").lower()
+    if "rock" in text:
+        return "rock"
+    if "paper" in text:
+        return "paper"
+    if "scissor" in text:
+        return "scissor"
+    return None
+
+
+def load_speech():
+    return optional_import("speech_recognition", "SpeechRecognition", "Voice")
+
+
+class VoskKeywordRecognizer:
+    """Offline recognizer limited to the move words (needs vosk and a model folder)."""
+
+    def __init__(self, model_dir=VOSK_MODEL_DIR):
+        vosk = optional_import("vosk", "vosk", "Offline voice (vosk)")
+        if vosk is None or not os.path.isdir(model_dir):
+            raise RuntimeError(f"vosk model not found at {model_dir}")
+        vosk.SetLogLevel(-1)
+        self._vosk = vosk
+        self._model = vosk.Model(model_dir)
+        self._grammar = json.dumps(list(KEYWORDS) + ["[unk]"])
+
+    def __call__(self, audio):
+        rec = self._vosk.KaldiRecognizer(self._model, 16000, self._grammar)
+        rec.AcceptWaveform(audio.get_raw_data(convert_rate=16000, convert_width=2))
+        return parse_move(json.loads(rec.FinalResult()).get("text", ""))
+
+
+class SphinxKeywordRecognizer:
+    """Offline keyword spotting through pocketsphinx (speech_recognition's recognize_sphinx)."""
+
+    def __init__(self, sensitivity=1e-20):
+        if optional_import("pocketsphinx", "pocketsphinx", "Offline voice (sphinx)") is None:
+            raise RuntimeError("pocketsphinx not installed")
+        self._sr = load_speech()
+        self._r = self._sr.Recognizer()
+        self._keywords = [(k, sensitivity) for k in KEYWORDS]
+
+    def __call__(self, audio):
+        try:
+            return parse_move(self._r.recognize_sphinx(audio, keyword_entries=self._keywords))
+        except self._sr.UnknownValueError:
+            return None
+
+
+class GoogleRecognizer:
+    """The old online recognizer, kept for machines without an offline model."""
+
+    def __init__(self):
+        self._sr = load_speech()
+        self._r = self._sr.Recognizer()
+
+    def __call__(self, audio):
+        try:
+            return parse_move(self._r.recognize_google(audio))
+        except self._sr.UnknownValueError:
+            return None
+
+
+def default_recognizer():
+    """First offline recognizer that loads (vosk, then sphinx); online Google only if RPS_VOICE_ONLINE=1."""
+    makers = [VoskKeywordRecognizer, SphinxKeywordRecognizer]
+    if os.environ.get("RPS_VOICE_ONLINE"):
+        makers.append(GoogleRecognizer)
+    for make in makers:
+        try:
+            return make()
+        except Exception as e:
+            print(f"{make.__name__} unavailable:", e)
+    return None
+
+
+class VoiceWorker:
+    """
+    on_move(move) is called for every recognized move, on_unknown() for a
+    phrase that was not a move, on_error(exc) once if the microphone or
+    recognizer fails (the worker then stops). All are called from the worker
+    thread; the caller posts them to the Tk thread (rps_events.EventBus).
+    """
+
+    def __init__(self, on_move, on_unknown=None, on_error=None, recognizer=None,
+                 calibrate_seconds=0.5, phrase_time_limit=1.2):
+        self.on_move = on_move
+        self.on_unknown = on_unknown
+        self.on_error = on_error
+        self.recognizer = recognizer
+        self.calibrate_seconds = calibrate_seconds
+        self.phrase_time_limit = phrase_time_limit
+        self._active = threading.Event()
+        self._prepare_lock = threading.Lock()
+        self._prepared = False
+        self._stopped = False
+        self._thread = None
+
+    @property
+    def listening(self):
+        return self._active.is_set()
+
+    def prepare(self):
+        """
+        Load the recognizer ahead of time (slow for vosk models); fine to call
+        from a warm-up thread. The model is loaded once: a call made while
+        another thread is loading it waits for that load.
+        """
+        with self._prepare_lock:
+            if not self._prepared and load_speech() is not None:
+                self._prepared = True
+                if self.recognizer is None:
+                    self.recognizer = default_recognizer()
+        return self.recognizer
+
+    def start(self):
+        """Start listening; the thread (and its calibration) is only created the first time."""
+        self._active.set()
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="voice", daemon=True)
+            self._thread.start()
+
+    def pause(self):
+        self._active.clear()
+
+    def stop(self):
+        self._stopped = True
+        self._active.set()   # wake the thread so it can exit
+
+    def _run(self):
+        try:
+            sr = load_speech()
+            if sr is None:
+                raise RuntimeError("SpeechRecognition not installed")
+            if self.prepare() is None:
+                raise RuntimeError("no offline recognizer (install vosk + a model, or pocketsphinx)")
+            recognize = profiled("voice recognize")(self.recognizer)
+            r = sr.Recognizer()
+            # end phrases quickly: a move is one short word
+            r.pause_threshold = 0.3
+            r.non_speaking_duration = 0.2
+            with sr.Microphone() as mic:
+                r.adjust_for_ambient_noise(mic, duration=self.calibrate_seconds)
+                while not self._stopped:
+                    self._active.wait()
+                    if self._stopped:
+                        break
+                    try:
+                        audio = r.listen(mic, timeout=1, phrase_time_limit=self.phrase_time_limit)
+                    except sr.WaitTimeoutError:
+                        continue
+                    if not self._active.is_set():
+                        continue    # paused while the phrase was being recorded
+                    move = recognize(audio)
+                    if move:
+                        self.on_move(move)
+                    elif self.on_unknown is not None:
+                        self.on_unknown()
+        except Exception as e:
+            print("Voice error:", e)
+            self._active.clear()
+            self._thread = None
+            if self.on_error is not None:
+                self.on_error(e)